@@ -226,6 +226,30 @@ class Cache:
         fun = f"{self.driver}.updated"
         return self.modules[fun](bank, key, **self.kwargs)
 
+    def bank_updated(self, bank):
+        """
+        Get the last epoch an entry was added to or removed from the specified
+        bank, for drivers able to tell it cheaply.
+
+        .. versionadded:: 3008.0
+
+        :param bank:
+            The name of the location inside the cache which will hold the key
+            and its associated data.
+
+        :return:
+            Return a float epoch time in seconds, or None if the bank wasn't
+            found in cache or the driver does not implement ``bank_updated``.
+
+        :raises SaltCacheError:
+            Raises an exception if cache driver detected an error accessing data
+            in the cache backend (auth, permissions, etc).
+        """
+        fun = f"{self.driver}.bank_updated"
+        if fun in self.modules:
+            return self.modules[fun](bank, **self.kwargs)
+        return None
+
     def flush(self, bank, key=None):
         """
         Remove the key from the cache bank with all the key content. If no key is specified remove
@@ -296,6 +320,32 @@ class Cache:
                 f"Cache driver '{self.driver}' does not implement list_all"
             )
 
+    def list_updated(self, bank):
+        """
+        Lists entries stored in the specified bank with their last updated
+        epoch. This is more efficient than calling list() + updated() for each
+        entry with drivers implementing it.
+
+        .. versionadded:: 3008.0
+
+        :param bank:
+            The name of the location inside the cache which will hold the key
+            and its associated data.
+
+        :return:
+            A dict of {key: epoch} for all entries in the bank, the epoch being
+            None for entries without an updated time. Returns an empty dict if
+            the bank doesn't exist.
+
+        :raises SaltCacheError:
+            Raises an exception if cache driver detected an error accessing data
+            in the cache backend (auth, permissions, etc).
+        """
+        fun = f"{self.driver}.list_updated"
+        if fun in self.modules:
+            return self.modules[fun](bank, **self.kwargs)
+        return {key: self.updated(bank, key) for key in self.list(bank) or ()}
+
     def contains(self, bank, key=None):
         """
         Checks if the specified bank contains the specified key.
@@ -155,6 +155,50 @@ def list_(bank, cachedir):
     return ret
 
 
+def list_updated(bank, cachedir):
+    """
+    Return a dict of all entries stored in the specified bank and the epoch of
+    their mtime, ``None`` for entries which are not cache files.
+    """
+    base = salt.utils.path.join(cachedir, os.path.normpath(bank))
+    if not os.path.isdir(base):
+        return {}
+    ret = {}
+    try:
+        with os.scandir(base) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".p") or not entry.is_file():
+                    ret[entry.name] = None
+                    continue
+                try:
+                    ret[entry.name[:-2]] = int(entry.stat().st_mtime)
+                except FileNotFoundError:
+                    # Flushed since the directory was listed
+                    continue
+    except OSError as exc:
+        raise SaltCacheError(f'There was an error accessing directory "{base}": {exc}')
+    return ret
+
+
+def bank_updated(bank, cachedir):
+    """
+    Return the epoch of the latest mtime of the bank directory, which changes
+    whenever an entry is written or removed, or of the cache directory if the
+    bank does not exist.
+    """
+    mtimes = []
+    for target in (cachedir, salt.utils.path.join(cachedir, os.path.normpath(bank))):
+        try:
+            mtimes.append(os.stat(target).st_mtime)
+        except FileNotFoundError:
+            continue
+        except OSError as exc:
+            raise SaltCacheError(
+                f'There was an error reading the mtime for "{target}": {exc}'
+            )
+    return max(mtimes, default=None)
+
+
 def contains(bank, key, cachedir):
     """
     Checks if the specified bank contains the specified key.
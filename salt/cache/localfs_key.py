@@ -272,6 +272,35 @@ def updated(bank, key, cachedir, **kwargs):
     return
 
 
+def bank_updated(bank, cachedir, **kwargs):
+    """
+    Return the epoch of the latest mtime of the directories holding the bank,
+    which changes whenever a key is added, moved or removed.
+    """
+    if bank == "keys":
+        bases = [base for base in BASE_MAPPING if base != "minions_denied"]
+    elif bank == "denied_keys":
+        bases = ["minions_denied"]
+    elif bank == "master_keys":
+        bases = []
+    else:
+        raise SaltCacheError(f"Unrecognized bank: {bank}")
+
+    mtimes = []
+    # The pki dir itself changes when a state directory is removed
+    for base in [""] + bases:
+        target = os.path.join(cachedir, base)
+        try:
+            mtimes.append(os.stat(target).st_mtime)
+        except FileNotFoundError:
+            continue
+        except OSError as exc:
+            raise SaltCacheError(
+                f'There was an error reading the mtime for "{target}": {exc}'
+            )
+    return max(mtimes, default=None)
+
+
 def flush(bank, key=None, cachedir=None, **kwargs):
     """
     Remove the key from the cache bank with all the key content.
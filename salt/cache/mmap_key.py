@@ -256,6 +256,26 @@ def updated(bank, key, cachedir, **kwargs):
     return int(mtime) if mtime is not None else None
 
 
+def bank_updated(bank, cachedir, **kwargs):
+    """
+    Return the epoch of the latest mtime of the mmap files of *bank*, or
+    ``None`` if the bank does not exist.
+    """
+    index_name = _BANK_INDEX_NAME.get(bank)
+    if not index_name:
+        raise SaltCacheError(f"mmap_key: unrecognised bank {bank!r}")
+    base = os.path.join(cachedir, index_name)
+    mtimes = []
+    for path in (base, base + ".roster", base + ".heap"):
+        try:
+            mtimes.append(os.stat(path).st_mtime)
+        except FileNotFoundError:
+            continue
+        except OSError as exc:
+            raise SaltCacheError(f"mmap_key: error reading mtime of {path!r}: {exc}")
+    return max(mtimes, default=None)
+
+
 def flush_(bank, key=None, cachedir=None, **kwargs):
     """
     Remove *key* from *bank*, or wipe the entire *bank* if *key* is ``None``.
@@ -4,6 +4,7 @@ Encapsulate the different transports available to Salt.
 This includes client side transport, for the ReqServer and the Publisher
 """
 
+import asyncio
 import logging
 import os
 import time
@@ -17,6 +18,7 @@ import salt.exceptions
 import salt.payload
 import salt.serializers.msgpack
 import salt.transport.frame
+import salt.utils.compression
 import salt.utils.event
 import salt.utils.files
 import salt.utils.stringutils
@@ -28,6 +30,29 @@ log = logging.getLogger(__name__)
 
 REQUEST_CHANNEL_TIMEOUT = 60
 REQUEST_CHANNEL_TRIES = 3
+# Upper bound on the backoff a master "try later" reply can ask for
+TRY_LATER_MAX_DELAY = 300
+
+
+def try_later_delay(ret):
+    """
+    Return the number of seconds a master "try later" reply asks the client
+    to wait before retrying, or ``None`` if ``ret`` is not such a reply.
+
+    The master sends these when a request's lane is full (see
+    :conf_master:`request_lanes`).
+    """
+    if (
+        not isinstance(ret, dict)
+        or not isinstance(ret.get("load"), dict)
+        or ret["load"].get("ret") != "try_later"
+    ):
+        return None
+    try:
+        delay = float(ret["load"].get("retry_after", 0))
+    except (TypeError, ValueError):
+        delay = 0
+    return min(max(delay, 0), TRY_LATER_MAX_DELAY)
 
 
 class ReqChannel:
@@ -162,7 +187,14 @@ class AsyncReqChannel:
                     type(load),
                 )
 
-            load = self.auth.session_crypticle.dumps(load)
+            if salt.utils.compression.supported(self.opts):
+                # Only compress the load with an algorithm the master advertised
+                compression = salt.utils.compression.negotiate(
+                    self.opts, (self.auth.creds or {}).get("compression")
+                )
+                load = self.auth.session_crypticle.dumps(load, compression=compression)
+            else:
+                load = self.auth.session_crypticle.dumps(load)
         elif isinstance(load, dict):
             salt.utils.tracing.inject(load)
 
@@ -175,6 +207,9 @@ class AsyncReqChannel:
             ret["id"] = self.opts["id"]
             ret["enc_algo"] = self.opts["encryption_algorithm"]
             ret["sig_algo"] = self.opts["signing_algorithm"]
+            compression = salt.utils.compression.supported(self.opts)
+            if compression:
+                ret["compression"] = compression
         return ret
 
     async def _send_with_retry(self, load, tries, timeout):
@@ -185,7 +220,18 @@ class AsyncReqChannel:
                     load,
                     timeout=timeout,
                 )
+                retry_after = try_later_delay(ret)
+                if retry_after is not None:
+                    raise salt.exceptions.SaltMasterBusyError(
+                        "The master is busy", retry_after=retry_after
+                    )
                 break
+            except salt.exceptions.SaltMasterBusyError as exc:
+                if _try >= tries:
+                    raise
+                log.debug("Master is busy, retrying in %s seconds", exc.retry_after)
+                await asyncio.sleep(exc.retry_after)
+                _try += 1
             except Exception as exc:  # pylint: disable=broad-except
                 log.trace("Failed to send msg %r", exc)
                 if _try >= tries:
@@ -289,6 +335,11 @@ class AsyncReqChannel:
                 self._package_load(load, nonce),
                 timeout=timeout,
             )
+            retry_after = try_later_delay(data)
+            if retry_after is not None:
+                raise salt.exceptions.SaltMasterBusyError(
+                    "The master is busy", retry_after=retry_after
+                )
             # we may not have always data
             # as for example for saltcall ret submission, this is a blind
             # communication, we do not subscribe to return events, we just
@@ -357,6 +408,13 @@ class AsyncReqChannel:
                             load, timeout=timeout, raw=raw
                         )
                     break
+                except salt.exceptions.SaltMasterBusyError as exc:
+                    # The master shed this request, honour its backoff hint
+                    if _try >= tries:
+                        raise
+                    log.debug("Master is busy, retrying in %s seconds", exc.retry_after)
+                    await asyncio.sleep(exc.retry_after)
+                    _try += 1
                 except Exception as exc:  # pylint: disable=broad-except
                     log.trace("Failed to send msg %r", exc)
                     if _try >= tries:
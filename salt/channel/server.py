@@ -6,6 +6,7 @@ This includes server side transport, for the ReqServer and the Publisher
 
 import asyncio
 import collections
+import copy
 import errno
 import hashlib
 import hmac
@@ -28,7 +29,10 @@ import salt.transport
 import salt.transport.frame
 import salt.transport.tcp
 import salt.utils.channel
+import salt.utils.compression
+import salt.utils.crypto_pool
 import salt.utils.event
+import salt.utils.event_ring
 import salt.utils.metrics
 import salt.utils.minions
 import salt.utils.platform
@@ -39,6 +43,9 @@ from salt.utils.cache import CacheCli
 
 log = logging.getLogger(__name__)
 
+# Key of the IPC message carrying a publish frame encrypted by publish_once()
+PUB_FRAME_KEY = "__pub_frame"
+
 
 def _get_crypticle(opts, key_string, key_size=192, serial=0):
     """
@@ -196,9 +203,23 @@ class ReqServerChannel:
             self.opts, self.opts["sock_dir"], listen=False
         )
         self.master_key = salt.crypt.MasterKeys(self.opts)
+        self.pub_keys = salt.crypt.PublicKeyCache(
+            self.opts.get("auth_pubkey_cache_size", 1024)
+        )
+        self.crypto_pool = None
+        if self.opts.get("auth_crypto_workers", 0) > 0:
+            self.crypto_pool = salt.utils.crypto_pool.AuthCryptoPool(self.opts)
 
         (pathlib.Path(self.opts["cachedir"]) / "sessions").mkdir(exist_ok=True)
         self.sessions = {}
+        # Ready crypticles of the minion sessions, emptied when the AES key
+        # is rotated
+        self.crypticles = salt.crypt.CrypticleCache(
+            self.opts,
+            self.opts.get("crypticle_cache_size", 1024),
+            factory=_get_crypticle,
+        )
+        self._crypticles_aes_key = None
 
     @property
     def aes_key(self):
@@ -206,6 +227,17 @@ class ReqServerChannel:
             return salt.master.SMaster.secrets["cluster_aes"]["secret"].value
         return salt.master.SMaster.secrets["aes"]["secret"].value
 
+    def session_crypticle(self, minion):
+        """
+        Returns the crypticle of the session of the given minion id.
+        """
+        aes_key = self.aes_key
+        if aes_key != self._crypticles_aes_key:
+            # rotate_secrets replaced the AES key, start over
+            self.crypticles.clear()
+            self._crypticles_aes_key = aes_key
+        return self.crypticles.get(self.session_key(minion))
+
     def session_key(self, minion):
         """
         Returns a session key for the given minion id.
@@ -410,7 +442,12 @@ class ReqServerChannel:
                 # Store time at the beginning of serving _auth call
                 # to calculate duration of the call with master_stats
                 start = time.time()
-                ret = self._auth(payload["load"], sign_messages, version)
+                if getattr(self, "crypto_pool", None) is not None:
+                    ret = await self._auth_async(
+                        payload["load"], sign_messages, version
+                    )
+                else:
+                    ret = self._auth(payload["load"], sign_messages, version)
                 if self.opts.get("master_stats", False):
                     await self.payload_handler({"cmd": "_auth", "_start": start})
                 return ret
@@ -446,15 +483,19 @@ class ReqServerChannel:
                 ret, req_opts = await self.payload_handler(payload)
 
             req_fun = req_opts.get("fun", "send")
+            # Only compress the reply with an algorithm the minion advertised
+            compression = salt.utils.compression.negotiate(
+                self.opts, payload.get("compression")
+            )
             if req_fun == "send_clear":
                 return ret
             elif req_fun == "send":
                 if version > 2:
-                    return _get_crypticle(self.opts, self.session_key(id_)).dumps(
-                        ret, nonce
+                    return self.session_crypticle(id_).dumps(
+                        ret, nonce, compression=compression
                     )
                 else:
-                    return self.crypticle.dumps(ret, nonce)
+                    return self.crypticle.dumps(ret, nonce, compression=compression)
             elif req_fun == "send_private":
                 return self._encrypt_private(
                     ret,
@@ -464,6 +505,7 @@ class ReqServerChannel:
                     sign_messages,
                     payload.get("enc_algo", salt.crypt.OAEP_SHA1),
                     payload.get("sig_algo", salt.crypt.PKCS1v15_SHA1),
+                    compression=compression,
                 )
             log.error("Unknown req_fun %s", req_fun)
             # always attempt to return an error to the minion
@@ -483,6 +525,7 @@ class ReqServerChannel:
         sign_messages=True,
         encryption_algorithm=salt.crypt.OAEP_SHA1,
         signing_algorithm=salt.crypt.PKCS1v15_SHA1,
+        compression=None,
     ):
         """
         The server equivalent of ReqChannel.crypted_transfer_decode_dictentry
@@ -522,9 +565,9 @@ class ReqServerChannel:
                 "data": tosign,
                 "sig": self.master_key.sign(tosign, algorithm=signing_algorithm),
             }
-            pret[dictkey] = pcrypt.dumps(signed_msg)
+            pret[dictkey] = pcrypt.dumps(signed_msg, compression=compression)
         else:
-            pret[dictkey] = pcrypt.dumps(ret)
+            pret[dictkey] = pcrypt.dumps(ret, compression=compression)
         return pret
 
     def _update_aes(self):
@@ -553,10 +596,9 @@ class ReqServerChannel:
         if payload["enc"] == "aes":
             if version > 2:
                 if salt.utils.verify.valid_id(self.opts, payload["id"]):
-                    payload["load"] = _get_crypticle(
-                        self.opts,
-                        self.session_key(payload["id"]),
-                    ).loads(payload["load"])
+                    payload["load"] = self.session_crypticle(payload["id"]).loads(
+                        payload["load"]
+                    )
                 else:
                     raise SaltDeserializationError("Encountered invalid id")
             else:
@@ -593,7 +635,7 @@ class ReqServerChannel:
                 log.warning("Invalid minion id: %s", id_)
                 return False
             try:
-                pub = salt.crypt.PublicKey.from_file(pub_path)
+                pub = self.pub_keys.from_file(pub_path)
             except OSError:
                 log.warning(
                     "Salt minion claiming to be %s attempted to communicate with "
@@ -612,17 +654,18 @@ class ReqServerChannel:
             return False
         return True
 
-    def _auth(self, load, sign_messages=False, version=0):
+    def _auth_funcs(self):
         """
-        Authenticate a minion by delegating to :class:`salt.master.AuthFuncs`.
+        Build the :class:`salt.master.AuthFuncs` handler used by :meth:`_auth`.
 
         The implementation lives in :mod:`salt.master` so that auth can run
         in a dedicated worker pool.  This method threads the channel's
         existing state (cache, event manager, master key, session cache,
-        auto-accept config, con_cache client, ckminions) into the
-        ``AuthFuncs`` handler so that callers (and tests) that monkey-patch
-        attributes on the channel see those changes reflected in the auth
-        handler without having to construct a new ``AuthFuncs`` themselves.
+        auto-accept config, con_cache client, ckminions, public key cache,
+        crypto pool) into the ``AuthFuncs`` handler so that callers (and
+        tests) that monkey-patch attributes on the channel see those changes
+        reflected in the auth handler without having to construct a new
+        ``AuthFuncs`` themselves.
         """
         af = salt.master.AuthFuncs.__new__(salt.master.AuthFuncs)
         af.opts = self.opts
@@ -633,12 +676,37 @@ class ReqServerChannel:
         af.auto_key = getattr(self, "auto_key", None)
         af.cache_cli = getattr(self, "cache_cli", False)
         af.ckminions = getattr(self, "ckminions", None)
-        return af._auth(load, sign_messages, version)
+        # A size 0 cache parses every key, for channels built without one
+        af.pub_keys = getattr(self, "pub_keys", None) or salt.crypt.PublicKeyCache(0)
+        af.crypto_pool = getattr(self, "crypto_pool", None)
+        return af
+
+    def _auth(self, load, sign_messages=False, version=0):
+        """
+        Authenticate a minion by delegating to :class:`salt.master.AuthFuncs`.
+        """
+        return self._auth_funcs()._auth(load, sign_messages, version)
+
+    async def _auth_async(self, load, sign_messages=False, version=0):
+        """
+        Authenticate a minion like :meth:`_auth`, running the RSA work in
+        the channel's :class:`~salt.utils.crypto_pool.AuthCryptoPool`.
+        """
+        return await self._auth_funcs()._auth_async(load, sign_messages, version)
+
+    async def drain(self):
+        """
+        Stop taking requests, finish the ones being handled and close.
+        """
+        await self.transport.drain()
+        self.close()
 
     def close(self):
         self.transport.close()
         if self.event is not None:
             self.event.destroy()
+        if getattr(self, "crypto_pool", None) is not None:
+            self.crypto_pool.close()
         if hasattr(self, "ckminions") and self.ckminions is not None:
             if hasattr(self.ckminions, "cache") and self.ckminions.cache is not None:
                 if hasattr(self.ckminions.cache, "destroy"):
@@ -700,9 +768,15 @@ class PoolRoutingChannel:
         self.io_loop = None
         self.event = None
         self.router = None
+        # RequestRouter used for request_lanes admission control, built on
+        # first use so it is created in the routing process.
+        self.lanes = None
         self.crypticle = None
         self.master_key = None
         self.auto_key = None
+        self.pub_keys = salt.crypt.PublicKeyCache(
+            self.opts.get("auth_pubkey_cache_size", 1024)
+        )
 
         (pathlib.Path(self.opts["cachedir"]) / "sessions").mkdir(exist_ok=True)
         self.sessions = {}
@@ -1031,6 +1105,7 @@ class PoolRoutingChannel:
         ch.cache_cli = getattr(self, "cache_cli", False)
         ch.ckminions = getattr(self, "ckminions", None)
         ch.crypticle = getattr(self, "crypticle", None)
+        ch.pub_keys = getattr(self, "pub_keys", None)
         return ch
 
     async def _handle_clear_auth_local(self, payload, version):
@@ -1141,7 +1216,9 @@ class PoolRoutingChannel:
             and isinstance(payload.get("load"), dict)
             and payload["load"].get("cmd") == "_auth"
         ):
-            return await self._handle_clear_auth_local(payload, version)
+            return await self._with_admission(
+                "_auth", lambda: self._handle_clear_auth_local(payload, version)
+            )
 
         try:
             # Simple command-based routing from our routing table
@@ -1220,7 +1297,7 @@ class PoolRoutingChannel:
 
             # Forward to the appropriate pool's RequestServer via IPC
             client = self.pool_clients[pool_name]
-            reply = await client.send(payload)
+            reply = await self._with_admission(cmd, lambda: client.send(payload))
 
             return reply
 
@@ -1235,6 +1312,55 @@ class PoolRoutingChannel:
     # Alias for compatibility with older tests and code that expect handle_message
     handle_message = handle_and_route_message
 
+    async def _with_admission(self, cmd, handler):
+        """
+        Run ``handler()`` once the :conf_master:`request_lanes` lane of
+        ``cmd`` admits the request, or return a "try later" reply if the lane
+        is full.  See :class:`salt.master.RequestRouter`.
+        """
+        if self.lanes is None:
+            import salt.master
+
+            self.lanes = salt.master.RequestRouter(self.opts)
+        if cmd not in self.lanes.cmd_to_lane:
+            return await handler()
+
+        ident = object()
+        waiter = asyncio.get_running_loop().create_future()
+        admitted = self.lanes.admit(cmd, ident, (ident, waiter))
+        if admitted is None:
+            return self.lanes.try_later(cmd)
+        if admitted is False:
+            try:
+                await asyncio.wait_for(waiter, self.lanes.lane_timeout)
+            except asyncio.TimeoutError:
+                return self.lanes.try_later(cmd)
+        try:
+            return await handler()
+        finally:
+            # Wake released waiters in the order the lane queued them
+            released = collections.deque(self.lanes.complete(ident))
+            released.extend(self.lanes.pop_released())
+            while released:
+                next_ident, next_waiter = released.popleft()
+                if next_waiter.done():
+                    # Its client already gave up waiting, pass the slot on
+                    released.extend(self.lanes.complete(next_ident))
+                else:
+                    next_waiter.set_result(None)
+
+    async def drain(self):
+        """
+        Drain the pool RequestServers of an MWorker, see
+        :meth:`ReqServerChannel.drain`.
+        """
+        for pool_name, server in self.pool_servers.items():
+            try:
+                await server.drain()
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error("Error draining server for pool '%s': %s", pool_name, exc)
+        self.close()
+
     def close(self):
         """
         Close all resources: pool clients, pool servers, event manager, and external transport.
@@ -1453,13 +1579,13 @@ class PubServerChannel:
 
     async def publish_payload(self, load, *args):
         load = salt.payload.loads(load)
-        unpacked_package = self.wrap_payload(load)
-        try:
-            payload = salt.payload.loads(unpacked_package["payload"])
-        except KeyError:
-            log.error("Invalid package %r", unpacked_package)
-            raise
-        payload = salt.payload.dumps(payload)
+        # A frame already encrypted by publish_once() is sent as is
+        frame = load.pop(PUB_FRAME_KEY, None)
+        if frame is not None:
+            # loads() decodes any frame that happens to be valid UTF-8
+            frame = salt.utils.stringutils.to_bytes(frame)
+        unpacked_package = self.wrap_payload(load, frame=frame)
+        payload = unpacked_package["payload"]
         if "topic_lst" in unpacked_package:
             topic_list = unpacked_package["topic_lst"]
             ret = await self.transport.publish_payload(payload, topic_list)
@@ -1467,7 +1593,11 @@ class PubServerChannel:
             ret = await self.transport.publish_payload(payload)
         return ret
 
-    def wrap_payload(self, load):
+    def encrypt_payload(self, load):
+        """
+        Serialize, encrypt and, with :conf_master:`sign_pub_messages`, sign
+        a publish ``load``.  Returns the frame sent to the minions.
+        """
         payload = {"enc": "aes"}
         if not self.opts.get("cluster_id", None):
             load["serial"] = salt.master.SMaster.get_serial()
@@ -1475,12 +1605,23 @@ class PubServerChannel:
         payload["load"] = crypticle.dumps(load)
         if self.opts["sign_pub_messages"]:
             log.debug("Signing data packet")
+            if getattr(self, "master_key", None) is None:
+                self.master_key = salt.crypt.MasterKeys(self.opts)
             payload["sig_algo"] = self.opts["publish_signing_algorithm"]
             payload["sig"] = self.master_key.sign(
                 payload["load"], self.opts["publish_signing_algorithm"]
             )
+        return salt.payload.dumps(payload)
 
-        int_payload = {"payload": salt.payload.dumps(payload)}
+    def wrap_payload(self, load, frame=None):
+        """
+        Build the package handed to the transport for ``load``.  ``frame``
+        is the frame :meth:`encrypt_payload` already built for ``load``, if
+        any.
+        """
+        if frame is None:
+            frame = self.encrypt_payload(load)
+        int_payload = {"payload": frame}
 
         # If topics are upported, target matching has to happen master side
         match_targets = ["pcre", "glob", "list"]
@@ -1502,9 +1643,13 @@ class PubServerChannel:
 
         return int_payload
 
-    async def publish(self, load):
+    async def publish(self, load, frame=None):
         """
         Publish "load" to minions
+
+        :param bytes frame: The frame :meth:`encrypt_payload` built for
+            ``load``.  When given, the publish daemon sends it as is instead
+            of encrypting ``load`` again.
         """
         log.debug(
             "Sending payload to publish daemon. jid=%s load=%s",
@@ -1534,10 +1679,66 @@ class PubServerChannel:
                 ),
             },
         ):
-            payload = salt.payload.dumps(load)
+            if frame is not None:
+                # Only the targeting is needed next to an encrypted frame,
+                # which has to stay binary on its way to the publish daemon
+                load = {
+                    PUB_FRAME_KEY: frame,
+                    "tgt": load.get("tgt"),
+                    "tgt_type": load.get("tgt_type"),
+                }
+                payload = salt.payload.dumps(load, use_bin_type=True)
+            else:
+                payload = salt.payload.dumps(load)
             await self.transport.publish(payload)
 
 
+async def publish_once(channels, load):
+    """
+    Publish ``load`` on every :class:`PubServerChannel` in ``channels``.
+
+    The load is serialized, encrypted and signed once and the resulting
+    frame is shared by every channel (one per configured transport) whose
+    publish daemons would otherwise each repeat that work.  Channels using
+    :conf_master:`disable_aes_with_tls` still build their own frame, since
+    whether AES is skipped depends on the transport.
+    """
+    frames = {}
+    if len(channels) > 1 and isinstance(load, dict):
+        salt.utils.tracing.inject(load)
+        for chan in channels:
+            key = _frame_key(chan.opts)
+            if key is not None and key not in frames:
+                try:
+                    frames[key] = chan.encrypt_payload(copy.deepcopy(load))
+                except Exception:  # pylint: disable=broad-except
+                    log.warning(
+                        "Unable to encrypt publish once, every publisher "
+                        "will encrypt it",
+                        exc_info=True,
+                    )
+                    frames = {}
+                    break
+    await asyncio.gather(
+        *[
+            chan.publish(load, frame=frames.get(_frame_key(chan.opts)))
+            for chan in channels
+        ]
+    )
+
+
+def _frame_key(opts):
+    # Settings the encrypted publish frame depends on, None for channels
+    # that must build their own frame
+    if opts.get("disable_aes_with_tls", False):
+        return None
+    return (
+        opts.get("cluster_id"),
+        opts.get("sign_pub_messages"),
+        opts.get("publish_signing_algorithm"),
+    )
+
+
 class MasterPubServerChannel:
     """ """
 
@@ -1596,6 +1797,8 @@ class MasterPubServerChannel:
         self._discover_candidates = {}
         # Set by service.py once the Raft node is started.
         self._raft_dispatcher = None
+        # Opened by the EventPublisher, see _publish_daemon()
+        self.event_ring = None
 
     def _start_raft_as_founding_voter(self):
         """
@@ -2818,9 +3021,13 @@ class MasterPubServerChannel:
         self._discover_event = None
         self._raft_dispatcher = None
         self._raft_service = None
+        self.event_ring = None
 
     def close(self):
         self.transport.close()
+        if self.event_ring is not None:
+            self.event_ring.close()
+            self.event_ring = None
 
     def pre_fork(self, process_manager, *args, **kwargs):
         """
@@ -2852,6 +3059,15 @@ class MasterPubServerChannel:
 
         self.io_loop = tornado.ioloop.IOLoop.current()
 
+        if self.opts.get("event_replay_size"):
+            try:
+                self.event_ring = salt.utils.event_ring.EventRing(
+                    salt.utils.event_ring.ring_path(self.opts),
+                    capacity=self.opts["event_replay_size"],
+                )
+            except (OSError, ValueError) as exc:
+                log.warning("Unable to open the event replay ring: %s", exc)
+
         # Always set up the local IPC-based event publisher first
         # This ensures internal processes (like pytest_engine) can communicate reliably
         if hasattr(self.transport, "publisher"):
@@ -3861,28 +4077,31 @@ class MasterPubServerChannel:
             return
         tasks = []
         if not tag.startswith("cluster/peer"):
+            if self.event_ring is not None:
+                # Before publishing, so subscribers can replay from the
+                # sequence number of any event they received
+                self.event_ring.append(load)
             tasks = [
                 asyncio.create_task(
                     self.transport.publish_payload(load), name=self.opts["id"]
                 )
             ]
-        for pusher in self.pushers:
-            log.info("Publish event to peer %s:%s", pusher.pull_host, pusher.pull_port)
-            if tag.startswith("cluster/peer"):
-                # log.info("Send %s %r", tag, load)
-                tasks.append(
-                    asyncio.create_task(pusher.publish(load), name=pusher.pull_host)
-                )
-                continue
+        if tag.startswith("cluster/peer") or not self.pushers:
+            event_data = load
+        else:
+            # Encrypt the event once for every peer
             crypticle = _get_crypticle(
                 self.opts, salt.master.SMaster.secrets["aes"]["secret"].value
             )
-            load = {"event_payload": data}
             event_data = salt.utils.event.SaltEvent.pack(
                 salt.utils.event.tagify(tag, self.opts["id"], "cluster/event"),
-                crypticle.dumps(load),
+                crypticle.dumps({"event_payload": data}),
+            )
+        for pusher in self.pushers:
+            log.info("Publish event to peer %s:%s", pusher.pull_host, pusher.pull_port)
+            tasks.append(
+                asyncio.create_task(pusher.publish(event_data), name=pusher.pull_host)
             )
-            tasks.append(asyncio.create_task(pusher.publish(event_data)))
         await asyncio.gather(*tasks, return_exceptions=True)
         for task in tasks:
             try:
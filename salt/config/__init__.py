@@ -18,6 +18,7 @@ import salt.defaults.exitcodes
 import salt.exceptions
 import salt.features
 import salt.syspaths
+import salt.utils.compression
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.files
@@ -418,6 +419,9 @@ VALID_OPTS = immutabletypes.freeze(
         "log_rotate_backup_count": int,
         # If an event is above this size, it will be trimmed before putting it on the event bus
         "max_event_size": int,
+        # Bytes of the ring the master keeps its most recent events in, for
+        # late subscribers to replay. 0 disables it.
+        "event_replay_size": int,
         # Enable old style events to be sent on minion_startup. Change default to False in 3001 release
         "enable_legacy_startup_events": bool,
         # Always execute states with test=True if this flag is set
@@ -574,6 +578,24 @@ VALID_OPTS = immutabletypes.freeze(
         "worker_pools_enabled": bool,
         # Worker pool configuration (dict of pool_name -> {worker_count, commands})
         "worker_pools": dict,
+        # Seconds between two worker pool autoscaling evaluations
+        "worker_pools_autoscale_interval": float,
+        # Minimum number of seconds between shrinking an autoscaled worker pool
+        "worker_pools_autoscale_cooldown": float,
+        # Seconds a worker retired by autoscaling may spend draining its
+        # requests before it is terminated
+        "worker_pools_drain_timeout": float,
+        # Admission control lanes (dict of lane_name -> {commands, max_inflight,
+        # max_queue, retry_after}) applied by the worker pool request router
+        "request_lanes": dict,
+        # Seconds after which an unanswered or still queued lane request stops
+        # counting against its lane
+        "request_lanes_timeout": float,
+        # Number of minion returns an MWorker buffers before storing them in
+        # one job cache flush. 0 or 1 stores every return on arrival.
+        "return_batch_size": int,
+        # Maximum number of seconds a buffered minion return waits for a flush
+        "return_batch_interval": float,
         # The port for the master to listen to returns on. The minion needs to connect to this port
         # to send returns.
         "ret_port": int,
@@ -775,6 +797,13 @@ VALID_OPTS = immutabletypes.freeze(
         # cachedir under the name of the minion and used to predetermine what minions are expected to
         # reply from executions.
         "minion_data_cache": bool,
+        # Answer grain and pillar targets from an in-memory index of the minion
+        # data cache
+        "minion_data_index": bool,
+        # Seconds the minions resolved for a target are memoized for, 0 disables
+        "target_cache_ttl": (int, float),
+        # Number of targets memoized by each master process
+        "target_cache_size": int,
         # The number of seconds between AES key rotations on the master
         "publish_session": int,
         # Defines a salt reactor. See https://docs.saltproject.io/en/latest/topics/reactor/
@@ -1052,6 +1081,15 @@ VALID_OPTS = immutabletypes.freeze(
         "auth_events": bool,
         # Specify auth events to add autosign_grains to
         "auth_events_autosign_grains": list,
+        # Processes running the RSA work of minion authentication, 0 runs it
+        # inline in the request server
+        "auth_crypto_workers": int,
+        # Minion authentications the crypto pool admits at once
+        "auth_crypto_queue_size": int,
+        # Parsed minion public keys kept by each request server
+        "auth_pubkey_cache_size": int,
+        # Minion session crypticles kept by each request server
+        "crypticle_cache_size": int,
         # Whether to fire Minion data cache refresh events
         "minion_data_cache_events": bool,
         # Enable calling ssh minions from the salt master
@@ -1098,6 +1136,10 @@ VALID_OPTS = immutabletypes.freeze(
         "publish_signing_algorithm": str,
         # RSA encryption used for cluster peer-to-peer messages
         "cluster_encryption_algorithm": str,
+        # Compression algorithms accepted for request channel payloads
+        "transport_compression": list,
+        # Minimum size in bytes of a request channel payload worth compressing
+        "transport_compression_threshold": int,
         # the cache driver to be used to manage keys for both minion and master
         "keys.cache_driver": (type(None), str),
         "request_server_ttl": int,
@@ -1442,6 +1484,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "features": {},
         "encryption_algorithm": "OAEP-SHA1",
         "signing_algorithm": "PKCS1v15-SHA1",
+        "transport_compression": [],
+        "transport_compression_threshold": 4096,
         "keys.cache_driver": "localfs_key",
         "pillar.cache_driver": None,
         "tracing": {
@@ -1529,6 +1573,13 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "worker_threads": 5,
         "worker_pools_enabled": True,
         "worker_pools": {},
+        "worker_pools_autoscale_interval": 5.0,
+        "worker_pools_autoscale_cooldown": 60.0,
+        "worker_pools_drain_timeout": 60.0,
+        "request_lanes": {},
+        "request_lanes_timeout": 60.0,
+        "return_batch_size": 0,
+        "return_batch_interval": 0.005,
         "sock_dir": os.path.join(salt.syspaths.SOCK_DIR, "master"),
         "sock_pool_size": 1,
         "ret_port": 4506,
@@ -1634,6 +1685,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "svnfs_saltenv_whitelist": [],
         "svnfs_saltenv_blacklist": [],
         "max_event_size": 1048576,
+        "event_replay_size": 16777216,
         "master_stats": False,
         "master_stats_event_iter": 60,
         "minionfs_env": "base",
@@ -1706,6 +1758,9 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "master_job_cache": "local_cache",
         "job_cache_store_endtime": False,
         "minion_data_cache": True,
+        "minion_data_index": True,
+        "target_cache_ttl": 5,
+        "target_cache_size": 1024,
         "enforce_mine_cache": False,
         "ipc_mode": _DFLT_IPC_MODE,
         "ipc_write_buffer": _DFLT_IPC_WBUFFER,
@@ -1867,6 +1922,10 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "discovery": False,
         "schedule": {},
         "auth_events": True,
+        "auth_crypto_workers": 0,
+        "auth_crypto_queue_size": 1024,
+        "auth_pubkey_cache_size": 1024,
+        "crypticle_cache_size": 1024,
         "auth_events_pend_autosign_grains": False,
         "minion_data_cache_events": True,
         "enable_ssh_minions": False,
@@ -1899,6 +1958,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "features": {},
         "publish_signing_algorithm": "PKCS1v15-SHA1",
         "cluster_encryption_algorithm": "OAEP-SHA1",
+        "transport_compression": [],
+        "transport_compression_threshold": 4096,
         "keys.cache_driver": "localfs_key",
         "request_server_aes_session": 0,
         "request_server_ttl": 0,
@@ -4238,6 +4299,7 @@ def apply_minion_config(
             f"The signging algorithm '{opts['signing_algorithm']}' is not valid. "
             f"Please specify one of {','.join(salt.crypt.VALID_SIGNING_ALGORITHMS)}."
         )
+    _validate_transport_compression(opts)
 
     # Store original `cachedir` value, before overriding,
     # to make overriding more accurate.
@@ -4247,6 +4309,18 @@ def apply_minion_config(
     return opts
 
 
+def _validate_transport_compression(opts):
+    """
+    Make sure every ``transport_compression`` algorithm is supported.
+    """
+    for name in opts["transport_compression"] or []:
+        if name not in salt.utils.compression.ALGORITHMS:
+            raise salt.exceptions.SaltConfigurationError(
+                f"The transport compression algorithm '{name}' is not valid. "
+                f"Please specify any of {','.join(salt.utils.compression.ALGORITHMS)}."
+            )
+
+
 def _update_discovery_config(opts):
     """
     Update discovery config for all instances.
@@ -4521,6 +4595,7 @@ def apply_master_config(overrides=None, defaults=None):
     if opts.get("worker_pools_enabled", True):
         from salt.config.worker_pools import (
             get_worker_pools_config,
+            validate_request_lanes_config,
             validate_worker_pools_config,
         )
 
@@ -4536,6 +4611,18 @@ def apply_master_config(overrides=None, defaults=None):
                 log.error("Worker pools configuration error: %s", exc)
                 raise
 
+        try:
+            validate_request_lanes_config(opts)
+        except ValueError as exc:
+            log.error("Request lanes configuration error: %s", exc)
+            raise
+    elif opts.get("request_lanes"):
+        log.warning(
+            "The 'request_lanes' setting in '%s' is ignored because "
+            "'worker_pools_enabled' is False.",
+            opts["conf_file"],
+        )
+
     opts.setdefault("pillar_source_merging_strategy", "smart")
 
     # Make sure hash_type is lowercase
@@ -4559,6 +4646,7 @@ def apply_master_config(overrides=None, defaults=None):
             f"The cluster encryption algorithm '{opts['cluster_encryption_algorithm']}' is not valid. "
             f"Please specify one of {','.join(salt.crypt.VALID_ENCRYPTION_ALGORITHMS)}."
         )
+    _validate_transport_compression(opts)
 
     salt.features.setup_features(opts)
     return opts
@@ -7,7 +7,7 @@ time-critical traffic (for example ``_auth``).  See the
 :ref:`tunable worker pools <tunable-worker-pools>` topic guide for the
 user-facing overview.
 
-This module contains three things:
+This module contains four things:
 
 * :data:`DEFAULT_WORKER_POOLS`, the configuration used when the operator
   provides no explicit ``worker_pools`` stanza and no ``worker_threads``
@@ -18,6 +18,9 @@ This module contains three things:
 * :func:`get_worker_pools_config`, which resolves the effective pool layout
   from the master opts, handling backward compatibility with
   ``worker_threads`` and the ``worker_pools_enabled=False`` legacy switch.
+* :func:`validate_request_lanes_config`, which checks the
+  ``request_lanes`` admission control settings applied by the pooled
+  request router.
 
 The pool dictionary shape is::
 
@@ -25,6 +28,10 @@ The pool dictionary shape is::
         "<pool-name>": {
             "worker_count": <int >= 1>,
             "commands": ["<cmd>", ..., "*"?],
+            # Optional, see salt.utils.worker_pools
+            "min_workers": <int, 1 <= min_workers <= worker_count>,
+            "max_workers": <int >= worker_count>,
+            "p99_latency_target": <seconds > 0>,
         },
         ...
     }
@@ -84,6 +91,10 @@ def validate_worker_pools_config(opts):
       directories.
     * Each pool value is a dictionary containing an integer
       ``worker_count >= 1`` and a non-empty list of string ``commands``.
+    * The optional ``min_workers`` and ``max_workers`` autoscaling bounds
+      are integers ``>= 1`` with ``min_workers <= worker_count <=
+      max_workers``, and the optional ``p99_latency_target`` is a number
+      ``> 0``.
     * No command string is claimed by more than one pool.
     * Exactly one pool uses the ``"*"`` catchall entry so that any
       command not listed explicitly has a well-defined destination.
@@ -170,6 +181,39 @@ def validate_worker_pools_config(opts):
                 f"got {worker_count}"
             )
 
+        # Check the optional autoscaling bounds
+        min_workers = pool_config.get("min_workers", worker_count)
+        max_workers = pool_config.get("max_workers", worker_count)
+        for bound, value in (
+            ("min_workers", min_workers),
+            ("max_workers", max_workers),
+        ):
+            if not isinstance(value, int) or value < 1:
+                errors.append(
+                    f"Pool '{pool_name}': {bound} must be integer >= 1, got {value}"
+                )
+                break
+        else:
+            if isinstance(worker_count, int) and not (
+                min_workers <= worker_count <= max_workers
+            ):
+                errors.append(
+                    f"Pool '{pool_name}': worker_count must be between min_workers "
+                    f"and max_workers, got min_workers={min_workers}, "
+                    f"worker_count={worker_count}, max_workers={max_workers}"
+                )
+
+        latency_target = pool_config.get("p99_latency_target")
+        if latency_target is not None and (
+            isinstance(latency_target, bool)
+            or not isinstance(latency_target, (int, float))
+            or latency_target <= 0
+        ):
+            errors.append(
+                f"Pool '{pool_name}': p99_latency_target must be a number > 0, "
+                f"got {latency_target}"
+            )
+
         # Check commands list
         commands = pool_config.get("commands", [])
         if not isinstance(commands, list):
@@ -262,3 +306,83 @@ def get_worker_pools_config(opts):
 
     # Use default configuration
     return DEFAULT_WORKER_POOLS
+
+
+def validate_request_lanes_config(opts):
+    """
+    Validate the :conf_master:`request_lanes` admission control settings.
+
+    Like :func:`validate_worker_pools_config` every problem is collected and
+    reported in a single :class:`ValueError`.  The following invariants are
+    enforced:
+
+    * ``request_lanes`` is a dictionary of lane name to lane dictionary.
+    * Each lane has a non-empty list of string ``commands``, and no command
+      belongs to more than one lane.  ``"*"`` is not allowed; only the
+      commands listed explicitly are subject to admission control.
+    * The optional ``max_inflight`` is an integer ``>= 1``, ``max_queue`` an
+      integer ``>= 0`` and ``retry_after`` a number ``> 0``.
+
+    :param dict opts: The master configuration dictionary.
+    :returns: ``True`` when the configuration is valid.
+    :raises ValueError: If the configuration is invalid.
+    """
+    request_lanes = opts.get("request_lanes") or {}
+    if not isinstance(request_lanes, dict):
+        raise ValueError("request_lanes must be a dictionary")
+
+    errors = []
+    cmd_to_lane = {}
+    for lane_name, lane_config in request_lanes.items():
+        if not isinstance(lane_config, dict):
+            errors.append(f"Lane '{lane_name}': configuration must be a dictionary")
+            continue
+
+        commands = lane_config.get("commands")
+        if not isinstance(commands, list) or not commands:
+            errors.append(f"Lane '{lane_name}': commands must be a non-empty list")
+            commands = []
+        for cmd in commands:
+            if not isinstance(cmd, str) or cmd == "*":
+                errors.append(
+                    f"Lane '{lane_name}': command '{cmd}' must be a command name"
+                )
+            elif cmd in cmd_to_lane:
+                errors.append(
+                    f"Command '{cmd}' mapped to multiple lanes: "
+                    f"'{cmd_to_lane[cmd]}' and '{lane_name}'"
+                )
+            else:
+                cmd_to_lane[cmd] = lane_name
+
+        max_inflight = lane_config.get("max_inflight")
+        if max_inflight is not None and (
+            not isinstance(max_inflight, int) or max_inflight < 1
+        ):
+            errors.append(
+                f"Lane '{lane_name}': max_inflight must be integer >= 1, "
+                f"got {max_inflight}"
+            )
+        max_queue = lane_config.get("max_queue", 0)
+        if not isinstance(max_queue, int) or max_queue < 0:
+            errors.append(
+                f"Lane '{lane_name}': max_queue must be integer >= 0, got {max_queue}"
+            )
+        retry_after = lane_config.get("retry_after", 10)
+        if (
+            isinstance(retry_after, bool)
+            or not isinstance(retry_after, (int, float))
+            or retry_after <= 0
+        ):
+            errors.append(
+                f"Lane '{lane_name}': retry_after must be a number > 0, "
+                f"got {retry_after}"
+            )
+
+    if errors:
+        raise ValueError(
+            "Request lanes configuration validation failed:\n  - "
+            + "\n  - ".join(errors)
+        )
+
+    return True
@@ -7,6 +7,7 @@ authenticating peers
 import asyncio
 import base64
 import binascii
+import collections
 import copy
 import getpass
 import hashlib
@@ -31,10 +32,12 @@ import salt.channel.client
 import salt.defaults.exitcodes
 import salt.payload
 import salt.utils.asynchronous
+import salt.utils.compression
 import salt.utils.crypt
 import salt.utils.decorators
 import salt.utils.event
 import salt.utils.files
+import salt.utils.metrics
 import salt.utils.platform
 import salt.utils.rsax931
 import salt.utils.sdb
@@ -478,6 +481,117 @@ class PublicKeyString(PublicKey):
     # pylint: enable=super-init-not-called
 
 
+class PublicKeyCache:
+    """
+    A bounded LRU of parsed :class:`PublicKey` objects, so the PEM of a key
+    is only parsed again when the key changes.
+
+    Keys read with :meth:`from_file` are cached under their path and parsed
+    again when the file's modification time or size changes.  Keys given to
+    :meth:`from_str` are cached under the PEM string itself.  A ``size`` of
+    ``0`` disables the cache.
+    """
+
+    def __init__(self, size=1024):
+        self.size = size
+        self._keys = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _get(self, cache_key, stamp, load):
+        if self.size <= 0:
+            return load()
+        entry = self._keys.get(cache_key)
+        if entry is not None and entry[0] == stamp:
+            self._keys.move_to_end(cache_key)
+            return entry[1]
+        key = load()
+        self._keys[cache_key] = (stamp, key)
+        self._keys.move_to_end(cache_key)
+        while len(self._keys) > self.size:
+            self._keys.popitem(last=False)
+        return key
+
+    def from_file(self, path):
+        """
+        Return the public key stored at ``path``.  Raises ``OSError`` when
+        the file cannot be read, like :meth:`PublicKey.from_file`.
+        """
+        st = os.stat(path)
+        return self._get(
+            ("file", str(path)),
+            (st.st_mtime_ns, st.st_size),
+            lambda: PublicKey.from_file(path),
+        )
+
+    def from_str(self, key_str):
+        """
+        Return the public key for the PEM string ``key_str``.
+        """
+        return self._get(("str", key_str), None, lambda: PublicKey.from_str(key_str))
+
+    def clear(self):
+        self._keys.clear()
+
+
+class CrypticleCache:
+    """
+    A bounded LRU of ready :class:`Crypticle` objects, so the keys of an AES
+    session are only set up again when the session key changes.
+
+    Crypticles are cached under their key string, key size and serial and
+    built by ``factory``, called like :class:`Crypticle`.  A ``size`` of
+    ``0`` disables the cache.  Lookups are counted in :attr:`hits` and
+    :attr:`misses` and reported as the ``salt.crypticle_cache.lookups``
+    metric.
+    """
+
+    def __init__(self, opts, size=1024, factory=None):
+        self.opts = opts
+        self.size = size
+        self.factory = factory or Crypticle
+        self.hits = 0
+        self.misses = 0
+        self._crypticles = collections.OrderedDict()
+        # Created on first use, in the process doing the lookups
+        self._lookups = None
+
+    def __len__(self):
+        return len(self._crypticles)
+
+    def _count(self, result):
+        if self._lookups is None:
+            self._lookups = salt.utils.metrics.counter(
+                "salt.crypticle_cache.lookups",
+                description="Session crypticle cache lookups, by hit or miss.",
+            )
+        self._lookups.add(1, attributes={"result": result})
+
+    def get(self, key_string, key_size=192, serial=0):
+        """
+        Return the crypticle for ``key_string``, building it on a miss.
+        """
+        cache_key = (key_string, key_size, serial)
+        crypticle = self._crypticles.get(cache_key)
+        if crypticle is not None:
+            self._crypticles.move_to_end(cache_key)
+            self.hits += 1
+            self._count("hit")
+            return crypticle
+        self.misses += 1
+        self._count("miss")
+        crypticle = self.factory(self.opts, key_string, key_size, serial)
+        if self.size > 0:
+            self._crypticles[cache_key] = crypticle
+            while len(self._crypticles) > self.size:
+                self._crypticles.popitem(last=False)
+        return crypticle
+
+    def clear(self):
+        self._crypticles.clear()
+
+
 @salt.utils.decorators.memoize
 def get_rsa_key(path, passphrase):
     """
@@ -1101,6 +1215,14 @@ class AsyncAuth:
                 except SaltClientError as exc:
                     error = exc
                     break
+                if creds == "try later":
+                    if auth_retries > 0 and attempts >= auth_retries:
+                        error = SaltClientError(
+                            f"Failed to authenticate with the master after {attempts} attempts"
+                        )
+                        break
+                    await asyncio.sleep(self.retry_after)
+                    continue
                 if creds == "retry":
                     if self.opts.get("detect_mode") is True:
                         error = SaltClientError("Detect mode is on")
@@ -1274,6 +1396,14 @@ class AsyncAuth:
             elif payload["load"]["ret"] == "bad sig algo":
                 log.error("Sign-in attempt failed: %s", payload)
                 return "bad sig algo"
+            elif payload["load"]["ret"] == "try_later":
+                # The master is shedding authentication load
+                self.retry_after = salt.channel.client.try_later_delay(payload)
+                log.info(
+                    "The Salt Master is busy, retrying authentication in %s seconds",
+                    self.retry_after,
+                )
+                return "try later"
 
         clear_signed_data = payload["load"]
         clear_signature = payload["sig"]
@@ -1374,6 +1504,9 @@ class AsyncAuth:
                     self._finger_fail(self.opts["master_finger"], m_pub_fn)
 
         auth["publish_port"] = payload["publish_port"]
+        # Compression algorithms the master accepts, masters that predate
+        # transport_compression advertise none
+        auth["compression"] = payload.get("compression", [])
         return auth
 
     def get_keys(self):
@@ -1843,8 +1976,18 @@ class SAuth(AsyncAuth):
         with salt.channel.client.ReqChannel.factory(
             self.opts, crypt="clear"
         ) as channel:
+            attempts = 0
+            auth_retries = self.opts.get("auth_retries", 0)
             while True:
+                attempts += 1
                 creds = self.sign_in(channel=channel)
+                if creds == "try later":
+                    if auth_retries > 0 and attempts >= auth_retries:
+                        raise SaltClientError(
+                            f"Failed to authenticate with the master after {attempts} attempts"
+                        )
+                    time.sleep(self.retry_after)
+                    continue
                 if creds == "retry":
                     if self.opts.get("caller"):
                         # We have a list of masters, so we should break
@@ -1961,8 +2104,30 @@ class Crypticle:
     def __init__(self, opts, key_string, key_size=192, serial=0):
         self.key_string = key_string
         self.keys = self.extract_keys(self.key_string, key_size)
+        self._setup_keys()
         self.key_size = key_size
         self.serial = serial
+        self.compression_threshold = (opts or {}).get(
+            "transport_compression_threshold",
+            salt.utils.compression.DEFAULT_THRESHOLD,
+        )
+
+    def _setup_keys(self):
+        # Set up once and reused by every encrypt() and decrypt()
+        aes_key, hmac_key = self.keys
+        self._aes = algorithms.AES(aes_key)
+        self._hmac = hmac.new(hmac_key, digestmod=hashlib.sha256)
+
+    # The HMAC object is not picklable, it is set up again when unpickling
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_aes"]
+        del state["_hmac"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup_keys()
 
     @classmethod
     def generate_key_string(cls, key_size=192, **kwargs):
@@ -2000,52 +2165,56 @@ class Crypticle:
         """
         encrypt data with AES-CBC and sign it with HMAC-SHA256
         """
-        aes_key, hmac_key = self.keys
         pad = self.AES_BLOCK_SIZE - len(data) % self.AES_BLOCK_SIZE
         data = data + salt.utils.stringutils.to_bytes(pad * chr(pad))
         iv_bytes = os.urandom(self.AES_BLOCK_SIZE)
-        cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv_bytes))
+        cipher = Cipher(self._aes, modes.CBC(iv_bytes))
         encryptor = cipher.encryptor()
         encr = encryptor.update(data)
         encr += encryptor.finalize()
         data = iv_bytes + encr
-        sig = hmac.new(hmac_key, data, hashlib.sha256).digest()
-        return data + sig
+        mac = self._hmac.copy()
+        mac.update(data)
+        return data + mac.digest()
 
     def decrypt(self, data):
         """
         verify HMAC-SHA256 signature and decrypt data with AES-CBC
         """
-        aes_key, hmac_key = self.keys
         sig = data[-self.SIG_SIZE :]
         data = data[: -self.SIG_SIZE]
         if not isinstance(data, bytes):
             data = salt.utils.stringutils.to_bytes(data)
-        mac_bytes = hmac.new(hmac_key, data, hashlib.sha256).digest()
-        if len(mac_bytes) != len(sig):
-            log.debug("Failed to authenticate message")
-            raise AuthenticationError("message authentication failed")
-        result = 0
-        for zipped_x, zipped_y in zip(mac_bytes, sig):
-            result |= zipped_x ^ zipped_y
-        if result != 0:
+        mac = self._hmac.copy()
+        mac.update(data)
+        if not hmac.compare_digest(mac.digest(), sig):
             log.debug("Failed to authenticate message")
             raise AuthenticationError("message authentication failed")
         iv_bytes = data[: self.AES_BLOCK_SIZE]
         data = data[self.AES_BLOCK_SIZE :]
-        cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv_bytes))
+        cipher = Cipher(self._aes, modes.CBC(iv_bytes))
         decryptor = cipher.decryptor()
         data = decryptor.update(data) + decryptor.finalize()
         return data[: -data[-1]]
 
-    def dumps(self, obj, nonce=None):
+    def _serialize(self, obj, compression=None):
+        return salt.utils.compression.compress(
+            salt.payload.dumps(obj), compression, self.compression_threshold
+        )
+
+    def dumps(self, obj, nonce=None, compression=None):
         """
         Serialize and encrypt a python object
+
+        ``compression`` names the algorithm used to compress the serialized
+        object, see :mod:`salt.utils.compression`.
         """
         if nonce:
-            toencrypt = self.PICKLE_PAD + nonce.encode() + salt.payload.dumps(obj)
+            toencrypt = (
+                self.PICKLE_PAD + nonce.encode() + self._serialize(obj, compression)
+            )
         else:
-            toencrypt = self.PICKLE_PAD + salt.payload.dumps(obj)
+            toencrypt = self.PICKLE_PAD + self._serialize(obj, compression)
         return self.encrypt(toencrypt)
 
     def loads(self, data, raw=False, nonce=None):
@@ -2062,7 +2231,7 @@ class Crypticle:
             data = data[32:]
             if ret_nonce != nonce:
                 raise SaltClientError(f"Nonce verification error {ret_nonce} {nonce}")
-        payload = salt.payload.loads(data, raw=raw)
+        payload = salt.payload.loads(salt.utils.compression.decompress(data), raw=raw)
         if isinstance(payload, dict):
             if "serial" in payload:
                 serial = payload.pop("serial")
@@ -2095,7 +2264,7 @@ class TLSAwareCrypticle(Crypticle):
         super().__init__(opts, key_string, key_size, serial)
         self.opts = opts
 
-    def dumps(self, obj, nonce=None, peer_cert=None, claimed_id=None):
+    def dumps(self, obj, nonce=None, peer_cert=None, claimed_id=None, compression=None):
         """
         Serialize and conditionally encrypt a python object.
 
@@ -2107,6 +2276,7 @@ class TLSAwareCrypticle(Crypticle):
             nonce: Optional nonce for verification
             peer_cert: Peer's SSL certificate (DER format bytes)
             claimed_id: The minion ID claimed in the message
+            compression: Optional algorithm to compress the serialized object
 
         Returns:
             bytes: Encrypted or plaintext serialized data
@@ -2124,14 +2294,18 @@ class TLSAwareCrypticle(Crypticle):
                     self.TLS_MARKER
                     + self.PICKLE_PAD
                     + nonce.encode()
-                    + salt.payload.dumps(obj)
+                    + self._serialize(obj, compression)
                 )
             else:
-                plaintext = self.TLS_MARKER + self.PICKLE_PAD + salt.payload.dumps(obj)
+                plaintext = (
+                    self.TLS_MARKER
+                    + self.PICKLE_PAD
+                    + self._serialize(obj, compression)
+                )
             return plaintext
         else:
             # Fall back to standard AES encryption
-            return super().dumps(obj, nonce=nonce)
+            return super().dumps(obj, nonce=nonce, compression=compression)
 
     def loads(self, data, raw=False, nonce=None, peer_cert=None, claimed_id=None):
         """
@@ -2183,7 +2357,9 @@ class TLSAwareCrypticle(Crypticle):
                     )
 
             # Deserialize payload
-            payload = salt.payload.loads(data, raw=raw)
+            payload = salt.payload.loads(
+                salt.utils.compression.decompress(data), raw=raw
+            )
 
             # Handle serial number check
             if isinstance(payload, dict):
@@ -335,6 +335,17 @@ class SaltReqTimeoutError(SaltException):
     """
 
 
+class SaltMasterBusyError(SaltReqTimeoutError):
+    """
+    Thrown when the salt master rejected a request because it is overloaded
+    and asked to retry it after ``retry_after`` seconds
+    """
+
+    def __init__(self, message="", retry_after=0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class TimedProcTimeoutError(SaltException):
     """
     Thrown when a timed subprocess does not terminate within the timeout,
@@ -4,15 +4,15 @@ involves preparing the three listeners and the workers needed by the master.
 """
 
 import asyncio
-import binascii
 import collections
+import concurrent.futures
 import copy
 import ctypes
-import hashlib
 import logging
 import multiprocessing
 import os
 import pathlib
+import random
 import re
 import signal
 import stat
@@ -47,6 +47,8 @@ import salt.utils.batch_manager
 import salt.utils.batch_output
 import salt.utils.batch_state
 import salt.utils.cache
+import salt.utils.compression
+import salt.utils.crypto_pool
 import salt.utils.ctx
 import salt.utils.event
 import salt.utils.files
@@ -66,12 +68,12 @@ import salt.utils.stringutils
 import salt.utils.tracing
 import salt.utils.user
 import salt.utils.verify
+import salt.utils.worker_pools
 import salt.utils.zeromq
 import salt.wheel
 from salt.cli.batch_async import BatchAsync, batch_async_required
 from salt.config import DEFAULT_INTERVAL
 from salt.defaults import DEFAULT_TARGET_DELIM
-from salt.exceptions import UnsupportedAlgorithm
 from salt.transport import TRANSPORTS
 from salt.utils.cache import CacheCli
 from salt.utils.channel import iter_transport_opts
@@ -98,13 +100,17 @@ log = logging.getLogger(__name__)
 _WORKERS_INFLIGHT = None
 
 
-def _register_master_observables(opts, workers_inflight):
+def _register_master_observables(opts, workers_inflight, pool_stats=None):
     """
     Register the master-side observable gauges with the metrics module.
 
     Called once from the master parent process during :meth:`Master.start`.
     Workers must not call this — they'd register duplicate callbacks and
     over-report.
+
+    When ``pool_stats`` (a dict of pool name to
+    :class:`salt.utils.worker_pools.PoolStats`) is given, queue depth and
+    worker counts are reported per pool.
     """
     if not salt.utils.metrics.is_enabled():
         return
@@ -127,6 +133,11 @@ def _register_master_observables(opts, workers_inflight):
 
     def _queue_depth_cb(_options):
         try:
+            if pool_stats:
+                return tuple(
+                    Observation(stats.inflight.value, {"pool": pool_name})
+                    for pool_name, stats in pool_stats.items()
+                )
             with workers_inflight.get_lock():
                 value = int(workers_inflight.value)
             return (Observation(value, {"pool": "default"}),)
@@ -134,6 +145,12 @@ def _register_master_observables(opts, workers_inflight):
             log.debug("workers.queue.depth observable failed: %s", exc)
             return ()
 
+    def _worker_count_cb(_options):
+        return tuple(
+            Observation(stats.workers.value, {"pool": pool_name})
+            for pool_name, stats in (pool_stats or {}).items()
+        )
+
     def _open_fds_cb(_options):
         if psutil is None:
             return ()
@@ -157,6 +174,11 @@ def _register_master_observables(opts, workers_inflight):
         _queue_depth_cb,
         description="MWorker payloads in flight (incremented on _handle_payload entry).",
     )
+    salt.utils.metrics.observable_gauge(
+        "salt.master.workers.count",
+        _worker_count_cb,
+        description="MWorker processes currently running in each worker pool.",
+    )
     salt.utils.metrics.observable_gauge(
         "salt.process.open_fds",
         _open_fds_cb,
@@ -619,18 +641,20 @@ class Maintenance(salt.utils.process.SignalHandlingProcess):
                 # Fire new minions present event
                 data = {"new": list(new), "lost": list(lost)}
                 self.event.fire_event(data, tagify("change", "presence"))
+                old_present.difference_update(lost)
+                old_present.update(new)
+                # Persist the presence list so a Maintenance restart can seed
+                # old_present without triggering spurious "new" events.
+                presence_cache = salt.utils.cache.CacheFactory.factory(
+                    "disk",
+                    3600,
+                    minion_cache_path=os.path.join(
+                        self.opts["cachedir"], "presence-data"
+                    ),
+                )
+                presence_cache["present"] = list(present)
             data = {"present": list(present)}
             self.event.fire_event(data, tagify("present", "presence"))
-            old_present.clear()
-            old_present.update(present)
-            # Persist the presence list so a Maintenance restart can seed
-            # old_present without triggering spurious "new" events.
-            presence_cache = salt.utils.cache.CacheFactory.factory(
-                "disk",
-                3600,
-                minion_cache_path=os.path.join(self.opts["cachedir"], "presence-data"),
-            )
-            presence_cache["present"] = list(present)
 
     def handle_batch_jobs(self):
         """
@@ -1036,7 +1060,16 @@ class Master(SMaster):
         # a constructor change.
         global _WORKERS_INFLIGHT  # pylint: disable=global-statement
         _WORKERS_INFLIGHT = multiprocessing.Value("i", 0)
-        _register_master_observables(self.opts, _WORKERS_INFLIGHT)
+        # Per-pool load statistics, shared with the RequestServer (which
+        # autoscales the pools from them) and its MWorkers.
+        pool_stats = None
+        if self.opts.get("worker_pools_enabled", True):
+            from salt.config.worker_pools import get_worker_pools_config
+
+            pool_stats = salt.utils.worker_pools.create_pool_stats(
+                get_worker_pools_config(self.opts)
+            )
+        _register_master_observables(self.opts, _WORKERS_INFLIGHT, pool_stats)
 
         # Reset signals to default ones before adding processes to the process
         # manager. We don't want the processes being started to inherit those
@@ -1172,7 +1205,7 @@ class Master(SMaster):
                 time.sleep(2)
 
             log.info("Creating master request server process")
-            kwargs = {}
+            kwargs = {"pool_stats": pool_stats}
             if salt.utils.platform.spawning_platform():
                 kwargs["secrets"] = SMaster.secrets
 
@@ -1306,10 +1339,7 @@ class EventMonitor(salt.utils.process.SignalHandlingProcess):
                     for transport, opts in iter_transport_opts(self.opts):
                         chan = salt.channel.server.PubServerChannel.factory(opts)
                         self.channels.append(chan)
-                tasks = []
-                for chan in self.channels:
-                    tasks.append(asyncio.create_task(chan.publish(data)))
-                await asyncio.gather(*tasks)
+                await salt.channel.server.publish_once(self.channels, data)
         elif tag.startswith("salt/job") and "/new" in tag:
             # Cluster replication of job submissions: when a peer master
             # publishes a new job, mirror its `minions` list into our
@@ -1534,6 +1564,30 @@ class EventMonitor(salt.utils.process.SignalHandlingProcess):
                 io_loop.close()
 
 
+class RequestLane:
+    """
+    Admission state of one :conf_master:`request_lanes` entry.
+
+    A lane lets at most ``max_inflight`` of its requests be handled by the
+    workers at once and holds up to ``max_queue`` more until a slot frees
+    up.  Requests beyond that are rejected with a "try later" reply.
+    """
+
+    def __init__(self, name, config):
+        self.name = name
+        self.max_inflight = config.get("max_inflight")
+        self.max_queue = config.get("max_queue", 0)
+        self.retry_after = config.get("retry_after", 10)
+        self.inflight = 0
+        # (ident, request, queued_at) tuples waiting for an inflight slot
+        self.queue = collections.deque()
+        self.rejected = 0
+
+    @property
+    def full(self):
+        return self.max_inflight is not None and self.inflight >= self.max_inflight
+
+
 class RequestRouter:
     """
     Classify incoming master requests and map them to their worker pool.
@@ -1557,6 +1611,15 @@ class RequestRouter:
     Instances also keep a per-pool routing counter in :attr:`stats`, which
     the master can surface for observability.
 
+    When :conf_master:`request_lanes` is configured the router also performs
+    admission control.  Every request whose command belongs to a lane must be
+    admitted with :meth:`admit` before it is forwarded, and :meth:`complete`
+    must be called once its reply has been sent.  This bounds how many
+    expensive requests (for example ``_auth`` during a key rotation) occupy
+    the workers and how many wait for them, and rejects the excess early with
+    :meth:`try_later` instead of letting every request time out together.
+    Commands that are not in a lane are never delayed or rejected.
+
     :param dict opts: Master configuration dictionary.  Must contain a
         resolved ``worker_pools`` layout; the layout is read directly from
         ``opts`` without re-running validation.
@@ -1565,17 +1628,29 @@ class RequestRouter:
         in order to inspect their ``cmd`` field for routing.  This is
         required for netapi and minion traffic where the transport delivers
         encrypted blobs to the routing process.
+    :param bool lanes: Whether to build the :conf_master:`request_lanes`
+        admission state and its metrics.  Pass ``False`` where :meth:`admit`
+        is never called, so configured lanes are not reported as enforced.
     """
 
-    def __init__(self, opts, secrets=None):
+    def __init__(self, opts, secrets=None, lanes=True):
         self.opts = opts
         self.secrets = secrets
         self.cmd_to_pool = {}
         self.default_pool = None
         self.pools = {}
         self.stats = {}
+        self.lanes = {}
+        self.cmd_to_lane = {}
+        # ident -> (lane, admitted_at) for requests handed to the workers
+        self.inflight = {}
+        # Queued requests admitted by admit(), see pop_released()
+        self.released = []
+        self.lane_timeout = opts.get("request_lanes_timeout", 60)
 
         self._build_routing_table()
+        if lanes:
+            self._build_lanes()
 
     def _build_routing_table(self):
         """Build command-to-pool routing table from user configuration."""
@@ -1620,6 +1695,37 @@ class RequestRouter:
         for pool_name in worker_pools.keys():
             self.stats[pool_name] = 0
 
+    def _build_lanes(self):
+        """Build the command-to-lane table from ``request_lanes``."""
+        for lane_name, lane_config in (self.opts.get("request_lanes") or {}).items():
+            self.lanes[lane_name] = RequestLane(lane_name, lane_config)
+            for cmd in lane_config.get("commands", []):
+                self.cmd_to_lane[cmd] = self.lanes[lane_name]
+        if self.lanes:
+            self._rejected = salt.utils.metrics.counter(
+                "salt.master.request_lanes.rejected",
+                description="Requests rejected with a try later reply, per lane.",
+            )
+            salt.utils.metrics.observable_gauge(
+                "salt.master.request_lanes.depth",
+                self._lane_depth_cb,
+                description="Requests handled by the workers (inflight) or waiting "
+                "for them (queued), per lane.",
+            )
+
+    def _lane_depth_cb(self, _options):
+        from opentelemetry.metrics import Observation
+
+        observations = []
+        for lane in self.lanes.values():
+            observations.append(
+                Observation(lane.inflight, {"lane": lane.name, "state": "inflight"})
+            )
+            observations.append(
+                Observation(len(lane.queue), {"lane": lane.name, "state": "queued"})
+            )
+        return observations
+
     def route_request(self, payload):
         """
         Determine which pool should handle this request.
@@ -1630,10 +1736,141 @@ class RequestRouter:
         Returns:
             str: Name of the pool that should handle this request
         """
+        return self.classify(payload)[1]
+
+    def classify(self, payload):
+        """
+        Determine the command of this request and the pool that should
+        handle it.
+
+        Args:
+            payload: Request payload dictionary
+
+        Returns:
+            tuple: ``(cmd, pool_name)``
+        """
         cmd = self._extract_command(payload)
         pool = self._classify_request(cmd)
         self.stats[pool] = self.stats.get(pool, 0) + 1
-        return pool
+        return cmd, pool
+
+    def admit(self, cmd, ident, request):
+        """
+        Ask the lane of ``cmd`` to admit a request.
+
+        Args:
+            cmd: Command name of the request
+            ident: Unique identity of the request's client, passed back to
+                :meth:`complete` once the reply has been sent
+            request: Opaque request object, handed back by :meth:`complete`
+                or :meth:`expire` if the request has to wait
+
+        Returns:
+            ``True`` if the request should be forwarded now, ``False`` if it
+            was queued and ``None`` if it was rejected and the client should
+            receive :meth:`try_later`.  Requests of other lanes this admits
+            are collected by :meth:`pop_released`.
+        """
+        lane = self.cmd_to_lane.get(cmd)
+        if lane is None:
+            return True
+        self._forget(ident, lane)
+        if not lane.full:
+            self._start(lane, ident)
+            return True
+        if len(lane.queue) < lane.max_queue:
+            lane.queue.append((ident, request, time.monotonic()))
+            return False
+        lane.rejected += 1
+        self._rejected.add(1, {"lane": lane.name})
+        return None
+
+    def complete(self, ident):
+        """
+        Record that the reply to ``ident``'s request was sent.
+
+        Returns:
+            list: Queued requests that were admitted in its place and should
+            be forwarded now.
+        """
+        entry = self.inflight.pop(ident, None)
+        if entry is None:
+            return []
+        lane = entry[0]
+        lane.inflight -= 1
+        return self._dispatch(lane)
+
+    def expire(self, now=None):
+        """
+        Forget requests that have waited or been inflight longer than
+        :conf_master:`request_lanes_timeout`; their clients have given up on
+        them by now.  Call this periodically so a worker that never replies
+        cannot hold a lane's slots forever.
+
+        Returns:
+            list: Queued requests that should be forwarded now.
+        """
+        if now is None:
+            now = time.monotonic()
+        deadline = now - self.lane_timeout
+        lanes = set()
+        for ident, (lane, admitted_at) in list(self.inflight.items()):
+            if admitted_at < deadline:
+                del self.inflight[ident]
+                lane.inflight -= 1
+                lanes.add(lane)
+        dispatch = []
+        for lane in self.lanes.values():
+            while lane.queue and lane.queue[0][2] < deadline:
+                lane.queue.popleft()
+            if lane in lanes:
+                dispatch.extend(self._dispatch(lane))
+        return dispatch
+
+    def try_later(self, cmd):
+        """
+        Build the reply sent to a client whose ``cmd`` request was rejected.
+
+        The backoff hint is the lane's ``retry_after`` with up to 50% random
+        jitter so rejected clients do not all come back at once.
+        """
+        lane = self.cmd_to_lane[cmd]
+        retry_after = round(lane.retry_after * random.uniform(1, 1.5), 3)
+        return {
+            "enc": "clear",
+            "load": {"ret": "try_later", "retry_after": retry_after},
+        }
+
+    def pop_released(self):
+        """
+        Return the queued requests admitted because :meth:`admit` found their
+        client's previous request abandoned, and should be forwarded now.
+        """
+        released, self.released = self.released, []
+        return released
+
+    def _forget(self, ident, lane):
+        # A REQ client only has one request outstanding; a new request from
+        # the same ident means the previous reply will never be sent.
+        previous = self.inflight.pop(ident, None)
+        if previous is None:
+            return
+        previous[0].inflight -= 1
+        if previous[0] is not lane:
+            self.released.extend(self._dispatch(previous[0]))
+
+    def _start(self, lane, ident):
+        self._forget(ident, lane)
+        lane.inflight += 1
+        self.inflight[ident] = (lane, time.monotonic())
+
+    def _dispatch(self, lane):
+        dispatch = []
+        while lane.queue and not lane.full:
+            ident, request, _ = lane.queue.popleft()
+            self._start(lane, ident)
+            dispatch.append(request)
+        return dispatch
 
     def _classify_request(self, cmd):
         """
@@ -1710,13 +1947,15 @@ class RequestServer(salt.utils.process.SignalHandlingProcess):
     interface.
     """
 
-    def __init__(self, opts, key, mkey, secrets=None, **kwargs):
+    def __init__(self, opts, key, mkey, secrets=None, pool_stats=None, **kwargs):
         """
         Create a request server
 
         :param dict opts: The salt options dictionary
         :key dict: The user starting the server and the AES key
         :mkey dict: The user starting the server and the RSA key
+        :param dict pool_stats: Shared per-pool load statistics used to
+            autoscale the worker pools
 
         :rtype: RequestServer
         :returns: Request server
@@ -1727,6 +1966,9 @@ class RequestServer(salt.utils.process.SignalHandlingProcess):
         # Prepare the AES key
         self.key = key
         self.secrets = secrets
+        self.pool_stats = pool_stats
+        # Retired workers that are still draining, and the tasks reaping them
+        self._reapers = {}
 
     def _handle_signals(self, signum, sigframe):  # pylint: disable=unused-argument
         self.destroy(signum)
@@ -1776,27 +2018,30 @@ class RequestServer(salt.utils.process.SignalHandlingProcess):
             )
             os.nice(self.opts["req_server_niceness"])
 
+        self.req_channels = req_channels
+        autoscaler = None
+
         # Reset signals to default ones before adding processes to the process
         # manager. We don't want the processes being started to inherit those
         # signal handlers
         with salt.utils.process.default_signals(signal.SIGINT, signal.SIGTERM):
             if worker_pools:
                 # Multi-pool mode: Create workers for each pool
+                if self.pool_stats is None:
+                    self.pool_stats = salt.utils.worker_pools.create_pool_stats(
+                        worker_pools
+                    )
                 for pool_name, pool_config in worker_pools.items():
                     worker_count = pool_config.get("worker_count", 1)
                     for pool_index in range(worker_count):
-                        name = f"MWorker-{pool_name}-{pool_index}"
-                        self.process_manager.add_process(
-                            MWorker,
-                            args=(
-                                self.opts,
-                                self.master_key,
-                                self.key,
-                                req_channels,
-                            ),
-                            kwargs={"pool_name": pool_name, "pool_index": pool_index},
-                            name=name,
-                        )
+                        self._add_pool_worker(pool_name, pool_index)
+                autoscaler = salt.utils.worker_pools.PoolAutoscaler(
+                    self.opts,
+                    worker_pools,
+                    self.pool_stats,
+                    add_worker=self._add_pool_worker,
+                    remove_worker=self._remove_pool_worker,
+                )
             else:
                 # Legacy single-pool mode
                 for ind in range(int(self.opts["worker_threads"])):
@@ -1807,7 +2052,56 @@ class RequestServer(salt.utils.process.SignalHandlingProcess):
                         name=name,
                     )
 
-        asyncio.run(self.process_manager.run())
+        if autoscaler is not None and autoscaler.enabled:
+            asyncio.run(self._run_autoscaled(autoscaler))
+        else:
+            asyncio.run(self.process_manager.run())
+
+    def _add_pool_worker(self, pool_name, pool_index):
+        """
+        Start MWorker ``pool_index`` of ``pool_name``
+        """
+        with salt.utils.process.default_signals(signal.SIGINT, signal.SIGTERM):
+            self.process_manager.add_process(
+                MWorker,
+                args=(self.opts, self.master_key, self.key, self.req_channels),
+                kwargs={
+                    "pool_name": pool_name,
+                    "pool_index": pool_index,
+                    "pool_stats": self.pool_stats.get(pool_name),
+                },
+                name=f"MWorker-{pool_name}-{pool_index}",
+            )
+
+    def _remove_pool_worker(self, pool_name, pool_index):
+        """
+        Retire MWorker ``pool_index`` of ``pool_name``.  The worker drains
+        its requests and exits on its own; it is only terminated if it is
+        still running after :conf_master:`worker_pools_drain_timeout`.
+        """
+        self.pool_stats[pool_name].retire(pool_index)
+        process = self.process_manager.release_process(
+            f"MWorker-{pool_name}-{pool_index}"
+        )
+        if process is None:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self.process_manager.reap_process(
+                process, grace=self.opts.get("worker_pools_drain_timeout", 60)
+            )
+        )
+        self._reapers[process] = task
+        task.add_done_callback(lambda _: self._reapers.pop(process, None))
+
+    async def _run_autoscaled(self, autoscaler):
+        """
+        Run the process manager alongside the worker pool autoscaler
+        """
+        task = asyncio.create_task(autoscaler.run())
+        try:
+            await self.process_manager.run(asynchronous=True)
+        finally:
+            task.cancel()
 
     def run(self):
         """
@@ -1816,6 +2110,10 @@ class RequestServer(salt.utils.process.SignalHandlingProcess):
         self.__bind()
 
     def destroy(self, signum=signal.SIGTERM):
+        for process in list(getattr(self, "_reapers", ())):
+            # Do not leave retired workers behind that are still draining
+            if process.is_alive():
+                process.terminate()
         if hasattr(self, "process_manager"):
             self.process_manager.stop_restarting()
             self.process_manager.send_signal_to_processes(signum)
@@ -1835,7 +2133,15 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
     """
 
     def __init__(
-        self, opts, mkey, key, req_channels, pool_name=None, pool_index=None, **kwargs
+        self,
+        opts,
+        mkey,
+        key,
+        req_channels,
+        pool_name=None,
+        pool_index=None,
+        pool_stats=None,
+        **kwargs,
     ):
         """
         Create a salt master worker process
@@ -1845,6 +2151,8 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         :param dict key: The user running the salt master and the AES key
         :param str pool_name: Name of the worker pool this worker belongs to
         :param int pool_index: Index of this worker within its pool
+        :param pool_stats: The :class:`salt.utils.worker_pools.PoolStats` of
+            this worker's pool
 
         :rtype: MWorker
         :return: Master worker
@@ -1862,6 +2170,11 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         # Pool-specific attributes
         self.pool_name = pool_name or "default"
         self.pool_index = pool_index if pool_index is not None else 0
+        self.pool_stats = pool_stats
+        # The worker retires once its slot moves on to a new generation
+        self.pool_generation = (
+            pool_stats.generation(self.pool_index) if pool_stats is not None else None
+        )
 
     # We need __setstate__ and __getstate__ to also pickle 'SMaster.secrets'.
     # Otherwise, 'SMaster.secrets' won't be copied over to the spawned process
@@ -1878,6 +2191,27 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         state.update({"k_mtime": self.k_mtime, "secrets": SMaster.secrets})
         return state
 
+    async def _watch_retirement(self):
+        """
+        Drain and stop this worker once the autoscaler retires its slot.
+        """
+        while self.pool_stats.generation(self.pool_index) == self.pool_generation:
+            await asyncio.sleep(1)
+        log.info("%s was retired, draining", self.name)
+        for channel in self.req_channels:
+            try:
+                await channel.drain()
+            except Exception:  # pylint: disable=broad-except
+                log.error("%s failed to drain a channel", self.name, exc_info=True)
+        # Flush buffered returns before exiting
+        for funcs in ("clear_funcs", "aes_funcs"):
+            if getattr(self, funcs, None) is not None:
+                try:
+                    getattr(self, funcs).destroy()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+        self.io_loop.stop()
+
     def _handle_signals(self, signum, sigframe):
         for channel in getattr(self, "req_channels", ()):
             try:
@@ -1948,6 +2282,8 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         async def _start():
             self._async_modules_ready = asyncio.Event()
             loader_thread.start()
+            if self.pool_generation is not None:
+                self._retirement = asyncio.create_task(self._watch_retirement())
 
         self.io_loop.run_until_complete(_start())
 
@@ -1971,6 +2307,10 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
         if _inflight is not None:
             with _inflight.get_lock():
                 _inflight.value += 1
+        pool_stats = getattr(self, "pool_stats", None)
+        if pool_stats is not None:
+            pool_stats.start()
+            start = time.monotonic()
         try:
             if payload.get("cmd") == "_auth":
                 if self.opts["master_stats"]:
@@ -1999,6 +2339,8 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
             if _inflight is not None:
                 with _inflight.get_lock():
                     _inflight.value -= 1
+            if pool_stats is not None:
+                pool_stats.finish(time.monotonic() - start)
 
     def _post_stats(self, start, cmd):
         """
@@ -2018,6 +2360,10 @@ class MWorker(salt.utils.process.SignalHandlingProcess):
                     "pool": self.pool_name,
                     "pool_index": self.pool_index,
                     "stats": self.stats,
+                    "target_cache": {
+                        "clear": self.clear_funcs.ckminions.target_cache.stats(),
+                        "aes": self.aes_funcs.ckminions.target_cache.stats(),
+                    },
                 },
                 tagify(self.name, "stats"),
             )
@@ -2207,6 +2553,10 @@ class AESFuncs(TransportMethods):
         "_file_envs",
     )
 
+    # Set by ``__init__``; a class-level default keeps partially built
+    # instances (tests, tooling) on the unbatched store_job path.
+    return_batcher = None
+
     def __init__(self, opts):
         """
         Create a new AESFuncs
@@ -2243,6 +2593,9 @@ class AESFuncs(TransportMethods):
         self.key_cache = salt.cache.Cache(
             self.opts, driver=self.opts["keys.cache_driver"]
         )
+        self.return_batcher = salt.utils.job.ReturnBatcher(
+            self.opts, event=self.event, mminion=self.mminion
+        )
 
     def __setup_fileserver(self):
         """
@@ -2713,21 +3066,25 @@ class AESFuncs(TransportMethods):
                 "Received minion error from [%s]: %s", id_, load["data"]["message"]
             )
 
+        # A syndic forwards the minion lists of many events at once; merge
+        # them so every jid costs a single save_minions call.
+        minions_by_jid = {}
         for event in load.get("events", []):
             event_data = event.get("data", {})
             if "minions" in event_data:
                 jid = event_data.get("jid")
                 if not jid:
                     continue
-                minions = event_data["minions"]
-                try:
-                    salt.utils.job.store_minions(
-                        self.opts, jid, minions, mminion=self.mminion, syndic_id=id_
-                    )
-                except (KeyError, salt.exceptions.SaltCacheError) as exc:
-                    log.error(
-                        "Could not add minion(s) %s for job %s: %s", minions, jid, exc
-                    )
+                minions_by_jid.setdefault(jid, []).extend(event_data["minions"])
+        for jid, minions in minions_by_jid.items():
+            try:
+                salt.utils.job.store_minions(
+                    self.opts, jid, minions, mminion=self.mminion, syndic_id=id_
+                )
+            except (KeyError, salt.exceptions.SaltCacheError) as exc:
+                log.error(
+                    "Could not add minion(s) %s for job %s: %s", minions, jid, exc
+                )
 
     def _return(self, load):
         """
@@ -2797,6 +3154,12 @@ class AESFuncs(TransportMethods):
         if "resource_id" in load:
             load["id"] = load.pop("resource_id")
 
+        if self.return_batcher is not None and self.return_batcher.enabled:
+            # Coalesce with the other returns this worker is handling; the
+            # batcher flushes on size or after ``return_batch_interval``.
+            self.return_batcher.add(load)
+            return
+
         try:
             salt.utils.job.store_job(
                 self.opts, load, event=self.event, mminion=self.mminion
@@ -3032,6 +3395,11 @@ class AESFuncs(TransportMethods):
         return ret, {"fun": "send"}
 
     def destroy(self):
+        if self.return_batcher is not None:
+            # Store whatever is still buffered before the event bus and
+            # master minion go away.
+            self.return_batcher.flush()
+            self.return_batcher = None
         if self.masterapi is not None:
             self.masterapi.destroy()
             self.masterapi = None
@@ -3089,6 +3457,10 @@ class AuthFuncs(TransportMethods):
             self.opts, self.opts["sock_dir"], listen=False
         )
         self.master_key = salt.crypt.MasterKeys(self.opts)
+        self.pub_keys = salt.crypt.PublicKeyCache(
+            self.opts.get("auth_pubkey_cache_size", 1024)
+        )
+        self.crypto_pool = None
         (pathlib.Path(self.opts["cachedir"]) / "sessions").mkdir(exist_ok=True)
         self.sessions = {}
         self.auto_key = salt.daemons.masterapi.AutoKey(self.opts)
@@ -3138,19 +3510,38 @@ class AuthFuncs(TransportMethods):
         return salt.crypt.clean_key(key1) == salt.crypt.clean_key(key2)
 
     def _clear_signed(self, load, algorithm):
+        return salt.utils.crypto_pool.clear_signed(self.master_key, load, algorithm)
+
+    @staticmethod
+    def _record_auth_attempt(ret):
+        """
+        Record one ``salt.auth.attempts`` increment, labelling the result
+        from the ``_auth`` reply ``ret`` (``None`` when it raised).
+        """
+        result = "error"
+        # ``ret`` may be ``{"enc": "clear", "load": {"ret": ...}}`` or a
+        # ``_clear_signed``-wrapped variant of the same shape.  Salt
+        # encodes outcomes in the inner ``ret`` value: True / a dict =
+        # success, False = key rejected, "full" = max_minions hit,
+        # "denied" / "rejected" = explicit reject.
         try:
-            tosign = salt.payload.dumps(load)
-            return {
-                "enc": "clear",
-                "load": tosign,
-                "sig": self.master_key.sign(tosign, algorithm=algorithm),
-            }
-        except UnsupportedAlgorithm:
-            log.info(
-                "Minion tried to authenticate with unsupported signing algorithm: %s",
-                algorithm,
-            )
-            return {"enc": "clear", "load": {"ret": "bad sig algo"}}
+            inner = ret.get("load", {}) if isinstance(ret, dict) else {}
+            if isinstance(inner, dict):
+                r = inner.get("ret")
+                if r is True or isinstance(r, dict):
+                    result = "success"
+                elif r == "full":
+                    result = "max_minions"
+                elif r in (False, "denied", "rejected"):
+                    result = "rejected"
+                elif isinstance(r, str):
+                    result = r
+        except Exception:  # pylint: disable=broad-except
+            pass
+        salt.utils.metrics.counter(
+            "salt.auth.attempts",
+            description="Minion authentication attempts.",
+        ).add(1, attributes={"result": result})
 
     def _auth(self, load, sign_messages=False, version=0):
         """
@@ -3158,34 +3549,87 @@ class AuthFuncs(TransportMethods):
         ``salt.auth.attempts`` increment per call, labelling the result
         from the wrapped return value.
         """
-        result = "error"
+        ret = None
         try:
             ret = self._auth_impl(load, sign_messages=sign_messages, version=version)
-            # ``ret`` may be ``{"enc": "clear", "load": {"ret": ...}}`` or a
-            # ``_clear_signed``-wrapped variant of the same shape.  Salt
-            # encodes outcomes in the inner ``ret`` value: True / a dict =
-            # success, False = key rejected, "full" = max_minions hit,
-            # "denied" / "rejected" = explicit reject.
-            try:
-                inner = ret.get("load", {}) if isinstance(ret, dict) else {}
-                if isinstance(inner, dict):
-                    r = inner.get("ret")
-                    if r is True or isinstance(r, dict):
-                        result = "success"
-                    elif r == "full":
-                        result = "max_minions"
-                    elif r in (False, "denied", "rejected"):
-                        result = "rejected"
-                    elif isinstance(r, str):
-                        result = r
-            except Exception:  # pylint: disable=broad-except
-                pass
             return ret
         finally:
-            salt.utils.metrics.counter(
-                "salt.auth.attempts",
-                description="Minion authentication attempts.",
-            ).add(1, attributes={"result": result})
+            self._record_auth_attempt(ret)
+
+    async def _auth_async(self, load, sign_messages=False, version=0):
+        """
+        Authenticate the client like :meth:`_auth`, running the RSA work for
+        an accepted minion in :attr:`crypto_pool` when one is configured.
+        """
+        ret = None
+        try:
+            ret = self._auth_check(load, sign_messages, version)
+            if isinstance(ret, salt.utils.crypto_pool.AuthJob):
+                ret = await self._auth_reply_async(load, ret, version)
+            return ret
+        finally:
+            self._record_auth_attempt(ret)
+
+    async def _auth_reply_async(self, load, job, version):
+        pool = self.crypto_pool
+        if pool is None:
+            return self._auth_reply(load, job, version)
+        if pool.full:
+            log.info(
+                "Authentication crypto pool is full, asking %s to try later",
+                load["id"],
+            )
+            return pool.try_later()
+        try:
+            reply, accepted = await pool.auth_reply(job)
+        except concurrent.futures.BrokenExecutor:
+            log.warning(
+                "Authentication crypto pool died, authenticating %s inline",
+                load["id"],
+            )
+            return self._auth_reply(load, job, version)
+        return self._auth_accepted(load, job, reply, accepted, version)
+
+    def _auth_reply(self, load, job, version):
+        reply, accepted = salt.utils.crypto_pool.auth_reply(
+            self.master_key, self.pub_keys, job
+        )
+        return self._auth_accepted(load, job, reply, accepted, version)
+
+    def _auth_accepted(self, load, job, reply, accepted, version):
+        """
+        Finish answering the accepted ``_auth`` request ``load`` once the
+        RSA work of ``job`` produced ``reply``.
+        """
+        if not accepted:
+            log.info(
+                "Minion %s tried to authenticate with unsupported encryption algorithm: %s",
+                load["id"],
+                job["enc_algo"],
+            )
+            return reply
+
+        if version < 3:
+            log.warning(
+                "Minion using legacy request server protocol, please upgrade %s",
+                load["id"],
+            )
+
+        if self.opts.get("auth_events") is True:
+            eload = {
+                "result": True,
+                "act": "accept",
+                "id": load["id"],
+                "pub": load["pub"],
+            }
+            autosign_grains = load.get("autosign_grains", None)
+            if (
+                "accept" in self.opts.get("auth_events_autosign_grains", [])
+                and autosign_grains
+            ):
+                eload["autosign_grains"] = autosign_grains
+            self.event.fire_event(eload, salt.utils.event.tagify(prefix="auth"))
+        return reply
 
     def _auth_impl(self, load, sign_messages=False, version=0):
         """
@@ -3202,6 +3646,20 @@ class AuthFuncs(TransportMethods):
             - Encrypt the AES key as an encrypted salt.payload
             - Package the return and return it
         """
+        ret = self._auth_check(load, sign_messages, version)
+        if isinstance(ret, salt.utils.crypto_pool.AuthJob):
+            ret = self._auth_reply(load, ret, version)
+        return ret
+
+    def _auth_check(self, load, sign_messages=False, version=0):
+        """
+        Run the checks of :meth:`_auth_impl` that decide whether the client
+        is accepted.
+
+        Returns the reply for a client that is not accepted, or the
+        :class:`~salt.utils.crypto_pool.AuthJob` holding the RSA work left
+        to answer an accepted one.
+        """
         enc_algo = load.get("enc_algo", salt.crypt.OAEP_SHA1)
         sig_algo = load.get("sig_algo", salt.crypt.PKCS1v15_SHA1)
 
@@ -3593,8 +4051,6 @@ class AuthFuncs(TransportMethods):
                 salt.utils.event.tagify(prefix="key"),
             )
 
-        pub = None
-
         # the con_cache is enabled, send the minion id to the cache
         if self.cache_cli:
             self.cache_cli.put_cache([load["id"]])
@@ -3602,7 +4058,7 @@ class AuthFuncs(TransportMethods):
         # The key payload may sometimes be corrupt when using auto-accept
         # and an empty request comes in
         try:
-            pub = salt.crypt.PublicKey.from_str(key["pub"])
+            self.pub_keys.from_str(key["pub"])
         except Exception as err:  # pylint: disable=broad-except
             log.error(
                 'Corrupt or missing public key "%s": %s',
@@ -3617,100 +4073,27 @@ class AuthFuncs(TransportMethods):
             else:
                 return {"enc": "clear", "load": {"ret": False}}
 
-        ret = {
-            "enc": "pub",
-            "pub_key": self.master_key.get_pub_str(),
-            "publish_port": self.opts["publish_port"],
-        }
-
-        # sign the master's pubkey (if enabled) before it is
-        # sent to the minion that was just authenticated
-        if self.opts["master_sign_pubkey"]:
-            # append the pre-computed signature to the auth-reply
-            if self.master_key.pubkey_signature:
-                log.debug("Adding pubkey signature to auth-reply")
-                log.debug(self.master_key.pubkey_signature)
-                ret.update({"pub_sig": self.master_key.pubkey_signature})
-            else:
-                # the master has its own signing-keypair, compute the master.pub's
-                # signature and append that to the auth-reply
-                log.debug("Signing master public key before sending")
-                pub_sign = self.master_key.sign_key.sign(
-                    ret["pub_key"], algorithm=sig_algo
-                )
-                ret.update({"pub_sig": binascii.b2a_base64(pub_sign)})
-
-        if self.opts["auth_mode"] >= 2:
-            if "token" in load:
-                try:
-                    mtoken = self.master_key.decrypt(load["token"], enc_algo)
-                    aes = "{}_|-{}".format(
-                        SMaster.secrets["aes"]["secret"].value, mtoken
-                    )
-                except UnsupportedAlgorithm as exc:
-                    log.info(
-                        "Minion %s tried to authenticate with unsupported encryption algorithm: %s",
-                        load["id"],
-                        enc_algo,
-                    )
-                    return {"enc": "clear", "load": {"ret": "bad enc algo"}}
-                except Exception as exc:  # pylint: disable=broad-except
-                    log.warning("Token failed to decrypt %s", exc)
-                    # Token failed to decrypt, send back the salty bacon to
-                    # support older minions
-            else:
-                aes = self.aes_key
-
-            ret["aes"] = pub.encrypt(aes, enc_algo)
-            ret["session"] = pub.encrypt(self.session_key(load["id"]), enc_algo)
-        else:
-            if "token" in load:
-                try:
-                    mtoken = self.master_key.decrypt(load["token"], enc_algo)
-                    ret["token"] = pub.encrypt(mtoken, enc_algo)
-                except UnsupportedAlgorithm as exc:
-                    log.info(
-                        "Minion %s tried to authenticate with unsupported encryption algorithm: %s",
-                        load["id"],
-                        enc_algo,
-                    )
-                    return {"enc": "clear", "load": {"ret": "bad enc algo"}}
-                except Exception as exc:  # pylint: disable=broad-except
-                    # Token failed to decrypt, send back the salty bacon to
-                    # support older minions
-                    log.warning("Token failed to decrypt: %r", exc)
-
-            aes = self.aes_key
-            ret["aes"] = pub.encrypt(aes, enc_algo)
-            ret["session"] = pub.encrypt(self.session_key(load["id"]), enc_algo)
-
-        if version < 3:
-            log.warning(
-                "Minion using legacy request server protocol, please upgrade %s",
-                load["id"],
-            )
-
-        # Be aggressive about the signature
-        digest = salt.utils.stringutils.to_bytes(hashlib.sha256(aes).hexdigest())
-        ret["sig"] = self.master_key.encrypt(digest)
-        if self.opts.get("auth_events") is True:
-            eload = {
-                "result": True,
-                "act": "accept",
-                "id": load["id"],
-                "pub": load["pub"],
-            }
-            autosign_grains = load.get("autosign_grains", None)
-            if (
-                "accept" in self.opts.get("auth_events_autosign_grains", [])
-                and autosign_grains
-            ):
-                eload["autosign_grains"] = autosign_grains
-            self.event.fire_event(eload, salt.utils.event.tagify(prefix="auth"))
-        if sign_messages:
-            ret["nonce"] = load["nonce"]
-            return self._clear_signed(ret, sig_algo)
-        return ret
+        token = load.get("token")
+        return salt.utils.crypto_pool.AuthJob(
+            id=load["id"],
+            pub=key["pub"],
+            enc_algo=enc_algo,
+            sig_algo=sig_algo,
+            token=token,
+            auth_mode=self.opts["auth_mode"],
+            aes=self.aes_key,
+            master_aes=(
+                SMaster.secrets["aes"]["secret"].value
+                if token is not None and self.opts["auth_mode"] >= 2
+                else None
+            ),
+            session=self.session_key(load["id"]),
+            publish_port=self.opts["publish_port"],
+            master_sign_pubkey=self.opts["master_sign_pubkey"],
+            sign_messages=sign_messages,
+            nonce=load.get("nonce"),
+            compression=salt.utils.compression.supported(self.opts),
+        )
 
 
 class ClearFuncs(TransportMethods):
@@ -4188,10 +4571,7 @@ class ClearFuncs(TransportMethods):
             for transport, opts in iter_transport_opts(self.opts):
                 chan = salt.channel.server.PubServerChannel.factory(opts)
                 self.channels.append(chan)
-        tasks = set()
-        for chan in self.channels:
-            tasks.add(asyncio.create_task(chan.publish(load)))
-        await asyncio.gather(*tasks)
+        await salt.channel.server.publish_once(self.channels, load)
 
     @property
     def ssh_client(self):
@@ -2885,6 +2885,14 @@ def event(
         opts=__opts__,
         listen=True,
     ) as sevent:
+        # tagmatch is matched both as a glob and as a regex
+        prefix = min(
+            salt.utils.event.tag_match_prefix(tagmatch, "fnmatch"),
+            salt.utils.event.tag_match_prefix(tagmatch, "regex"),
+            key=len,
+        )
+        if prefix:
+            sevent.set_tag_filter([prefix], "startswith")
         while True:
             ret = sevent.get_event(full=True, auto_reconnect=True)
             if ret is None:
@@ -217,6 +217,46 @@ def returner(load):
     if os.path.exists(os.path.join(jid_dir, "nocache")):
         return
 
+    return _write_return(jid_dir, load)
+
+
+def returner_batch(loads):
+    """
+    Return a batch of minion returns to the local job cache
+
+    Equivalent to calling :func:`returner` for every load, but the jid
+    directory and its ``nocache`` marker are only looked up once per jid.
+    """
+    jid_dirs = {}
+    for load in loads:
+        if load["jid"] == "req":
+            returner(load)
+            continue
+        if load["jid"] not in jid_dirs:
+            jid_dir = salt.utils.jid.jid_dir(
+                load["jid"], _job_dir(), __opts__["hash_type"]
+            )
+            if os.path.exists(os.path.join(jid_dir, "nocache")):
+                jid_dir = None
+            jid_dirs[load["jid"]] = jid_dir
+        jid_dir = jid_dirs[load["jid"]]
+        if jid_dir is None:
+            continue
+        try:
+            _write_return(jid_dir, load)
+        except OSError as exc:
+            log.error(
+                "Could not store return from %s for job %s: %s",
+                load["id"],
+                load["jid"],
+                exc,
+            )
+
+
+def _write_return(jid_dir, load):
+    """
+    Write a single minion return below its jid directory
+    """
     hn_dir = os.path.join(jid_dir, load["id"])
 
     try:
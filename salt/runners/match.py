@@ -72,3 +72,44 @@ def compound_matches(expr, minion_id):
     except Exception:  # pylint: disable=broad-except
         pass
     return {"res": False}
+
+
+def explain_compound(expr, analyze=False, greedy=True):
+    """
+    Show the plan a compound match expression is evaluated with.
+
+    .. versionadded:: 3008.0
+
+    The expression is compiled into ``and``, ``or`` and ``not`` nodes over
+    its terms, each with an estimated relative ``cost`` and ``selectivity``
+    (the share of the minions it is expected to match). The terms of an
+    ``and`` are listed in the order they are evaluated in, and terms which
+    ``narrows`` only look at the minions matched by the previous ones.
+
+    .. note::
+
+        Compound expressions are only evaluated from the plan when
+        :conf_master:`minion_data_cache` is enabled.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run match.explain_compound 'G@os:Ubuntu and L@web1,web2'
+        salt-run match.explain_compound 'G@os:Deb* and not db*' analyze=True
+
+    expr
+        The :term:`Compound Matcher` expression to explain.
+
+    analyze
+        Also evaluate the expression, returning the matched ``minions`` and
+        reporting for every node the number of ``candidates`` it was given
+        (``None`` for every minion), the number of minions it ``matched`` and
+        the ``seconds`` it took. Nodes which did not need to be evaluated are
+        reported ``skipped``.
+
+    greedy
+        Consider minions without cached data, as when publishing.
+    """
+    ckminions = salt.utils.minions.CkMinions(__opts__)
+    return ckminions.explain_compound(expr, greedy=greedy, analyze=analyze)
@@ -372,6 +372,14 @@ class DaemonizedRequestServer(RequestServer):
         """
         raise NotImplementedError
 
+    async def drain(self):
+        """
+        Stop accepting requests, finish the ones being handled and close the
+        server.  Transports that cannot hand pending requests back simply
+        close.
+        """
+        self.close()
+
     async def forward_message(self, payload):
         """
         Forward a message into this transport's worker queue.
@@ -516,6 +524,15 @@ class PublishClient(Transport):
         """
         raise NotImplementedError
 
+    async def set_tag_filter(self, prefixes):
+        """
+        Ask the publish server to only send the events whose tag starts with
+        one of ``prefixes``, or every message when ``prefixes`` is ``None``.
+
+        Only a hint: publishers unable to filter keep sending everything and
+        callers still have to match the tags they receive.
+        """
+
     def close(self):
         """
         Close the underlying network connection
@@ -6,6 +6,9 @@ import struct
 
 import salt.utils.msgpack
 
+# Size of the buffer a stream reader reuses for every read
+READ_BUFFER_SIZE = 65536
+
 
 def frame_msg(body, header=None, raw_body=False):  # pylint: disable=unused-argument
     """
@@ -108,3 +111,98 @@ def decode_embedded_strs(src):
             return src
     else:
         return src
+
+
+def _decode_list_hook(src):
+    """
+    Convert embedded bytes to strings if possible, in place.
+    Unpacker list hook: nested containers were already converted.
+    """
+    for idx, elem in enumerate(src):
+        if isinstance(elem, bytes):
+            try:
+                src[idx] = elem.decode()
+            except UnicodeError:
+                pass
+    return src
+
+
+def _decode_pairs_hook(pairs):
+    """
+    Build a dict from ``pairs``, converting embedded bytes to strings if
+    possible.  Unpacker map hook: nested containers were already converted.
+    """
+    output = {}
+    for key, val in pairs:
+        if isinstance(val, bytes):
+            try:
+                val = val.decode()
+            except UnicodeError:
+                pass
+        if isinstance(key, bytes):
+            try:
+                key = key.decode()
+            except UnicodeError:
+                pass
+        output[key] = val
+    return output
+
+
+def decoding_unpacker(**kwargs):
+    """
+    Return a streaming ``Unpacker`` whose messages come out the way
+    :func:`decode_embedded_strs` would return them.
+
+    The strings are converted by the unpacker's hooks while each container
+    is built, so a message is materialized once instead of being unpacked
+    and then copied again by a second walk.
+    """
+    return salt.utils.msgpack.Unpacker(
+        object_pairs_hook=_decode_pairs_hook, list_hook=_decode_list_hook, **kwargs
+    )
+
+
+class FrameReader:
+    """
+    Read framed messages from a tornado ``IOStream`` through one reused
+    receive buffer.
+
+    Every read lands in the same :data:`READ_BUFFER_SIZE` ``bytearray`` and
+    is handed to a :func:`decoding_unpacker` as a ``memoryview``, so no
+    intermediate bytes object is allocated per read.
+
+    .. code-block:: python
+
+        reader = FrameReader()
+        nbytes = await reader.read(stream)
+        for framed_msg in reader.feed(nbytes):
+            ...
+    """
+
+    def __init__(self, size=READ_BUFFER_SIZE):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.unpacker = decoding_unpacker()
+
+    def read(self, stream):
+        """
+        Start reading what ``stream`` has available into the buffer.
+
+        Returns the stream's future for the number of bytes read, which
+        raises ``StreamClosedError`` like ``IOStream.read_into``.
+        """
+        return stream.read_into(self.buffer, partial=True)
+
+    def feed(self, nbytes):
+        """
+        Feed the first ``nbytes`` of the buffer to the unpacker and return
+        it, to iterate over the messages that are now complete.
+        """
+        self.unpacker.feed(self.view[:nbytes])
+        return self.unpacker
+
+    def reset(self):
+        """
+        Drop any partial message, for example after a reconnect.
+        """
+        self.unpacker = decoding_unpacker()
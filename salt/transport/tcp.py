@@ -38,6 +38,7 @@ import salt.utils.asynchronous
 import salt.utils.files
 import salt.utils.msgpack
 import salt.utils.platform
+import salt.utils.prefix_trie
 import salt.utils.process
 import salt.utils.versions
 from salt.exceptions import SaltClientError, SaltReqTimeoutError
@@ -51,6 +52,9 @@ else:
 
 log = logging.getLogger(__name__)
 
+# Separates the tag of an event from its data, see salt.utils.event.TAGEND
+_TAGEND = b"\n\n"
+
 
 class ClosingError(Exception):
     """ """
@@ -268,6 +272,7 @@ class PublishClient(salt.transport.base.PublishClient):
         "connect",
         "connect_uri",
         "recv",
+        "set_tag_filter",
     ]
     close_methods = [
         "close",
@@ -281,6 +286,8 @@ class PublishClient(salt.transport.base.PublishClient):
         self.connected = False
         self._closing = False
         self._stream = None
+        # Sent again to the server on every reconnect
+        self._tag_prefixes = None
         self._closed = False
         self.backoff = opts.get("tcp_reconnect_backoff", 1)
         self.resolver = kwargs.get("resolver")
@@ -428,6 +435,8 @@ class PublishClient(salt.transport.base.PublishClient):
             self._closed = False
             self._stream = await self.getstream(timeout=timeout)
             if self._stream:
+                if self._tag_prefixes is not None:
+                    await self._send_tag_filter()
                 if self.connect_callback:
                     await self.connect_callback(True)
             self.connected = True
@@ -461,6 +470,24 @@ class PublishClient(salt.transport.base.PublishClient):
     async def send(self, msg):
         await self._stream.write(msg)
 
+    async def set_tag_filter(self, prefixes):
+        """
+        Ask the server to only send the events whose tag starts with one of
+        ``prefixes``, or every message when ``prefixes`` is ``None``.
+        """
+        self._tag_prefixes = None if prefixes is None else list(prefixes)
+        if self._stream is not None:
+            await self._send_tag_filter()
+
+    async def _send_tag_filter(self):
+        try:
+            await self._stream.write(
+                salt.transport.frame.frame_msg({"tag_prefixes": self._tag_prefixes})
+            )
+        except tornado.iostream.StreamClosedError:
+            # Sent again once reconnected
+            log.trace("Stream closed, unable to send the tag filter")
+
     async def _read_into_unpacker(self):
         """
         Read one chunk of bytes from the stream and feed the unpacker.
@@ -824,13 +851,11 @@ class SaltMessageServer(tornado.tcpserver.TCPServer):
         """
         log.trace("Req client %s connected", address)
         self.clients.append((stream, address))
-        unpacker = salt.utils.msgpack.Unpacker()
+        reader = salt.transport.frame.FrameReader()
         try:
             while True:
-                wire_bytes = await stream.read_bytes(4096, partial=True)
-                unpacker.feed(wire_bytes)
-                for framed_msg in unpacker:
-                    framed_msg = salt.transport.frame.decode_embedded_strs(framed_msg)
+                nbytes = await reader.read(stream)
+                for framed_msg in reader.feed(nbytes):
                     header = framed_msg["head"]
                     try:
                         log.trace("Dispatching message handler for %s", address)
@@ -846,11 +871,11 @@ class SaltMessageServer(tornado.tcpserver.TCPServer):
                             self.asyncio_loop.create_task(result)
         except _StreamClosedError:
             log.trace("req client disconnected %s", address)
-            unpacker = salt.utils.msgpack.Unpacker()
+            reader.reset()
             self.remove_client((stream, address))
         except Exception as e:  # pylint: disable=broad-except
             log.trace("other master-side exception: %s", e, exc_info=True)
-            unpacker = salt.utils.msgpack.Unpacker()
+            reader.reset()
             self.remove_client((stream, address))
             stream.close()
 
@@ -1061,13 +1086,11 @@ class MessageClient:
 
     async def _stream_return(self):
         self._stream_return_running = True
-        unpacker = salt.utils.msgpack.Unpacker()
+        reader = salt.transport.frame.FrameReader()
         while not self._closed and not self._closing:
             try:
-                wire_bytes = await self._stream.read_bytes(4096, partial=True)
-                unpacker.feed(wire_bytes)
-                for framed_msg in unpacker:
-                    framed_msg = salt.transport.frame.decode_embedded_strs(framed_msg)
+                nbytes = await reader.read(self._stream)
+                for framed_msg in reader.feed(nbytes):
                     header = framed_msg["head"]
                     body = framed_msg["body"]
                     message_id = header.get("mid")
@@ -1101,7 +1124,7 @@ class MessageClient:
                 self._stream = None
                 if stream:
                     stream.close()
-                unpacker = salt.utils.msgpack.Unpacker()
+                reader.reset()
                 await self.connect()
             except TypeError:
                 # This is an invalid transport
@@ -1125,7 +1148,7 @@ class MessageClient:
                 self._stream = None
                 if stream:
                     stream.close()
-                unpacker = salt.utils.msgpack.Unpacker()
+                reader.reset()
                 await self.connect()
         self._stream_return_running = False
 
@@ -1197,6 +1220,22 @@ class MessageClient:
         return await future
 
 
+def _event_tag(package):
+    """
+    Return the tag of the event ``package``, as packed by
+    :meth:`salt.utils.event.SaltEvent.pack`, or ``None`` when it is not one.
+    """
+    if not isinstance(package, (bytes, bytearray)):
+        return None
+    tag, sep, _ = package.partition(_TAGEND)
+    if not sep:
+        return None
+    try:
+        return tag.decode()
+    except UnicodeDecodeError:
+        return None
+
+
 class Subscriber:
     """
     Client object for use with the TCP publisher server
@@ -1208,6 +1247,11 @@ class Subscriber:
         self._closing = False
         self._read_until_future = None
         self.id_ = None
+        # The id this subscriber is indexed under by PubServer.subscribers
+        self.indexed_id = None
+        # The event tag prefixes this subscriber asked for, None for every
+        # message
+        self.tag_prefixes = None
 
     def close(self):
         if self._closing:
@@ -1258,6 +1302,13 @@ class PubServer(tornado.tcpserver.TCPServer):
         self.ssl = ssl  # Store SSL context for later use
         self._closing = False
         self.clients = set()
+        # Identified subscribers by minion id, so a publish to a list of
+        # targets only touches their connections
+        self.subscribers = {}
+        # Subscribers which only want the events whose tag starts with one
+        # of their prefixes, see _set_tag_prefixes()
+        self.tag_filtered = set()
+        self._tag_trie = salt.utils.prefix_trie.PrefixTrie()
         self.presence_events = False
         if presence_callback:
             self.presence_callback = presence_callback
@@ -1276,6 +1327,9 @@ class PubServer(tornado.tcpserver.TCPServer):
         for client in list(self.clients):
             client.close()
         self.clients.clear()
+        self.subscribers.clear()
+        self.tag_filtered.clear()
+        self._tag_trie = salt.utils.prefix_trie.PrefixTrie()
 
     # pylint: disable=W1701
     def __del__(self):
@@ -1286,22 +1340,22 @@ class PubServer(tornado.tcpserver.TCPServer):
     async def _stream_read(
         self, client, _StreamClosedError=tornado.iostream.StreamClosedError
     ):
-        unpacker = salt.utils.msgpack.Unpacker()
+        reader = salt.transport.frame.FrameReader()
         while not self._closing:
             try:
-                client._read_until_future = client.stream.read_bytes(4096, partial=True)
-                wire_bytes = await client._read_until_future
-                unpacker.feed(wire_bytes)
-                for framed_msg in unpacker:
-                    framed_msg = salt.transport.frame.decode_embedded_strs(framed_msg)
+                client._read_until_future = reader.read(client.stream)
+                nbytes = await client._read_until_future
+                for framed_msg in reader.feed(nbytes):
                     body = framed_msg["body"]
+                    if isinstance(body, dict) and "tag_prefixes" in body:
+                        self._set_tag_prefixes(client, body["tag_prefixes"])
+                        continue
                     if self.presence_callback:
                         self.presence_callback(client, body)
+                        self._index_client(client)
             except _StreamClosedError as e:
                 log.debug("tcp stream to %s closed, unable to recv", client.address)
-                client.close()
-                self.remove_presence_callback(client)
-                self.clients.discard(client)
+                self._remove_client(client)
                 break
             except Exception as e:  # pylint: disable=broad-except
                 log.error(
@@ -1381,6 +1435,71 @@ class PubServer(tornado.tcpserver.TCPServer):
         # Handshake didn't complete after retries - reject
         stream.close()
 
+    def _index_client(self, client):
+        """
+        Index ``client`` under the minion id it identified as.
+        """
+        if client.id_ == client.indexed_id:
+            return
+        self._unindex_client(client)
+        if client.id_ is not None:
+            self.subscribers.setdefault(client.id_, set()).add(client)
+            client.indexed_id = client.id_
+
+    def _unindex_client(self, client):
+        subscribers = self.subscribers.get(client.indexed_id)
+        if subscribers is not None:
+            subscribers.discard(client)
+            if not subscribers:
+                del self.subscribers[client.indexed_id]
+        client.indexed_id = None
+
+    def _remove_client(self, client):
+        client.close()
+        self.remove_presence_callback(client)
+        self.clients.discard(client)
+        self._unindex_client(client)
+        self._set_tag_prefixes(client, None)
+
+    def _set_tag_prefixes(self, client, prefixes):
+        """
+        Only send ``client`` the events whose tag starts with one of
+        ``prefixes``, or every message when ``prefixes`` is ``None``.
+
+        Sent by event bus subscribers, see
+        :meth:`PublishClient.set_tag_filter`.
+        """
+        for prefix in client.tag_prefixes or ():
+            self._tag_trie.discard(prefix, client)
+        self.tag_filtered.discard(client)
+        client.tag_prefixes = None
+        if prefixes is None or client not in self.clients:
+            return
+        if not isinstance(prefixes, list) or not all(
+            isinstance(prefix, str) for prefix in prefixes
+        ):
+            log.warning(
+                "Ignoring invalid tag prefixes from %s: %r", client.address, prefixes
+            )
+            return
+        if "" in prefixes:
+            return
+        client.tag_prefixes = prefixes
+        for prefix in prefixes:
+            self._tag_trie.add(prefix, client)
+        self.tag_filtered.add(client)
+
+    def _broadcast_clients(self, package):
+        """
+        Return the clients to send ``package`` to when it has no topics.
+        """
+        if not self.tag_filtered:
+            return self.clients
+        tag = _event_tag(package)
+        if tag is None:
+            return self.clients
+        return (self.clients - self.tag_filtered) | self._tag_trie.match(tag)
+
     # TODO: ACK the publish through IPC
     async def publish_payload(self, package, topic_list=None):
         log.trace(
@@ -1397,18 +1516,17 @@ class PubServer(tornado.tcpserver.TCPServer):
         write_futures = []
         if topic_list:
             for topic in topic_list:
-                sent = False
-                for client in list(self.clients):
-                    if topic == client.id_:
-                        try:
-                            write_futures.append((client, client.stream.write(payload)))
-                            sent = True
-                        except tornado.iostream.StreamClosedError:
-                            to_remove.append(client)
-                if not sent:
-                    log.debug("Publish target %s not connected %r", topic, self.clients)
+                clients = self.subscribers.get(topic)
+                if not clients:
+                    log.debug("Publish target %s not connected", topic)
+                    continue
+                for client in list(clients):
+                    try:
+                        write_futures.append((client, client.stream.write(payload)))
+                    except tornado.iostream.StreamClosedError:
+                        to_remove.append(client)
         else:
-            for client in list(self.clients):
+            for client in list(self._broadcast_clients(package)):
                 try:
                     write_futures.append((client, client.stream.write(payload)))
                 except tornado.iostream.StreamClosedError:
@@ -1422,9 +1540,7 @@ class PubServer(tornado.tcpserver.TCPServer):
             log.debug(
                 "Subscriber at %s has disconnected from publisher", client.address
             )
-            client.close()
-            self.remove_presence_callback(client)
-            self.clients.discard(client)
+            self._remove_client(client)
         log.trace("TCP PubServer finished publishing payload")
 
 
@@ -2104,13 +2220,11 @@ class RequestClient(salt.transport.base.RequestClient):
 
     async def _stream_return(self):
         self._stream_return_running = True
-        unpacker = salt.utils.msgpack.Unpacker()
+        reader = salt.transport.frame.FrameReader()
         while not self._closing:
             try:
-                wire_bytes = await self._stream.read_bytes(4096, partial=True)
-                unpacker.feed(wire_bytes)
-                for framed_msg in unpacker:
-                    framed_msg = salt.transport.frame.decode_embedded_strs(framed_msg)
+                nbytes = await reader.read(self._stream)
+                for framed_msg in reader.feed(nbytes):
                     header = framed_msg["head"]
                     body = framed_msg["body"]
                     message_id = header.get("mid")
@@ -2143,7 +2257,7 @@ class RequestClient(salt.transport.base.RequestClient):
                 self._stream = None
                 if stream:
                     stream.close()
-                unpacker = salt.utils.msgpack.Unpacker()
+                reader.reset()
                 await self.connect()
             except TypeError:
                 # This is an invalid transport
@@ -2167,7 +2281,7 @@ class RequestClient(salt.transport.base.RequestClient):
                 self._stream = None
                 if stream:
                     stream.close()
-                unpacker = salt.utils.msgpack.Unpacker()
+                reader.reset()
                 await self.connect()
             except asyncio.CancelledError:
                 log.debug("Stream return cancelled")
@@ -175,8 +175,8 @@ class PublishClient(salt.transport.base.PublishClient):
     async def _connect(self, timeout=None):
         if self._ws is None:
             self._ws, self._session = await self.getstream(timeout=timeout)
-            if self.connect_callback:
-                self.connect_callback(True)  # pylint: disable=not-callable
+            if self._ws is not None and self.connect_callback:
+                await self.connect_callback(True)  # pylint: disable=not-callable
             self.connected = True
 
     async def connect(
@@ -189,13 +189,13 @@ class PublishClient(salt.transport.base.PublishClient):
         if port is not None:
             self.port = port
         if connect_callback:
-            self.connect_callback = None
+            self.connect_callback = connect_callback
         if disconnect_callback:
-            self.disconnect_callback = None
+            self.disconnect_callback = disconnect_callback
         await self._connect(timeout=timeout)
 
     async def send(self, msg):
-        await self.message_client.send(msg, reply=False)
+        await self._ws.send_bytes(msg)
 
     async def recv(self, timeout=None):
         while self._ws is None:
@@ -258,6 +258,19 @@ class PublishClient(salt.transport.base.PublishClient):
         self.close()
 
 
+class Subscriber:
+    """
+    A websocket connected to the publish server
+    """
+
+    def __init__(self, ws, address):
+        self.ws = ws
+        self.address = address
+        self.id_ = None
+        # The id this subscriber is indexed under by PublishServer.subscribers
+        self.indexed_id = None
+
+
 class PublishServer(salt.transport.base.DaemonizedPublishServer):
     """ """
 
@@ -298,6 +311,13 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         self.pub_path_perms = pub_path_perms
         self.ssl = ssl
         self.clients = set()
+        # Identified subscribers by minion id, so a publish to a list of
+        # targets only touches their connections
+        self.subscribers = {}
+        # Subscribers that never identified, minions older than 3008.0 do not
+        self.anonymous = set()
+        self.presence_callback = None
+        self.remove_presence_callback = None
         self._run = None
         if _shutdown is None:
             self._shutdown = multiprocessing.Event()  # Cross-process shutdown signal
@@ -364,7 +384,12 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
         io_loop.add_signal_handler(signal.SIGTERM, io_loop.stop)
 
         publisher_task = io_loop.create_task(
-            self.publisher(publish_payload, io_loop=io_loop)
+            self.publisher(
+                publish_payload,
+                presence_callback,
+                remove_presence_callback,
+                io_loop=io_loop,
+            )
         )
         try:
             io_loop.run_forever()
@@ -382,6 +407,8 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
             io_loop = tornado.ioloop.IOLoop.current()
         if self._run is None:
             self._run = asyncio.Event()
+        self.presence_callback = presence_callback
+        self.remove_presence_callback = remove_presence_callback
 
         # Monitor the multiprocessing shutdown event and stop the loop
         async def monitor_shutdown():
@@ -473,17 +500,65 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
                 log.debug("Request client cert %r", name)
         ws = aiohttp.web.WebSocketResponse()
         await ws.prepare(request)
-        self.clients.add(ws)
+        client = Subscriber(ws, request.remote)
+        self.clients.add(client)
+        self.anonymous.add(client)
         try:
             # Keep connection alive until client disconnects
             async for msg in ws:
-                if msg.type == aiohttp.WSMsgType.ERROR:
+                if msg.type == aiohttp.WSMsgType.BINARY:
+                    self._handle_presence(client, msg.data)
+                elif msg.type == aiohttp.WSMsgType.ERROR:
                     log.error("ws connection closed with exception %s", ws.exception())
                     break
         finally:
-            self.clients.discard(ws)
+            self._remove_client(client)
         return ws
 
+    def _handle_presence(self, client, data):
+        """
+        Handle the framed message a subscriber sends to identify itself.
+        """
+        if self.presence_callback is None:
+            return
+        try:
+            self.presence_callback(client, salt.payload.loads(data)["body"])
+        except Exception:  # pylint: disable=broad-except
+            log.error(
+                "Exception parsing response from %s", client.address, exc_info=True
+            )
+            return
+        self._index_client(client)
+
+    def _index_client(self, client):
+        """
+        Index ``client`` under the minion id it identified as.
+        """
+        if client.id_ == client.indexed_id:
+            return
+        self._unindex_client(client)
+        if client.id_ is not None:
+            self.subscribers.setdefault(client.id_, set()).add(client)
+            client.indexed_id = client.id_
+            self.anonymous.discard(client)
+
+    def _unindex_client(self, client):
+        subscribers = self.subscribers.get(client.indexed_id)
+        if subscribers is not None:
+            subscribers.discard(client)
+            if not subscribers:
+                del self.subscribers[client.indexed_id]
+        client.indexed_id = None
+
+    def _remove_client(self, client):
+        if client not in self.clients:
+            return
+        self.clients.discard(client)
+        self.anonymous.discard(client)
+        self._unindex_client(client)
+        if self.remove_presence_callback is not None:
+            self.remove_presence_callback(client)
+
     async def _connect(self):
         if self.pull_path:
             self.pub_reader, self.pub_writer = await asyncio.open_unix_connection(
@@ -514,11 +589,18 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
 
     async def publish_payload(self, payload, topic_list=None):
         payload = salt.payload.dumps(payload, use_bin_type=True)
-        for ws in list(self.clients):
+        if topic_list:
+            # Subscribers that never identified filter publishes themselves
+            clients = set(self.anonymous)
+            for topic in topic_list:
+                clients.update(self.subscribers.get(topic, ()))
+        else:
+            clients = list(self.clients)
+        for client in clients:
             try:
-                await ws.send_bytes(payload)
+                await client.ws.send_bytes(payload)
             except ConnectionResetError:
-                self.clients.discard(ws)
+                self._remove_client(client)
 
     def close(self):
         if self.pub_writer:
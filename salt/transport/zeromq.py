@@ -16,6 +16,7 @@ import socket
 import stat
 import sys
 import threading
+import time
 import zlib
 from random import randint
 
@@ -65,6 +66,12 @@ _REQ_QUEUE_SHUTDOWN = object()
 # leaking one per reconnect.
 _REQ_IDENTITY_SLOT = itertools.count()
 
+# Milliseconds a draining worker keeps answering requests that were already
+# routed to its socket with a "try later" reply, after it stopped handling
+# new ones, and the longest it waits for another such request.
+_DRAIN_HANDBACK_TIMEOUT = 1000
+_DRAIN_HANDBACK_POLL = 50
+
 
 def _get_master_uri(master_ip, master_port, source_ip=None, source_port=None):
     """
@@ -480,6 +487,7 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
         self.secrets = secrets or opts.get("secrets")
 
         self._closing = False
+        self._draining = False
         self._monitor = None
         self._w_monitor = None
         self.tasks = set()
@@ -575,7 +583,7 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
         import salt.master
 
         router = salt.master.RequestRouter(
-            self.opts, secrets=secrets or getattr(self, "secrets", None)
+            self.opts, secrets=secrets or getattr(self, "secrets", None), lanes=False
         )
 
         while True:
@@ -683,12 +691,22 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
         for pool_dealer in self.pool_workers.values():
             poller.register(pool_dealer, zmq.POLLIN)
 
+        # With request lanes configured, wake up every second to expire
+        # lane slots held by requests that were never answered.
+        poll_timeout = 1000 if router.lanes else None
+
+        def _forward(requests):
+            for queued_pool, queued_msg in requests:
+                self.pool_workers[queued_pool].send_multipart(queued_msg)
+
         while True:
             if self.clients.closed:
                 break
 
             try:
-                socks = dict(poller.poll())
+                socks = dict(poller.poll(poll_timeout))
+                if router.lanes:
+                    _forward(router.expire())
 
                 # Handle incoming responses from worker pools
                 # DEALER preserves the envelope, so we get: [client_id, b"", response]
@@ -699,6 +717,8 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
                         if len(msg) >= 3:
                             # Forward entire envelope back to ROUTER -> client
                             self.clients.send_multipart(msg)
+                            # Its lane slot is free for the next queued request
+                            _forward(router.complete(msg[0]))
 
                 # Handle incoming request from client (minion)
                 if self.clients in socks:
@@ -712,7 +732,7 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
                     # Decode payload to determine which pool should handle this
                     try:
                         payload = salt.payload.loads(payload_raw)
-                        pool_name = router.route_request(payload)
+                        cmd, pool_name = router.classify(payload)
 
                         if pool_name not in self.pool_workers:
                             log.error(
@@ -721,10 +741,23 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
                             )
                             pool_name = next(iter(self.pool_workers.keys()))
 
-                        # Forward entire envelope to appropriate pool's DEALER
-                        # DEALER will preserve the envelope when forwarding to REQ workers
-                        pool_dealer = self.pool_workers[pool_name]
-                        pool_dealer.send_multipart(msg)
+                        admitted = router.admit(cmd, msg[0], (pool_name, msg))
+                        _forward(router.pop_released())
+                        if admitted is None:
+                            # The request's lane is full, tell the client to
+                            # back off instead of letting it time out.
+                            self.clients.send_multipart(
+                                [
+                                    msg[0],
+                                    b"",
+                                    salt.payload.dumps(router.try_later(cmd)),
+                                ]
+                            )
+                        elif admitted:
+                            # Forward entire envelope to appropriate pool's DEALER
+                            # DEALER will preserve the envelope when forwarding to REQ workers
+                            pool_dealer = self.pool_workers[pool_name]
+                            pool_dealer.send_multipart(msg)
 
                     except Exception as exc:  # pylint: disable=broad-except
                         log.error("Error routing request: %s", exc, exc_info=True)
@@ -897,7 +930,7 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
     async def request_handler(self):
         log.trace("RequestServer.request_handler started")
         try:
-            while not self._event.is_set():
+            while not self._event.is_set() and not self._draining:
                 try:
                     # Use poll + recv instead of asyncio.wait_for(recv(), timeout).
                     # Python 3.12 rewrote wait_for to use asyncio.timeout() which
@@ -924,9 +957,42 @@ class RequestServer(salt.transport.base.DaemonizedRequestServer):
                     )
                     await asyncio.sleep(0)
                     continue
+            if self._draining:
+                await self._hand_back_requests()
         finally:
             log.trace("RequestServer.request_handler exiting")
 
+    async def _hand_back_requests(self):
+        """
+        Answer the requests the device already routed to this draining
+        worker with a "try later" reply, so their clients resend them at
+        once and they reach another worker instead of being dropped.
+        """
+        reply = self.encode_payload(
+            {"enc": "clear", "load": {"ret": "try_later", "retry_after": 0}}
+        )
+        deadline = time.monotonic() + _DRAIN_HANDBACK_TIMEOUT / 1000
+        while time.monotonic() < deadline:
+            if not await self._socket.poll(timeout=_DRAIN_HANDBACK_POLL):
+                break
+            await self._socket.recv()
+            await self._socket.send(reply)
+
+    async def drain(self):
+        """
+        Stop taking requests, finish the one being handled, hand back the
+        ones already queued for this worker and close.
+        """
+        if getattr(self, "_socket", None) is None or self._closing:
+            self.close()
+            return
+        log.info("Draining RequestServer %s", self.w_uri)
+        self._draining = True
+        await asyncio.gather(*list(self.tasks), return_exceptions=True)
+        # Give the last replies time to reach the device
+        self._socket.setsockopt(zmq.LINGER, 1000)
+        self.close()
+
     async def handle_message(self, stream, payload):
         try:
             payload = self.decode_payload(payload)
@@ -0,0 +1,382 @@
+"""
+Set algebra plans for compound target expressions.
+
+.. versionadded:: 3008.0
+
+:meth:`CkMinions._check_compound_minions
+<salt.utils.minions.CkMinions._check_compound_minions>` compiles a compound
+expression into a tree of :class:`And`, :class:`Or` and :class:`Not` nodes
+over :class:`Term` leaves, one per target engine word (``G@os:Ubuntu``,
+``L@web1,web2``, ``web*``...), before evaluating it.
+
+Every node carries a rough estimate of its cost and of its selectivity, the
+share of the minions it is expected to keep.  The terms of an ``and`` are
+evaluated starting with the one expected to drop the most minions for the
+least work, and the minions matched so far are the candidates of the
+following terms: grain and pillar terms only look at the cached data of the
+candidates, so ``G@os:Ubuntu and L@web1,web2`` fetches the grains of two
+minions instead of all of them.  An ``and`` stops as soon as no candidate
+is left.
+
+:func:`salt.runners.match.explain_compound` shows the plan chosen for an
+expression.
+"""
+
+import time
+
+from salt.exceptions import SaltInvocationError
+
+OPERATORS = ("and", "or", "not", "(", ")")
+
+# Target engines whose matcher only looks at the candidates it is given.
+# Other matchers are evaluated in full and their result intersected with the
+# candidates, which gives the same result.
+NARROWING_ENGINES = ("G", "P", "I", "J")
+
+# Target engine -> (cost, selectivity) estimates.  Costs are relative: 1 is a
+# lookup in the accepted keys, 50 is fetching and walking the cached data of
+# every minion.  Glob patterns without wildcards, ``None`` here, are
+# estimated like lists.
+ENGINE_ESTIMATES = {
+    None: (2, 0.5),
+    "L": (1, 0.01),
+    "M": (2, 0.5),
+    "E": (3, 0.5),
+    "T": (2, 0.1),
+    "G": (50, 0.5),
+    "P": (50, 0.5),
+    "I": (50, 0.5),
+    "J": (50, 0.5),
+    "S": (40, 0.2),
+    "R": (100, 0.5),
+}
+
+# Estimates of grain and pillar terms answered from the minion data index,
+# for a literal and for a glob value
+INDEXED_ESTIMATES = ((5, 0.1), (5, 0.5))
+
+
+def _has_wildcard(pattern):
+    return any(char in pattern for char in "*?[")
+
+
+def _rank(node):
+    """
+    Evaluation order of the terms of an ``and``: the cost paid per minion
+    dropped.
+    """
+    if node.selectivity >= 1:
+        return float("inf")
+    return node.cost / (1 - node.selectivity)
+
+
+class Context:
+    """
+    State of the evaluation of a plan.
+
+    ``match`` is called with a :class:`Term` and the candidate minions, or
+    ``None`` when there are none, and returns the ``{"minions": ...,
+    "missing": ...}`` dict of the target engine.  ``all_minions`` returns
+    every minion, what ``not`` terms are taken from.
+    """
+
+    def __init__(self, match, all_minions, analyze=False):
+        self.match = match
+        self._all_minions = all_minions
+        self._universe = None
+        self.missing = []
+        # id() of each node evaluated -> statistics, when analyzing
+        self.stats = {} if analyze else None
+
+    def all_minions(self):
+        if self._universe is None:
+            self._universe = set(self._all_minions())
+        return self._universe
+
+
+class Node:
+    """
+    Base class of the nodes of a plan.
+    """
+
+    cost = 0
+    selectivity = 1
+
+    def run(self, ctx, candidates):
+        """
+        Return the set of minions matched by this node among ``candidates``,
+        or among every minion when ``candidates`` is ``None``.
+        """
+        if ctx.stats is None:
+            return self.evaluate(ctx, candidates)
+        start = time.perf_counter()
+        ret = self.evaluate(ctx, candidates)
+        ctx.stats[id(self)] = {
+            "candidates": None if candidates is None else len(candidates),
+            "matched": len(ret),
+            "seconds": round(time.perf_counter() - start, 6),
+        }
+        return ret
+
+    def evaluate(self, ctx, candidates):
+        raise NotImplementedError
+
+    def skip(self, ctx):
+        """
+        Called instead of :meth:`run` when the node does not need to be
+        evaluated.
+        """
+
+    def explain(self, stats=None):
+        """
+        Return the plan rooted at this node as a dict.
+        """
+        ret = {
+            "cost": round(self.cost, 3),
+            "selectivity": round(self.selectivity, 3),
+        }
+        if stats is not None:
+            ret.update(stats.get(id(self), {"skipped": True}))
+        return ret
+
+
+class Term(Node):
+    """
+    One target engine word of the expression.
+    """
+
+    def __init__(self, word, engine=None, pattern=None, delimiter=None):
+        self.word = word
+        self.engine = engine
+        self.pattern = word if pattern is None else pattern
+        self.delimiter = delimiter
+        # Set for list terms right after ``not``, see _check_list_minions()
+        self.ignore_missing = False
+        self.narrows = engine in NARROWING_ENGINES
+        self.cost, self.selectivity = ENGINE_ESTIMATES[engine]
+
+    def estimate(self, indexed=False):
+        """
+        Refine the estimates from the pattern, ``indexed`` tells whether grain,
+        pillar and ipcidr targets are answered from the minion data index.
+        """
+        if self.engine in (None, "M") and not _has_wildcard(self.pattern):
+            self.cost, self.selectivity = ENGINE_ESTIMATES["L"]
+        elif self.engine in ("G", "I") and indexed:
+            value = self.pattern.rsplit(self.delimiter or ":", 1)[-1]
+            self.cost, self.selectivity = INDEXED_ESTIMATES[_has_wildcard(value)]
+        elif self.engine == "S" and indexed:
+            # Subnets are looked up in the index of the addresses
+            self.cost = INDEXED_ESTIMATES[0][0]
+
+    def evaluate(self, ctx, candidates):
+        result = ctx.match(self, candidates if self.narrows else None)
+        ctx.missing.extend(result["missing"])
+        ret = set(result["minions"])
+        if candidates is not None:
+            ret &= candidates
+        return ret
+
+    def skip(self, ctx):
+        # List terms report the listed minions without a key wherever they are
+        if self.engine == "L":
+            ctx.missing.extend(ctx.match(self, None)["missing"])
+
+    def explain(self, stats=None):
+        ret = {"term": self.word, "narrows": self.narrows}
+        ret.update(super().explain(stats))
+        return ret
+
+
+class And(Node):
+    """
+    Intersection of the children, evaluated by increasing :func:`_rank`.
+    """
+
+    def __init__(self, children):
+        self.children = sorted(children, key=_rank)
+        self.cost = 0
+        self.selectivity = 1
+        for child in self.children:
+            self.cost += self.selectivity * child.cost
+            self.selectivity *= child.selectivity
+
+    def evaluate(self, ctx, candidates):
+        for idx, child in enumerate(self.children):
+            candidates = child.run(ctx, candidates)
+            if not candidates:
+                for skipped in self.children[idx + 1 :]:
+                    skipped.skip(ctx)
+                break
+        return candidates
+
+    def skip(self, ctx):
+        for child in self.children:
+            child.skip(ctx)
+
+    def explain(self, stats=None):
+        ret = {"and": [child.explain(stats) for child in self.children]}
+        ret.update(super().explain(stats))
+        return ret
+
+
+class Or(Node):
+    """
+    Union of the children, evaluated by increasing cost.  Minions matched by
+    a child are no longer candidates of the following ones.
+    """
+
+    def __init__(self, children):
+        self.children = sorted(children, key=lambda child: child.cost)
+        self.cost = sum(child.cost for child in self.children)
+        unmatched = 1
+        for child in self.children:
+            unmatched *= 1 - child.selectivity
+        self.selectivity = 1 - unmatched
+
+    def evaluate(self, ctx, candidates):
+        ret = set()
+        for idx, child in enumerate(self.children):
+            if candidates is None:
+                ret |= child.run(ctx, None)
+                continue
+            remaining = candidates - ret
+            if not remaining:
+                for skipped in self.children[idx:]:
+                    skipped.skip(ctx)
+                break
+            ret |= child.run(ctx, remaining)
+        return ret
+
+    def skip(self, ctx):
+        for child in self.children:
+            child.skip(ctx)
+
+    def explain(self, stats=None):
+        ret = {"or": [child.explain(stats) for child in self.children]}
+        ret.update(super().explain(stats))
+        return ret
+
+
+class Not(Node):
+    """
+    Every minion, or every candidate, not matched by the child.
+    """
+
+    def __init__(self, child):
+        self.child = child
+        self.cost = child.cost + ENGINE_ESTIMATES["L"][0]
+        self.selectivity = 1 - child.selectivity
+
+    def evaluate(self, ctx, candidates):
+        universe = ctx.all_minions()
+        if candidates is not None:
+            universe = universe & candidates
+        if not universe:
+            self.child.skip(ctx)
+            return set()
+        return universe - self.child.run(ctx, universe)
+
+    def skip(self, ctx):
+        self.child.skip(ctx)
+
+    def explain(self, stats=None):
+        ret = {"not": self.child.explain(stats)}
+        ret.update(super().explain(stats))
+        return ret
+
+
+class _Parser:
+    """
+    Recursive descent parser of compound tokens: ``not`` binds tighter than
+    ``and``, which binds tighter than ``or``.  A ``not`` right after a term
+    is an implicit ``and``, and parentheses left open at the end of the
+    expression are closed.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def unexpected(self):
+        token = self.peek()
+        if token is None:
+            return SaltInvocationError("Unexpected end of compound target")
+        if isinstance(token, Term):
+            token = token.word
+        return SaltInvocationError(f"Unexpected '{token}' in compound target")
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise self.unexpected()
+        return node
+
+    def parse_or(self):
+        children = []
+        while True:
+            node = self.parse_and()
+            children.extend(node.children if isinstance(node, Or) else [node])
+            if self.peek() != "or":
+                break
+            self.pos += 1
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self):
+        children = []
+        while True:
+            node = self.parse_not()
+            children.extend(node.children if isinstance(node, And) else [node])
+            if self.peek() == "and":
+                self.pos += 1
+            elif self.peek() != "not":
+                break
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self):
+        if self.peek() != "not":
+            return self.parse_operand()
+        self.pos += 1
+        bare = isinstance(self.peek(), Term)
+        child = self.parse_operand()
+        if bare:
+            child.ignore_missing = True
+        return Not(child)
+
+    def parse_operand(self):
+        token = self.peek()
+        if isinstance(token, Term):
+            self.pos += 1
+            return token
+        if token != "(":
+            raise self.unexpected()
+        self.pos += 1
+        node = self.parse_or()
+        if self.peek() == ")":
+            self.pos += 1
+        elif self.peek() is not None:
+            raise self.unexpected()
+        return node
+
+
+def compile_plan(tokens, indexed=False):
+    """
+    Compile ``tokens``, a list of :data:`OPERATORS` and :class:`Term`
+    objects, into a plan and return its root node.
+
+    ``indexed`` tells whether grain, pillar and ipcidr targets are answered
+    from the :mod:`minion data index <salt.utils.minion_data_index>`.
+
+    :raises SaltInvocationError: when the tokens are not a valid expression
+    """
+    for token in tokens:
+        if isinstance(token, Term):
+            token.estimate(indexed=indexed)
+        elif token not in OPERATORS:
+            raise SaltInvocationError(f"Invalid compound target token {token!r}")
+    return _Parser(tokens).parse()
@@ -0,0 +1,78 @@
+"""
+Compression of request payloads negotiated between masters and minions.
+
+.. versionadded:: 3008.0
+
+Every peer lists the algorithms it accepts, in order of preference, in
+:conf_master:`transport_compression`.  A minion advertises its list in each
+request it sends and the master advertises its list in its authentication
+reply, so each side only compresses for a peer that said it can decompress
+and older peers keep receiving plain payloads.
+
+A payload is compressed after it is serialized and before it is encrypted,
+and only when it is at least :conf_master:`transport_compression_threshold`
+bytes long and compressing it actually makes it smaller.  A compressed
+payload starts with the algorithm's marker, which a serialized payload can
+never start with, so the receiver needs no extra state to detect it.
+"""
+
+import lzma
+import zlib
+
+DEFAULT_THRESHOLD = 4096
+
+# Algorithm name -> (marker, compress, decompress)
+ALGORITHMS = {
+    "zlib": (b"zlib::", zlib.compress, zlib.decompress),
+    "lzma": (b"lzma::", lzma.compress, lzma.decompress),
+}
+
+
+def supported(opts):
+    """
+    Return the algorithms from ``transport_compression`` in ``opts`` that
+    this peer can use, in order of preference.
+    """
+    return [
+        name for name in opts.get("transport_compression") or [] if name in ALGORITHMS
+    ]
+
+
+def negotiate(opts, peer):
+    """
+    Return the first algorithm of ``opts`` that the ``peer`` advertised, or
+    ``None`` when they have none in common.
+    """
+    if not peer or not isinstance(peer, (list, tuple)):
+        return None
+    for name in supported(opts):
+        if name in peer:
+            return name
+    return None
+
+
+def compress(data, algorithm, threshold=DEFAULT_THRESHOLD):
+    """
+    Compress the serialized payload ``data`` with ``algorithm``.
+
+    Returns ``data`` unchanged when ``algorithm`` is ``None``, ``data`` is
+    shorter than ``threshold`` or does not get smaller.
+    """
+    if algorithm is None or len(data) < threshold:
+        return data
+    marker, _compress, _ = ALGORITHMS[algorithm]
+    compressed = marker + _compress(data)
+    if len(compressed) >= len(data):
+        return data
+    return compressed
+
+
+def decompress(data):
+    """
+    Return the serialized payload in ``data``, decompressing it if it was
+    compressed by :func:`compress`.
+    """
+    for marker, _, _decompress in ALGORITHMS.values():
+        if data.startswith(marker):
+            return _decompress(data[len(marker) :])
+    return data
@@ -0,0 +1,231 @@
+"""
+Run the RSA work of the minion ``_auth`` handshake in a process pool.
+
+.. versionadded:: 3008.0
+
+Answering an accepted minion's ``_auth`` request takes several RSA
+operations: decrypting the minion's token with the master's private key,
+encrypting the AES and session keys for the minion, and signing the reply.
+When thousands of minions reconnect at once these dominate the request
+server and block every other request handled by the same worker.
+
+With :conf_master:`auth_crypto_workers` set, the request server channel
+hands that work to an :class:`AuthCryptoPool` and awaits it, so the worker
+keeps serving other requests meanwhile.  The pool admits at most
+:conf_master:`auth_crypto_queue_size` requests at a time; minions beyond
+that are told to try again later instead of piling up.
+
+:func:`auth_reply` is the single implementation of that RSA work and is
+also what ``AuthFuncs`` runs inline when no pool is configured.
+"""
+
+import asyncio
+import binascii
+import concurrent.futures
+import hashlib
+import logging
+import multiprocessing
+import random
+
+import salt.crypt
+import salt.payload
+import salt.utils.stringutils
+from salt.exceptions import UnsupportedAlgorithm
+
+log = logging.getLogger(__name__)
+
+# Seconds a minion turned away by a full pool is asked to wait, before jitter
+BUSY_RETRY_AFTER = 2
+
+# State of a pool process, set up once by _init_worker()
+_master_key = None
+_pub_keys = None
+
+
+class AuthJob(dict):
+    """
+    The RSA work left to answer an accepted minion ``_auth`` request.
+
+    A plain dict of picklable values so it can be sent to a pool process:
+
+    ``id``, ``pub``
+        The minion id and its accepted public key (PEM).
+    ``enc_algo``, ``sig_algo``
+        The encryption and signing algorithms requested by the minion.
+    ``token``
+        The minion's encrypted token, or ``None``.
+    ``auth_mode``
+        The master's :conf_master:`auth_mode`.
+    ``aes``, ``master_aes``
+        The AES key handed to the minion, and the master's own AES key that
+        is combined with the token when ``auth_mode`` is 2 or more.
+    ``session``
+        The minion's session key.
+    ``publish_port``, ``master_sign_pubkey``
+        The matching master options.
+    ``sign_messages``, ``nonce``
+        Whether the reply is signed, and the nonce it echoes.
+    ``compression``
+        The algorithms from :conf_master:`transport_compression` the master
+        advertises to the minion.
+    """
+
+
+def clear_signed(master_key, load, algorithm):
+    """
+    Serialize ``load`` and sign it with ``master_key``.
+    """
+    try:
+        tosign = salt.payload.dumps(load)
+        return {
+            "enc": "clear",
+            "load": tosign,
+            "sig": master_key.sign(tosign, algorithm=algorithm),
+        }
+    except UnsupportedAlgorithm:
+        log.info(
+            "Minion tried to authenticate with unsupported signing algorithm: %s",
+            algorithm,
+        )
+        return {"enc": "clear", "load": {"ret": "bad sig algo"}}
+
+
+def auth_reply(master_key, pub_keys, job):
+    """
+    Build the reply to the accepted ``_auth`` request described by the
+    :class:`AuthJob` ``job``.
+
+    :param master_key: The master's :class:`~salt.crypt.MasterKeys`.
+    :param pub_keys: A :class:`~salt.crypt.PublicKeyCache` used to parse the
+        minion's public key.
+    :returns: A ``(reply, accepted)`` tuple.  ``accepted`` is ``False`` when
+        the minion asked for an encryption algorithm the master does not
+        support.
+    """
+    enc_algo = job["enc_algo"]
+    sig_algo = job["sig_algo"]
+    pub = pub_keys.from_str(job["pub"])
+    ret = {
+        "enc": "pub",
+        "pub_key": master_key.get_pub_str(),
+        "publish_port": job["publish_port"],
+    }
+
+    # sign the master's pubkey (if enabled) before it is
+    # sent to the minion that was just authenticated
+    if job["master_sign_pubkey"]:
+        # append the pre-computed signature to the auth-reply
+        if master_key.pubkey_signature:
+            log.debug("Adding pubkey signature to auth-reply")
+            log.debug(master_key.pubkey_signature)
+            ret["pub_sig"] = master_key.pubkey_signature
+        else:
+            # the master has its own signing-keypair, compute the master.pub's
+            # signature and append that to the auth-reply
+            log.debug("Signing master public key before sending")
+            pub_sign = master_key.sign_key.sign(ret["pub_key"], algorithm=sig_algo)
+            ret["pub_sig"] = binascii.b2a_base64(pub_sign)
+
+    aes = job["aes"]
+    if job["token"] is not None:
+        try:
+            mtoken = master_key.decrypt(job["token"], enc_algo)
+            if job["auth_mode"] >= 2:
+                aes = "{}_|-{}".format(job["master_aes"], mtoken)
+            else:
+                ret["token"] = pub.encrypt(mtoken, enc_algo)
+        except UnsupportedAlgorithm:
+            return {"enc": "clear", "load": {"ret": "bad enc algo"}}, False
+        except Exception as exc:  # pylint: disable=broad-except
+            # Token failed to decrypt, send back the salty bacon to
+            # support older minions
+            log.warning("Token failed to decrypt: %r", exc)
+
+    ret["aes"] = pub.encrypt(aes, enc_algo)
+    ret["session"] = pub.encrypt(job["session"], enc_algo)
+    if job.get("compression"):
+        ret["compression"] = job["compression"]
+
+    # Be aggressive about the signature
+    digest = salt.utils.stringutils.to_bytes(
+        hashlib.sha256(salt.utils.stringutils.to_bytes(aes)).hexdigest()
+    )
+    ret["sig"] = master_key.encrypt(digest)
+    if job["sign_messages"]:
+        ret["nonce"] = job["nonce"]
+        return clear_signed(master_key, ret, sig_algo), True
+    return ret, True
+
+
+def _init_worker(opts):
+    global _master_key, _pub_keys  # pylint: disable=global-statement
+    _master_key = salt.crypt.MasterKeys(opts)
+    _pub_keys = salt.crypt.PublicKeyCache(opts.get("auth_pubkey_cache_size", 1024))
+
+
+def _run_auth_reply(job):
+    return auth_reply(_master_key, _pub_keys, job)
+
+
+class AuthCryptoPool:
+    """
+    A pool of :conf_master:`auth_crypto_workers` processes running
+    :func:`auth_reply`.
+
+    The processes are spawned on first use, so the pool can be created
+    before the request server forks.  Every pool process loads the master's
+    keys itself and keeps its own LRU of parsed minion public keys.
+    """
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.workers = opts.get("auth_crypto_workers", 0)
+        self.queue_size = opts.get("auth_crypto_queue_size", 1024)
+        # Requests handed to the pool and not answered yet
+        self.pending = 0
+        self._executor = None
+
+    @property
+    def full(self):
+        return self.pending >= self.queue_size
+
+    def try_later(self):
+        """
+        Build the reply sent to a minion turned away because the pool is
+        :attr:`full`, with up to 50% jitter on the backoff hint.
+        """
+        retry_after = round(BUSY_RETRY_AFTER * random.uniform(1, 1.5), 3)
+        return {
+            "enc": "clear",
+            "load": {"ret": "try_later", "retry_after": retry_after},
+        }
+
+    async def auth_reply(self, job):
+        """
+        Run :func:`auth_reply` for ``job`` in a pool process.
+
+        Raises :class:`concurrent.futures.BrokenExecutor` when a
+        pool process died; the pool is started again on the next call.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.opts,),
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_auth_reply, job
+            )
+        except concurrent.futures.BrokenExecutor:
+            self.close()
+            raise
+        finally:
+            self.pending -= 1
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -229,6 +229,36 @@ def tagify(suffix="", prefix="", base=SALT):
     return TAGPARTER.join(str_parts)
 
 
+def tag_match_prefix(tag, match_type="startswith"):
+    """
+    Return the longest prefix every event tag matched by ``tag`` starts
+    with, for the ``match_type`` of :meth:`SaltEvent.subscribe`.
+
+    An empty string means the matched tags have no common prefix.
+    """
+    if match_type == "startswith":
+        return tag
+    if match_type == "fnmatch":
+        # Tags are matched case insensitively where paths are
+        if os.path.normcase("A") != "A":
+            return ""
+        for idx, char in enumerate(tag):
+            if char in "*?[":
+                return tag[:idx]
+        return tag
+    if match_type == "regex":
+        # Regexes are anchored to the start of the tag, see CacheRegex
+        if "|" in tag or "(?" in tag:
+            return ""
+        tag = tag[1:] if tag.startswith("^") else tag
+        for idx, char in enumerate(tag):
+            if not (char.isalnum() or char in "_-/:@"):
+                # An optional last character is not part of the prefix
+                return tag[: idx - 1] if char in "*?{" and idx else tag[:idx]
+        return tag
+    return ""
+
+
 class SaltEvent:
     """
     Warning! Use the get_event function or the code will not be
@@ -306,6 +336,8 @@ class SaltEvent:
         self.subscriber = None
         self.pusher = None
         self.raise_errors = raise_errors
+        # See set_tag_filter()
+        self.tag_prefixes = None
 
         if opts is None:
             opts = {}
@@ -387,6 +419,32 @@ class SaltEvent:
             ):
                 self.pending_events.append(evt)
 
+    def set_tag_filter(self, tags, match_type=None):
+        """
+        Ask the publisher to only send the events matching one of ``tags``,
+        or every event when ``tags`` is ``None``.
+
+        Saves receiving and unpacking every event on a busy bus when only a
+        few tags are of interest.  The publisher filters on the prefix of
+        each tag which is fixed for ``match_type``, so events still have to
+        be matched, as :meth:`get_event` does with :meth:`subscribe`.
+        """
+        if match_type is None:
+            match_type = self.opts["event_match_type"]
+        prefixes = None
+        if tags is not None:
+            prefixes = sorted({tag_match_prefix(tag, match_type) for tag in tags})
+            if "" in prefixes:
+                prefixes = None
+        self.tag_prefixes = prefixes
+        if self.subscriber is None:
+            # Applied by connect_pub()
+            return
+        if self._run_io_loop_sync:
+            self.subscriber.set_tag_filter(prefixes)
+        else:
+            self._schedule(self.subscriber.set_tag_filter, prefixes)
+
     def _schedule(self, func, *args, **kwargs):
         """
         Schedule ``func`` on the underlying asyncio event loop.
@@ -427,6 +485,8 @@ class SaltEvent:
                     ),
                     loop_kwarg="io_loop",
                 )
+                if self.tag_prefixes is not None:
+                    self.subscriber.set_tag_filter(self.tag_prefixes)
             try:
                 self.subscriber.connect(timeout=timeout)
                 self.cpub = True
@@ -447,6 +507,11 @@ class SaltEvent:
                 self.subscriber = salt.transport.ipc_publish_client(
                     self.node, self.opts, io_loop=self.io_loop
                 )
+                if self.tag_prefixes is not None:
+                    # Runs before the connect task, which then sends it
+                    self.io_loop.create_task(
+                        self.subscriber.set_tag_filter(self.tag_prefixes)
+                    )
                 self._connect_task = self.io_loop.create_task(self.subscriber.connect())
 
             # For the asynchronous case, the connect will be defered to when
@@ -0,0 +1,243 @@
+"""
+Fixed size ring of the most recent events of the master event bus, shared
+through a memory mapped file.
+
+.. versionadded:: 3008.0
+
+The master's EventPublisher appends every event it publishes along with an
+increasing sequence number.  A subscriber which connected late, such as
+:meth:`LocalClient.get_iter_returns
+<salt.client.LocalClient.get_iter_returns>` reading the returns of a job
+published before it listened, replays the events it missed from the
+sequence number it knows instead of polling the job cache.
+
+The file starts with a header::
+
+    0   magic          b"SEVR"
+    4   version        uint32
+    8   capacity       uint64, bytes of the data area
+    16  head           uint64, offset after the newest record
+    24  tail           uint64, offset of the oldest record
+    32  next_seq       uint64, sequence number of the next record
+    40  tail_seq       uint64, sequence number of the oldest record
+
+Offsets grow forever, a record at offset ``pos`` is stored at ``pos %
+capacity`` in the data area as a ``uint32`` length, the ``uint64`` sequence
+number and the packed event.  Records never wrap around the end of the data
+area: the writer skips the end, marked with a ``WRAP`` length when there is
+room for it.
+
+There is one writer.  It moves ``tail`` past the records it is about to
+overwrite before writing, so readers check ``tail`` again after copying a
+record to know whether it was overwritten meanwhile.
+"""
+
+import logging
+import mmap
+import os
+import struct
+
+import salt.utils.files
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"SEVR"
+VERSION = 1
+HEADER_SIZE = 64
+DEFAULT_SIZE = 16 * 1024 * 1024
+
+_HEADER = struct.Struct("<4sIQQQQQ")
+_U64 = struct.Struct("<Q")
+_RECORD = struct.Struct("<IQ")
+_HEAD_OFF = 16
+_TAIL_OFF = 24
+_NEXT_SEQ_OFF = 32
+_TAIL_SEQ_OFF = 40
+_WRAP = 0xFFFFFFFF
+
+
+def ring_path(opts):
+    """
+    Return the path of the event ring of the master configured by ``opts``.
+    """
+    return os.path.join(opts["cachedir"], "event_replay.ring")
+
+
+class EventRing:
+    """
+    Memory mapped ring of packed events.
+
+    Readers open an existing ring, the writer passes ``capacity`` to create
+    it, or to reuse the ring it left behind when its capacity did not change.
+    """
+
+    def __init__(self, path, capacity=None):
+        self.path = path
+        self.writable = capacity is not None
+        self._mm = None
+        self._ino = None
+        # (seq, offset) of the record after the last one read, so readers
+        # following the ring do not walk it from the tail every time
+        self._cursor = None
+        if self.writable:
+            self._create(capacity)
+        else:
+            self._open()
+
+    def _create(self, capacity):
+        size = HEADER_SIZE + capacity
+        try:
+            with salt.utils.files.fopen(self.path, "rb") as fh_:
+                header = fh_.read(_HEADER.size)
+            magic, version, old_capacity = _HEADER.unpack(header)[:3]
+            if (magic, version, old_capacity) == (MAGIC, VERSION, capacity):
+                self._open(mode="r+b")
+                return
+        except (OSError, struct.error):
+            pass
+        # Readers holding the previous ring notice the new inode
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with salt.utils.files.set_umask(0o177):
+            with salt.utils.files.fopen(tmp_path, "wb") as fh_:
+                fh_.write(_HEADER.pack(MAGIC, VERSION, capacity, 0, 0, 1, 1))
+                fh_.truncate(size)
+        os.replace(tmp_path, self.path)
+        self._open(mode="r+b")
+
+    def _open(self, mode="rb"):
+        with salt.utils.files.fopen(self.path, mode) as fh_:
+            self._ino = os.fstat(fh_.fileno()).st_ino
+            access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+            mm = mmap.mmap(fh_.fileno(), 0, access=access)
+        magic, version, capacity = _HEADER.unpack_from(mm)[:3]
+        if magic != MAGIC or version != VERSION or len(mm) < HEADER_SIZE + capacity:
+            mm.close()
+            raise ValueError(f"{self.path} is not an event ring")
+        self._mm = mm
+        self.capacity = capacity
+        self._cursor = None
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _get(self, offset):
+        return _U64.unpack_from(self._mm, offset)[0]
+
+    def _set(self, offset, value):
+        _U64.pack_into(self._mm, offset, value)
+
+    def _record_at(self, pos):
+        """
+        Return the offset, length and sequence number of the record at or
+        after ``pos``.
+        """
+        room = self.capacity - pos % self.capacity
+        if room >= _RECORD.size:
+            length, seq = _RECORD.unpack_from(
+                self._mm, HEADER_SIZE + pos % self.capacity
+            )
+            if length != _WRAP:
+                return pos, length, seq
+        pos += room
+        return (pos,) + _RECORD.unpack_from(self._mm, HEADER_SIZE)
+
+    def last_seq(self):
+        """
+        Return the sequence number of the newest event, ``0`` when the ring
+        is empty.
+        """
+        self._reopen_if_replaced()
+        return self._get(_NEXT_SEQ_OFF) - 1
+
+    def append(self, payload):
+        """
+        Append the packed event ``payload`` and return its sequence number,
+        or ``None`` when it does not fit in the ring.
+        """
+        size = _RECORD.size + len(payload)
+        if size > self.capacity:
+            return None
+        seq = self._get(_NEXT_SEQ_OFF)
+        head = self._get(_HEAD_OFF)
+        room = self.capacity - head % self.capacity
+        start = head if room >= size else head + room
+        end = start + size
+        tail = old_tail = self._get(_TAIL_OFF)
+        tail_seq = self._get(_TAIL_SEQ_OFF)
+        while end - tail > self.capacity and tail < head:
+            tail, length, tail_seq = self._record_at(tail)
+            tail += _RECORD.size + length
+            tail_seq += 1
+        if tail >= head:
+            # Nothing left before the new record
+            tail, tail_seq = start, seq
+        if tail != old_tail:
+            # Let readers know before overwriting anything
+            self._set(_TAIL_SEQ_OFF, tail_seq)
+            self._set(_TAIL_OFF, tail)
+        if start != head and room >= _RECORD.size:
+            _RECORD.pack_into(self._mm, HEADER_SIZE + head % self.capacity, _WRAP, 0)
+        offset = HEADER_SIZE + start % self.capacity
+        _RECORD.pack_into(self._mm, offset, len(payload), seq)
+        self._mm[offset + _RECORD.size : offset + size] = payload
+        self._set(_NEXT_SEQ_OFF, seq + 1)
+        self._set(_HEAD_OFF, end)
+        return seq
+
+    def _reopen_if_replaced(self):
+        if self.writable:
+            return
+        try:
+            ino = os.stat(self.path).st_ino
+        except OSError:
+            return
+        if ino != self._ino:
+            self.close()
+            self._open()
+
+    def read(self, since_seq, prefix=b"", until_seq=None):
+        """
+        Return ``(events, complete)``: the ``(seq, payload)`` pairs of the
+        events after ``since_seq``, up to ``until_seq`` included, whose
+        payload starts with ``prefix``.
+
+        ``complete`` is ``False`` when some of the events after
+        ``since_seq`` were already overwritten.
+        """
+        self._reopen_if_replaced()
+        complete = True
+        while True:
+            if since_seq + 1 < self._get(_TAIL_SEQ_OFF):
+                complete = False
+            events = self._scan(since_seq, prefix, until_seq)
+            if events is not None:
+                return events, complete
+            # The writer caught up with us
+            complete = False
+
+    def _scan(self, since_seq, prefix, until_seq):
+        head = self._get(_HEAD_OFF)
+        pos = tail = self._get(_TAIL_OFF)
+        if self._cursor is not None and tail <= self._cursor[1] <= head:
+            if self._cursor[0] <= since_seq + 1:
+                pos = self._cursor[1]
+        self._cursor = None
+        events = []
+        while pos < head:
+            pos, length, seq = self._record_at(pos)
+            if self._get(_TAIL_OFF) > pos:
+                return None
+            if until_seq is not None and seq > until_seq:
+                break
+            offset = HEADER_SIZE + pos % self.capacity + _RECORD.size
+            if seq > since_seq and self._mm[offset : offset + len(prefix)] == prefix:
+                payload = self._mm[offset : offset + length]
+                if self._get(_TAIL_OFF) > pos:
+                    return None
+                events.append((seq, payload))
+            pos += _RECORD.size + length
+            # Records are only read once, after their length
+            self._cursor = (seq + 1, pos)
+        return events
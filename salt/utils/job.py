@@ -2,11 +2,14 @@
 Functions for interacting with the job cache
 """
 
+import asyncio
 import logging
 
+import salt.exceptions
 import salt.minion
 import salt.utils.event
 import salt.utils.jid
+import salt.utils.metrics
 import salt.utils.verify
 
 log = logging.getLogger(__name__)
@@ -19,9 +22,7 @@ def store_job(opts, load, event=None, mminion=None):
     # Generate EndTime
     endtime = salt.utils.jid.jid_to_time(salt.utils.jid.gen_jid(opts))
     # If the return data is invalid, just ignore it
-    if any(key not in load for key in ("return", "jid", "id")):
-        return False
-    if not salt.utils.verify.valid_id(opts, load["id"]):
+    if not _valid_return(opts, load):
         return False
     if mminion is None:
         with salt.minion.MasterMinion(opts, states=False, rend=False) as mminion:
@@ -30,7 +31,13 @@ def store_job(opts, load, event=None, mminion=None):
         return _store_job(opts, load, event, mminion, endtime=endtime)
 
 
-def _store_job(opts, load, event, mminion, endtime=None):
+def _prep_job(opts, load, mminion):
+    """
+    Make sure the job cache knows about the jid of ``load``.
+
+    Standalone jobs (``jid == "req"``) are given a fresh jid and have their
+    load saved, since the master never saw a publish for them.
+    """
     job_cache = opts["master_job_cache"]
     if load["jid"] == "req":
         # The minion is returning a standalone job, request a jobid
@@ -84,39 +91,52 @@ def _store_job(opts, load, event, mminion, endtime=None):
                 exc_info=True,
             )
 
-    if event:
-        # If the return data is invalid, just ignore it
-        log.info("Got return from %s for job %s", load["id"], load["jid"])
-        event.fire_event(
-            load, salt.utils.event.tagify([load["jid"], "ret", load["id"]], "job")
-        )
-        event.fire_ret_load(load)
 
+def _fire_return_events(load, event):
+    """
+    Fire the ``salt/job/<jid>/ret/<id>`` event for a return
+    """
+    log.info("Got return from %s for job %s", load["id"], load["jid"])
+    event.fire_event(
+        load, salt.utils.event.tagify([load["jid"], "ret", load["id"]], "job")
+    )
+    event.fire_ret_load(load)
+
+
+def _cache_returns(opts, loads, mminion, endtime=None):
+    """
+    Write a list of returns to the master job cache.
+
+    The job load is checked and saved once per jid.  If the returner
+    provides ``returner_batch`` every return is handed over in a single
+    call, otherwise ``returner`` is called once per return.
+    """
     # if you have a job_cache, or an ext_job_cache, don't write to
     # the regular master cache
     if not opts["job_cache"] or opts.get("ext_job_cache"):
         return
 
-    # do not cache job results if explicitly requested
-    if load.get("jid") == "nocache":
-        log.debug(
-            "Ignoring job return with jid for caching %s from %s",
-            load["jid"],
-            load["id"],
-        )
+    cacheable = []
+    for load in loads:
+        # do not cache job results if explicitly requested
+        if load.get("jid") == "nocache":
+            log.debug(
+                "Ignoring job return with jid for caching %s from %s",
+                load["jid"],
+                load["id"],
+            )
+            continue
+        cacheable.append(load)
+    if not cacheable:
         return
 
     # otherwise, write to the master cache
+    job_cache = opts["master_job_cache"]
     savefstr = f"{job_cache}.save_load"
     getfstr = f"{job_cache}.get_load"
     fstr = f"{job_cache}.returner"
+    batchfstr = f"{job_cache}.returner_batch"
     updateetfstr = f"{job_cache}.update_endtime"
-    if "fun" not in load and load.get("return", {}):
-        ret_ = load.get("return", {})
-        if "fun" in ret_:
-            load.update({"fun": ret_["fun"]})
-        if "user" in ret_:
-            load.update({"user": ret_["user"]})
 
     # Try to reach returner methods
     try:
@@ -128,32 +148,180 @@ def _store_job(opts, load, event, mminion, endtime=None):
         log.error(emsg)
         raise KeyError(emsg)
 
-    save_load = True
-    if job_cache == "local_cache" and mminion.returners[getfstr](load.get("jid", "")):
-        # The job was saved previously.
-        save_load = False
+    jids = set()
+    for load in cacheable:
+        if "fun" not in load and load.get("return", {}):
+            ret_ = load.get("return", {})
+            if "fun" in ret_:
+                load.update({"fun": ret_["fun"]})
+            if "user" in ret_:
+                load.update({"user": ret_["user"]})
 
-    if save_load:
+        if load["jid"] in jids:
+            continue
+        jids.add(load["jid"])
+
+        save_load = True
+        if job_cache == "local_cache" and getfstr_func(load.get("jid", "")):
+            # The job was saved previously.
+            save_load = False
+
+        if save_load:
+            try:
+                savefstr_func(load["jid"], load)
+            except KeyError as e:
+                log.error("Load does not contain 'jid': %s", e)
+            except Exception:  # pylint: disable=broad-except
+                log.critical(
+                    "The specified '%s' returner threw a stack trace",
+                    job_cache,
+                    exc_info=True,
+                )
+
+    if len(cacheable) > 1 and batchfstr in mminion.returners:
         try:
-            mminion.returners[savefstr](load["jid"], load)
-        except KeyError as e:
-            log.error("Load does not contain 'jid': %s", e)
+            mminion.returners[batchfstr](cacheable)
         except Exception:  # pylint: disable=broad-except
             log.critical(
                 "The specified '%s' returner threw a stack trace",
                 job_cache,
                 exc_info=True,
             )
-
-    try:
-        mminion.returners[fstr](load)
-    except Exception:  # pylint: disable=broad-except
-        log.critical(
-            "The specified '%s' returner threw a stack trace", job_cache, exc_info=True
-        )
+    else:
+        for load in cacheable:
+            try:
+                fstr_func(load)
+            except Exception:  # pylint: disable=broad-except
+                log.critical(
+                    "The specified '%s' returner threw a stack trace",
+                    job_cache,
+                    exc_info=True,
+                )
 
     if opts.get("job_cache_store_endtime") and updateetfstr in mminion.returners:
-        mminion.returners[updateetfstr](load["jid"], endtime)
+        for jid in jids:
+            mminion.returners[updateetfstr](jid, endtime)
+
+
+def _store_job(opts, load, event, mminion, endtime=None):
+    _prep_job(opts, load, mminion)
+    if event:
+        _fire_return_events(load, event)
+    _cache_returns(opts, [load], mminion, endtime=endtime)
+
+
+def _valid_return(opts, load):
+    """
+    Check that a return carries the keys the job cache needs and a valid id
+    """
+    if any(key not in load for key in ("return", "jid", "id")):
+        return False
+    return salt.utils.verify.valid_id(opts, load["id"])
+
+
+def store_jobs(opts, loads, event=None, mminion=None):
+    """
+    Store a batch of job returns using the configured master_job_cache
+
+    The result is the same as calling :func:`store_job` for each load, but
+    the per-jid job cache bookkeeping runs once per jid rather than once per
+    return, and returners which provide ``returner_batch`` receive all of
+    the returns in one call.  Invalid returns are dropped.
+    """
+    # Generate EndTime
+    endtime = salt.utils.jid.jid_to_time(salt.utils.jid.gen_jid(opts))
+    loads = [load for load in loads if _valid_return(opts, load)]
+    if not loads:
+        return False
+    if mminion is None:
+        with salt.minion.MasterMinion(opts, states=False, rend=False) as mminion:
+            return _store_jobs(opts, loads, event, mminion, endtime=endtime)
+    else:
+        return _store_jobs(opts, loads, event, mminion, endtime=endtime)
+
+
+def _store_jobs(opts, loads, event, mminion, endtime=None):
+    prepped = set()
+    for load in loads:
+        # Standalone jobs get a new jid each, everything else only needs
+        # the jid announced to the job cache once.
+        if load["jid"] == "req" or load["jid"] not in prepped:
+            _prep_job(opts, load, mminion)
+            prepped.add(load["jid"])
+    if event:
+        for load in loads:
+            _fire_return_events(load, event)
+    _cache_returns(opts, loads, mminion, endtime=endtime)
+
+
+class ReturnBatcher:
+    """
+    Coalesce the minion returns handled by a master worker and store them
+    with :func:`store_jobs`.
+
+    Returns are buffered until ``return_batch_size`` of them are pending or
+    ``return_batch_interval`` seconds have passed since the first one was
+    buffered, whichever comes first.  The deadline flush is scheduled on the
+    running asyncio loop; when there is no running loop, or batching is
+    disabled, every return is stored immediately with :func:`store_job`.
+
+    The minion is acknowledged as soon as its return is buffered, so the
+    owner must call :meth:`flush` before it exits; returns still pending
+    when the worker is killed outright are lost.
+    """
+
+    def __init__(self, opts, event=None, mminion=None):
+        self.opts = opts
+        self.event = event
+        self.mminion = mminion
+        self.batch_size = opts.get("return_batch_size", 0) or 0
+        self.interval = opts.get("return_batch_interval", 0.005)
+        self.pending = []
+        self._flush_handle = None
+
+    @property
+    def enabled(self):
+        return self.batch_size > 1
+
+    def add(self, load):
+        """
+        Queue a minion return for storage
+        """
+        if not self.enabled:
+            return store_job(self.opts, load, event=self.event, mminion=self.mminion)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        self.pending.append(load)
+        if loop is None or len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.interval, self.flush)
+
+    def flush(self):
+        """
+        Store every pending return
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self.pending:
+            return
+        loads, self.pending = self.pending, []
+        salt.utils.metrics.histogram(
+            "salt.master.returns.batch_size",
+            description="Minion returns stored per job cache flush.",
+            unit="{return}",
+        ).record(len(loads))
+        try:
+            store_jobs(self.opts, loads, event=self.event, mminion=self.mminion)
+        except salt.exceptions.SaltCacheError:
+            log.error("Could not store job information for %d returns", len(loads))
+        except Exception:  # pylint: disable=broad-except
+            log.critical(
+                "Failed to store a batch of %d returns", len(loads), exc_info=True
+            )
 
 
 def store_minions(opts, jid, minions, mminion=None, syndic_id=None):
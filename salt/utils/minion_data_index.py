@@ -0,0 +1,433 @@
+"""
+In-memory inverted index of the minion data cache used for grain and
+pillar targeting.
+
+.. versionadded:: 3008.0
+
+Matching ``G@os:Ubuntu`` against the minion data cache means fetching and
+walking the cached grains of every minion, which costs seconds of master
+CPU with tens of thousands of minions.  A :class:`MinionDataIndex` maps, for
+every path targeted so far (``("os",)`` for ``os:Ubuntu``), each value found
+at that path to the set of minions it was found on.  Exact and glob
+expressions are then answered from the distinct values of the targeted
+paths instead of from every minion's data.
+
+The index is per process and per cache bank (``grains`` or ``pillar``).
+Minion data is written by whichever master worker handled the minion, so
+before answering a query the index lists the bank and compares the updated
+time of every entry with the one it indexed: only new and changed entries
+are fetched again, and removed ones are dropped.  Banks whose cache driver
+tells when they last changed (:meth:`salt.cache.Cache.bank_updated`) are
+only listed again once they did.
+
+Results are the same as :func:`salt.utils.data.subdict_match` on every
+minion.  Values the index cannot represent exactly, lists of dicts for
+instance, are left to :func:`~salt.utils.data.subdict_match` for the
+minions holding them, and expressions it does not handle (regular
+expressions, ``*`` used as a key, a custom delimiter) make
+:meth:`MinionDataIndex.match` return ``None`` so the caller falls back to
+walking every minion.
+
+The ``ipv4`` and ``ipv6`` grains are also indexed, on the first ipcidr
+target, as sorted integers: :meth:`MinionDataIndex.match_ipcidr` finds the
+addresses of a subnet by bisection, and
+:meth:`MinionDataIndex.match_addresses` the minions connected from a set of
+addresses.
+"""
+
+import bisect
+import collections
+import fnmatch
+import ipaddress
+import logging
+import threading
+import time
+
+import salt.utils.data
+import salt.utils.network
+from salt.defaults import DEFAULT_TARGET_DELIM
+
+log = logging.getLogger(__name__)
+
+# Paths indexed per bank before the least recently targeted one is dropped
+MAX_PATHS = 128
+
+# Modification times are only as precise as the filesystem clock: a bank
+# listed less than this many seconds after it last changed is listed again.
+SETTLE_TIME = 1
+
+# Result of _resolve() when a path does not exist in the data
+_MISSING = object()
+# Result of _resolve() when only subdict_match() can tell if the data matches
+_COMPLEX = object()
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(cache, bank):
+    """
+    Return the process-wide :class:`MinionDataIndex` of ``bank`` in the
+    :class:`salt.cache.Cache` ``cache``.
+    """
+    index_key = (cache.driver, cache.cachedir, bank)
+    index = _INDEXES.get(index_key)
+    if index is None:
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(index_key, MinionDataIndex(bank))
+    return index
+
+
+def _resolve(data, path):
+    """
+    Return the value found at ``path`` in ``data`` the way
+    :func:`salt.utils.data.traverse_dict_and_list` would find it.
+    """
+    ptr = data
+    for key in path:
+        if isinstance(ptr, dict):
+            if key in ptr:
+                ptr = ptr[key]
+                continue
+            if any(not isinstance(each, str) for each in ptr):
+                # traverse_dict_and_list() retries with the key YAML-loaded
+                return _COMPLEX
+            return _MISSING
+        if isinstance(ptr, (list, tuple)):
+            return _COMPLEX
+        return _MISSING
+    return ptr
+
+
+def _token(value):
+    return str(value).lower()
+
+
+class _PathIndex:
+    """
+    The values found at one path of the minions' data.
+    """
+
+    def __init__(self):
+        # Lowercased scalar value, or list member -> minion ids
+        self.values = {}
+        # Key of a dict value -> minion ids
+        self.keys = {}
+        # Minions with a non-empty dict at the path
+        self.dicts = set()
+        # Minions left to subdict_match()
+        self.complex = set()
+        # Minion id -> (values, keys) it is indexed under
+        self.by_minion = {}
+
+    def add(self, minion, data, path):
+        self.remove(minion)
+        value = _resolve(data, path)
+        if value is _MISSING or value == {}:
+            return
+        if value is _COMPLEX:
+            self.complex.add(minion)
+            return
+        values = ()
+        keys = ()
+        if isinstance(value, dict):
+            self.dicts.add(minion)
+            keys = [key for key in value if isinstance(key, str)]
+        elif isinstance(value, (list, tuple)):
+            if any(isinstance(member, (dict, list, tuple)) for member in value):
+                self.complex.add(minion)
+                return
+            values = {_token(member) for member in value}
+        else:
+            values = (_token(value),)
+        for token in values:
+            self.values.setdefault(token, set()).add(minion)
+        for key in keys:
+            self.keys.setdefault(key, set()).add(minion)
+        self.by_minion[minion] = (values, keys)
+
+    def remove(self, minion):
+        self.dicts.discard(minion)
+        self.complex.discard(minion)
+        values, keys = self.by_minion.pop(minion, ((), ()))
+        for index, tokens in ((self.values, values), (self.keys, keys)):
+            for token in tokens:
+                minions = index[token]
+                minions.discard(minion)
+                if not minions:
+                    del index[token]
+
+    def match(self, pattern, exact_match=False):
+        """
+        Return the minions whose value at this path matches ``pattern``.
+        """
+        lowered = pattern.lower()
+        if exact_match or not any(char in lowered for char in "*?["):
+            ret = set(self.values.get(lowered, ()))
+        else:
+            ret = set()
+            for token, minions in self.values.items():
+                if fnmatch.fnmatch(token, lowered):
+                    ret.update(minions)
+        ret.update(self.keys.get(pattern, ()))
+        if pattern == "*":
+            ret.update(self.dicts)
+        return ret
+
+
+def ipcidr_match(data, tgt):
+    """
+    Return whether the grains ``data`` match the
+    :func:`ipaddress.ip_address` or :func:`ipaddress.ip_network` ``tgt``.
+    """
+    proto = f"ipv{tgt.version}"
+    if data is None or proto not in data:
+        return False
+    if isinstance(tgt, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return str(tgt) in data[proto]
+    return salt.utils.network.in_subnet(tgt, data[proto])
+
+
+def addresses_match(data, addrs):
+    """
+    Return whether one of the ``ipv4`` or ``ipv6`` grains ``data`` is in the
+    set of address strings ``addrs``.
+    """
+    if data is None:
+        return False
+    return any(
+        address in addrs
+        for proto in ("ipv4", "ipv6")
+        for address in data.get(proto, [])
+    )
+
+
+class _AddressIndex:
+    """
+    The ``ipv4`` and ``ipv6`` grains of the minions.
+    """
+
+    def __init__(self):
+        # IP version -> sorted (address as an integer, minion id, address)
+        self.addresses = {4: [], 6: []}
+        # Minions left to ipcidr_match() and addresses_match()
+        self.complex = set()
+        # Minion id -> (IP version, entry) it is indexed under
+        self.by_minion = {}
+
+    def add(self, minion, data):
+        self.remove(minion)
+        if not isinstance(data, dict):
+            return
+        entries = []
+        for version in (4, 6):
+            value = data.get(f"ipv{version}")
+            if value is None:
+                continue
+            if not isinstance(value, (list, tuple)):
+                self.complex.add(minion)
+                return
+            for text in value:
+                try:
+                    address = (
+                        ipaddress.ip_address(text) if isinstance(text, str) else None
+                    )
+                except ValueError:
+                    address = None
+                if address is None or address.version != version:
+                    self.complex.add(minion)
+                    return
+                entries.append((version, (int(address), minion, text)))
+        for version, entry in entries:
+            bisect.insort(self.addresses[version], entry)
+        self.by_minion[minion] = entries
+
+    def remove(self, minion):
+        self.complex.discard(minion)
+        for version, entry in self.by_minion.pop(minion, ()):
+            addresses = self.addresses[version]
+            del addresses[bisect.bisect_left(addresses, entry)]
+
+    def match(self, tgt, text=None):
+        """
+        Return the minions with an address matching ``tgt``, spelled ``text``
+        when it is an address.
+        """
+        if isinstance(tgt, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            low = high = int(tgt)
+            text = str(tgt) if text is None else text
+        else:
+            low = int(tgt.network_address)
+            high = int(tgt.broadcast_address)
+            text = None
+        addresses = self.addresses[tgt.version]
+        ret = set()
+        for idx in range(bisect.bisect_left(addresses, (low,)), len(addresses)):
+            number, minion, address = addresses[idx]
+            if number > high:
+                break
+            # Addresses are compared as strings, like ipcidr_match() does
+            if text is None or address == text:
+                ret.add(minion)
+        return ret
+
+
+class MinionDataIndex:
+    """
+    Inverted index of one bank of the minion data cache, see the module
+    documentation.
+    """
+
+    def __init__(self, bank, max_paths=MAX_PATHS):
+        self.bank = bank
+        self.max_paths = max_paths
+        # Cache key -> (updated time, time it was indexed)
+        self._stamps = {}
+        # Cache keys without an updated time, always left to subdict_match()
+        self._untracked = set()
+        self._paths = collections.OrderedDict()
+        self._addresses = None
+        # Cache.bank_updated() of the bank when it was last listed, and the
+        # time it was listed at
+        self._bank_version = None
+        self._listed_at = None
+        self._lock = threading.Lock()
+
+    def _refresh(self, cache):
+        version = cache.bank_updated(self.bank)
+        if not isinstance(version, (int, float)):
+            version = None
+        elif version == self._bank_version and self._listed_at - version > SETTLE_TIME:
+            # Nothing was written to or removed from the bank since
+            return
+        listed_at = time.time()
+        now = int(listed_at)
+        keys = set(cache.list(self.bank) or ())
+        for key in (set(self._stamps) | self._untracked) - keys:
+            self._drop(key)
+        stamps = cache.list_updated(self.bank)
+        changed = []
+        for key in keys:
+            updated = stamps.get(key)
+            if updated is None:
+                self._drop(key)
+                self._untracked.add(key)
+                continue
+            if not isinstance(updated, (int, float)):
+                raise TypeError(f"Unexpected updated time {updated!r} for {key}")
+            stamp = self._stamps.get(key)
+            # Updated times have a one second resolution, an entry indexed
+            # in the second it was written may have been written again since
+            if stamp is None or stamp[0] != updated or stamp[1] <= updated + 1:
+                changed.append((key, updated))
+        for key, updated in changed:
+            if self._paths or self._addresses is not None:
+                self._index(key, cache.fetch(self.bank, key))
+            self._untracked.discard(key)
+            self._stamps[key] = (updated, now)
+        self._bank_version = version
+        self._listed_at = listed_at
+
+    def _index(self, key, data):
+        for path, path_index in self._paths.items():
+            path_index.add(key, data, path)
+        if self._addresses is not None:
+            self._addresses.add(key, data)
+
+    def _drop(self, key):
+        self._stamps.pop(key, None)
+        self._untracked.discard(key)
+        for path_index in self._paths.values():
+            path_index.remove(key)
+        if self._addresses is not None:
+            self._addresses.remove(key)
+
+    def _path_index(self, cache, path):
+        path_index = self._paths.get(path)
+        if path_index is not None:
+            self._paths.move_to_end(path)
+            return path_index
+        path_index = _PathIndex()
+        for key in self._stamps:
+            path_index.add(key, cache.fetch(self.bank, key), path)
+        self._paths[path] = path_index
+        while len(self._paths) > self.max_paths:
+            self._paths.popitem(last=False)
+        return path_index
+
+    def match(self, cache, expr, delimiter=DEFAULT_TARGET_DELIM, exact_match=False):
+        """
+        Return the set of cache keys whose data matches the glob, or with
+        ``exact_match`` exact, expression ``expr``, like
+        :func:`salt.utils.data.subdict_match` would.
+
+        Returns ``None`` when the expression cannot be answered from the
+        index.
+        """
+        if delimiter != DEFAULT_TARGET_DELIM:
+            return None
+        splits = expr.split(delimiter)
+        if len(splits) == 1:
+            return set()
+        if "*" in splits[:-1]:
+            return None
+        with self._lock:
+            self._refresh(cache)
+            ret = set()
+            check = set(self._untracked)
+            for idx in range(len(splits) - 1, 0, -1):
+                path_index = self._path_index(cache, tuple(splits[:idx]))
+                ret.update(path_index.match(delimiter.join(splits[idx:]), exact_match))
+                check.update(path_index.complex)
+        for key in check - ret:
+            data = cache.fetch(self.bank, key)
+            if data is not None and salt.utils.data.subdict_match(
+                data, expr, delimiter=delimiter, exact_match=exact_match
+            ):
+                ret.add(key)
+        return ret
+
+    def match_ipcidr(self, cache, tgt):
+        """
+        Return the set of cache keys whose ``ipv4`` or ``ipv6`` grains match
+        the :func:`ipaddress.ip_address` or :func:`ipaddress.ip_network`
+        ``tgt``, like :func:`ipcidr_match` would.
+        """
+        with self._lock:
+            self._refresh(cache)
+            addresses = self._address_index(cache)
+            ret = addresses.match(tgt)
+            check = self._untracked | addresses.complex
+        for key in check - ret:
+            if ipcidr_match(cache.fetch(self.bank, key), tgt):
+                ret.add(key)
+        return ret
+
+    def match_addresses(self, cache, addrs):
+        """
+        Return the set of cache keys with an ``ipv4`` or ``ipv6`` grain in
+        the set of address strings ``addrs``, like :func:`addresses_match`
+        would.
+        """
+        with self._lock:
+            self._refresh(cache)
+            addresses = self._address_index(cache)
+            ret = set()
+            for addr in addrs:
+                try:
+                    tgt = ipaddress.ip_address(addr)
+                except ValueError:
+                    continue
+                ret.update(addresses.match(tgt, text=addr))
+            check = self._untracked | addresses.complex
+        for key in check - ret:
+            if addresses_match(cache.fetch(self.bank, key), addrs):
+                ret.add(key)
+        return ret
+
+    def _address_index(self, cache):
+        if self._addresses is None:
+            self._addresses = _AddressIndex()
+            for key in self._stamps:
+                self._addresses.add(key, cache.fetch(self.bank, key))
+        return self._addresses
@@ -0,0 +1,172 @@
+"""
+In-memory index of the accepted minion ids used for glob, PCRE and list
+targeting.
+
+.. versionadded:: 3008.0
+
+Targeting ``web-prod-*`` used to list the key store and ``fnmatch`` every
+accepted minion id on each publish.  A :class:`MinionIdIndex` keeps the
+accepted ids sorted, so the literal prefix of a glob or of a regular
+expression (``web-prod-``) is found by bisection and only the ids starting
+with it are matched against the pattern.
+
+The index is per process.  Keys are accepted, rejected and deleted by
+whichever master worker or ``salt-key`` process handled them, so before
+answering the index asks the key store when its ``keys`` bank last changed
+(:meth:`salt.cache.Cache.bank_updated`, a ``stat`` of the pki directories
+or of the ``mmap_key`` files) and lists the keys again when it changed.
+Key stores unable to tell are not indexed.
+"""
+
+import bisect
+import fnmatch
+import os
+import re
+import string
+import sys
+import threading
+import time
+
+import salt.utils.data
+
+# Modification times are only as precise as the filesystem clock: a listing
+# started less than this many seconds after the last change of the key store
+# may have missed a change made in the same tick and is not trusted.
+SETTLE_TIME = 1
+
+# fnmatch() is case insensitive where os.path.normcase() lowercases
+_CASE_SENSITIVE = os.path.normcase("A") == "A"
+
+# Characters taken literally at the start of a regular expression
+_REGEX_LITERALS = frozenset(string.ascii_letters + string.digits + "_-")
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(key):
+    """
+    Return the process-wide :class:`MinionIdIndex` of the :class:`salt.key.Key`
+    ``key``, up to date, or ``None`` when its key store cannot tell when it
+    changed.
+    """
+    index_key = (key.cache.driver, key.pki_dir)
+    index = _INDEXES.get(index_key)
+    if index is None:
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(index_key, MinionIdIndex())
+    if not index.refresh(key):
+        return None
+    return index
+
+
+def _glob_prefix(pattern):
+    """
+    Return the literal prefix of the glob ``pattern``.
+    """
+    for idx, char in enumerate(pattern):
+        if char in "*?[":
+            return pattern[:idx]
+    return pattern
+
+
+def _regex_prefix(pattern):
+    """
+    Return a literal prefix of every string the regular expression ``pattern``
+    matches from its start, possibly empty.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return ""
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    end = 0
+    while end < len(pattern) and pattern[end] in _REGEX_LITERALS:
+        end += 1
+    if end < len(pattern) and pattern[end] in "*+?{":
+        # The last literal is optional or repeated
+        end -= 1
+    return pattern[:end]
+
+
+class MinionIdIndex:
+    """
+    The sorted accepted minion ids, see the module documentation.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.id_set = frozenset()
+        self._version = None
+        self._listed_at = None
+        self._lock = threading.Lock()
+
+    def refresh(self, key):
+        """
+        List the accepted keys of ``key`` again if they changed since they were
+        last listed.  Returns ``False`` when the key store cannot tell.
+        """
+        version = key.cache.bank_updated("keys")
+        if version is None:
+            return False
+        with self._lock:
+            if version == self._version and self._listed_at - version > SETTLE_TIME:
+                return True
+            listed_at = time.time()
+            ids = key.list_keys().get(key.ACC, [])
+            self.ids = sorted(ids)
+            self.id_set = frozenset(ids)
+            self._version = version
+            self._listed_at = listed_at
+        return True
+
+    def _prefixed(self, prefix):
+        """
+        Return the ids starting with ``prefix``.
+        """
+        ids = self.ids
+        if not prefix:
+            return ids
+        start = bisect.bisect_left(ids, prefix)
+        if prefix[-1] == chr(sys.maxunicode):
+            end = start
+            while end < len(ids) and ids[end].startswith(prefix):
+                end += 1
+        else:
+            # Every id starting with the prefix sorts before this one
+            end = bisect.bisect_left(
+                ids, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=start
+            )
+        return ids[start:end]
+
+    def glob(self, pattern):
+        """
+        Return the ids matching the glob ``pattern``, or any of the comma
+        separated globs, like :meth:`salt.key.Key.glob_match` does.
+        """
+        patterns = pattern.split(",") if "," in pattern else [pattern]
+        if patterns == ["*"]:
+            return list(self.ids)
+        ret = set()
+        for item in patterns:
+            if not _CASE_SENSITIVE:
+                ret.update(fnmatch.filter(self.ids, item))
+            elif item == _glob_prefix(item):
+                if item in self.id_set:
+                    ret.add(item)
+            else:
+                ret.update(fnmatch.filter(self._prefixed(_glob_prefix(item)), item))
+        return salt.utils.data.sorted_ignorecase(ret)
+
+    def pcre(self, pattern):
+        """
+        Return the ids matching the regular expression ``pattern`` from their
+        start.
+        """
+        reg = re.compile(pattern)
+        return [id_ for id_ in self._prefixed(_regex_prefix(pattern)) if reg.match(id_)]
+
+    def contains(self, names):
+        """
+        Return the members of ``names`` which are accepted ids.
+        """
+        return [name for name in names if name in self.id_set]
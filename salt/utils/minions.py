@@ -11,16 +11,24 @@ import salt.cache
 import salt.payload
 import salt.roster
 import salt.transport
+import salt.utils.compound_plan
 import salt.utils.data
 import salt.utils.files
+import salt.utils.minion_data_index
+import salt.utils.minion_id_index
 import salt.utils.network
 import salt.utils.resource_registry
 import salt.utils.resources
 import salt.utils.stringutils
+import salt.utils.target_cache
 import salt.utils.versions
 from salt._compat import ipaddress
 from salt.defaults import DEFAULT_TARGET_DELIM
-from salt.exceptions import CommandExecutionError, SaltCacheError
+from salt.exceptions import (
+    CommandExecutionError,
+    SaltCacheError,
+    SaltInvocationError,
+)
 
 HAS_RANGE = False
 try:
@@ -32,6 +40,38 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Grain and pillar targets looking at less than one cached minion in this many
+# walk the cache instead of the minion data index
+MINION_DATA_INDEX_RATIO = 32
+
+# Target types resolved from the minion data cache
+_CACHE_TGT_TYPES = frozenset(
+    {
+        "grain",
+        "grain_pcre",
+        "pillar",
+        "pillar_pcre",
+        "pillar_exact",
+        "ipcidr",
+        "compound",
+        "compound_pillar_exact",
+        "nodegroup",
+    }
+)
+
+# Target types never resolved from the resource registry
+_REGISTRY_FREE_TGT_TYPES = frozenset(
+    {
+        "pcre",
+        "grain",
+        "grain_pcre",
+        "pillar",
+        "pillar_pcre",
+        "pillar_exact",
+        "ipcidr",
+    }
+)
+
 TARGET_REX = re.compile(
     r"""(?x)
         (
@@ -392,6 +432,10 @@ class CkMinions:
         self.opts = opts
         self.cache = salt.cache.factory(opts)
         self.key = salt.key.get_key(opts)
+        self.target_cache = salt.utils.target_cache.TargetCache(
+            size=self.opts.get("target_cache_size", 1024),
+            ttl=self.opts.get("target_cache_ttl", 5),
+        )
         # ``self.registry`` is a lazy property — see :py:meth:`registry`.
         # Eager instantiation forced :class:`MmapCache` (and thus ``xxhash``)
         # to load at every ``CkMinions(opts)`` site, including paths that
@@ -431,7 +475,10 @@ class CkMinions:
         if minions:
             result_minions = fnmatch.filter(minions, expr)
         else:
-            if hasattr(self.key, "glob_match"):
+            index = self._minion_id_index()
+            if index is not None:
+                result_minions = index.glob(expr)
+            elif hasattr(self.key, "glob_match"):
                 result_minions = list(self.key.glob_match(expr).get(self.key.ACC, []))
             else:
                 # Salt 3007 ``Key`` API — ``name_match`` / legacy layouts without ``glob_match``.
@@ -476,7 +523,13 @@ class CkMinions:
             matched = [x for x in expr if x in minions]
             missing = [] if ignore_missing else [x for x in expr if x not in minions]
         else:
-            if hasattr(self.key, "list_match"):
+            index = self._minion_id_index()
+            if index is not None:
+                matched = index.contains(expr)
+                missing = (
+                    [] if ignore_missing else [x for x in expr if x not in matched]
+                )
+            elif hasattr(self.key, "list_match"):
                 found = self.key.list_match(expr)
                 matched = found.get(self.key.ACC, [])
                 missing = (
@@ -518,22 +571,40 @@ class CkMinions:
         """
         Return the minions found by looking via regular expressions
         """
-        reg = re.compile(expr)
-
         if not minions:
+            index = self._minion_id_index()
+            if index is not None:
+                return {"minions": index.pcre(expr), "missing": []}
             minions = self._pki_minions()
 
+        reg = re.compile(expr)
+
         return {
             "minions": [m for m in minions if reg.match(m)],
             "missing": [],
         }
 
+    def _minion_id_index(self):
+        """
+        Return the :mod:`minion id index <salt.utils.minion_id_index>` of the
+        accepted keys, or ``None`` when it is not available.
+        """
+        try:
+            return salt.utils.minion_id_index.get_index(self.key)
+        except Exception:  # pylint: disable=broad-except
+            log.debug("Minion id index unavailable, listing the keys", exc_info=True)
+            return None
+
     def _pki_minions(self):
         """
         Retrieve complete minion list from PKI dir.
         Respects cache if configured
         """
 
+        index = self._minion_id_index()
+        if index is not None:
+            return set(index.id_set)
+
         minions = set()
 
         try:
@@ -595,6 +666,21 @@ class CkMinions:
             if not cminions:
                 return {"minions": [], "missing": []}
             minions = set(minions)
+            # Refreshing the index costs a fraction of a fetch per cached
+            # minion, walking a handful of candidates is cheaper.
+            if (
+                not regex_match
+                and self.opts.get("minion_data_index", True)
+                and len(minions) * MINION_DATA_INDEX_RATIO >= len(cminions)
+            ):
+                matched = self._match_minion_data_index(
+                    search_type, expr, delimiter, exact_match
+                )
+                if matched is not None:
+                    return {
+                        "minions": list(minions & set(cminions) & matched),
+                        "missing": [],
+                    }
             # Track which accepted minions have cache data we can evaluate.
             # Any accepted minion not present in ``cminions`` has no cache
             # entry and must be excluded; otherwise grain/pillar targeting
@@ -621,6 +707,33 @@ class CkMinions:
             minions = list(minions)
         return {"minions": minions, "missing": []}
 
+    def _match_minion_data_index(self, search_type, expr, delimiter, exact_match):
+        """
+        Return the minions whose cached ``search_type`` data matches ``expr``
+        according to the :mod:`minion data index <salt.utils.minion_data_index>`,
+        or ``None`` when the index cannot answer.
+        """
+        return self._query_minion_data_index(
+            search_type, "match", expr, delimiter=delimiter, exact_match=exact_match
+        )
+
+    def _query_minion_data_index(self, bank, method, *args, **kwargs):
+        """
+        Return the result of the ``method`` of the
+        :mod:`minion data index <salt.utils.minion_data_index>` of ``bank``,
+        or ``None`` when the index is unavailable.
+        """
+        try:
+            index = salt.utils.minion_data_index.get_index(self.cache, bank)
+            return getattr(index, method)(self.cache, *args, **kwargs)
+        except Exception:  # pylint: disable=broad-except
+            log.debug(
+                "Minion data index unavailable for %s, walking the cache",
+                bank,
+                exc_info=True,
+            )
+            return None
+
     def _check_grain_minions(self, expr, delimiter, greedy, minions=None):
         """
         Return the minions found by looking via grains
@@ -757,21 +870,22 @@ class CkMinions:
                 except Exception:  # pylint: disable=broad-except
                     log.error("Invalid IP/CIDR target: %s", tgt)
                     return {"minions": [], "missing": []}
-            proto = f"ipv{tgt.version}"
 
             minions = set(minions)
+            indexed = self.opts.get("minion_data_index", True)
+            if indexed and len(minions) * MINION_DATA_INDEX_RATIO >= len(cminions):
+                matched = self._query_minion_data_index("grains", "match_ipcidr", tgt)
+                if matched is not None:
+                    minions.difference_update(set(cminions) - matched)
+                    return {"minions": list(minions), "missing": []}
+
             for id_ in cminions:
                 grains = self.cache.fetch("grains", id_)
                 if grains is None:
                     if not greedy:
                         minions.remove(id_)
                     continue
-                if grains is None or proto not in grains:
-                    match = False
-                elif isinstance(tgt, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
-                    match = str(tgt) in grains[proto]
-                else:
-                    match = salt.utils.network.in_subnet(tgt, grains[proto])
+                match = salt.utils.minion_data_index.ipcidr_match(grains, tgt)
 
                 if not match and id_ in minions:
                     minions.remove(id_)
@@ -818,190 +932,171 @@ class CkMinions:
             expr, delimiter, greedy, pillar_exact=True, minions=minions, fun=fun
         )
 
+    def _compound_engines(self, pillar_exact=False):
+        """
+        Return the matcher of each compound target engine
+        """
+        ref = {
+            "G": self._check_grain_minions,
+            "P": self._check_grain_pcre_minions,
+            "I": self._check_pillar_minions,
+            "J": self._check_pillar_pcre_minions,
+            "L": self._check_list_minions,
+            "N": None,  # nodegroups should already be expanded
+            "S": self._check_ipcidr_minions,
+            "E": self._check_pcre_minions,
+            "R": self._all_minions,
+            "T": self._check_resource_minions,
+            "M": self._check_managing_minion_minions,
+        }
+        if pillar_exact:
+            ref["I"] = self._check_pillar_exact_minions
+            ref["J"] = self._check_pillar_exact_minions
+        return ref
+
+    def _compile_compound(self, expr, pillar_exact=False):
+        """
+        Compile the compound target ``expr`` into a
+        :mod:`plan <salt.utils.compound_plan>`, expanding nodegroups.
+
+        :raises SaltInvocationError: when the expression is invalid
+        """
+        ref = self._compound_engines(pillar_exact)
+        nodegroups = self.opts.get("nodegroups", {})
+
+        if isinstance(expr, str):
+            words = expr.split()
+        else:
+            # we make a shallow copy in order to not affect the passed in arg
+            words = expr[:]
+
+        tokens = []
+        while words:
+            word = words.pop(0)
+            if word in salt.utils.compound_plan.OPERATORS:
+                tokens.append(word)
+                continue
+            target_info = parse_target(word)
+            if not target_info or not target_info["engine"]:
+                tokens.append(salt.utils.compound_plan.Term(word))
+                continue
+            if "N" == target_info["engine"]:
+                # if we encounter a node group, just evaluate it in-place
+                decomposed = nodegroup_comp(target_info["pattern"], nodegroups)
+                if decomposed:
+                    words = decomposed + words
+                continue
+            if not ref.get(target_info["engine"]):
+                # If an unknown engine is called at any time, fail out
+                raise SaltInvocationError(
+                    f'Unrecognized target engine "{target_info["engine"]}" for'
+                    f' target expression "{word}"'
+                )
+            tokens.append(
+                salt.utils.compound_plan.Term(
+                    word,
+                    target_info["engine"],
+                    target_info["pattern"],
+                    target_info["delimiter"],
+                )
+            )
+        return salt.utils.compound_plan.compile_plan(
+            tokens, indexed=self.opts.get("minion_data_index", True)
+        )
+
+    def _compound_context(
+        self, greedy, pillar_exact=False, minions=None, fun=None, analyze=False
+    ):
+        """
+        Return the :class:`~salt.utils.compound_plan.Context` compound plans
+        are evaluated in. Matchers look among the candidates handed down by
+        the plan, or among ``minions``.
+        """
+        ref = self._compound_engines(pillar_exact)
+
+        def match(term, candidates):
+            scope = minions if candidates is None else candidates
+            if term.engine is None:
+                return self._check_glob_minions(term.word, True, minions=scope)
+            engine_args = [term.pattern]
+            if term.engine in ("G", "P", "I", "J"):
+                engine_args.append(term.delimiter or ":")
+            engine_args.append(greedy)
+            # ignore missing minions for lists if we exclude them with
+            # a 'not'
+            if "L" == term.engine:
+                engine_args.append(term.ignore_missing)
+            # Resource-engine matchers need the function name so that
+            # merge-mode functions (state.apply etc.) wait for the
+            # managing minion's combined response instead of the
+            # individual resource ids that never produce a separate
+            # return.
+            engine_kwargs = {"minions": scope}
+            if term.engine == "T":
+                engine_kwargs["fun"] = fun
+            return ref[term.engine](*engine_args, **engine_kwargs)
+
+        def all_minions():
+            return minions or self._pki_minions()
+
+        return salt.utils.compound_plan.Context(match, all_minions, analyze=analyze)
+
+    def explain_compound(
+        self, expr, greedy=True, pillar_exact=False, minions=None, analyze=False
+    ):
+        """
+        Return the plan the compound target ``expr`` is evaluated with. With
+        ``analyze`` the plan is evaluated too, and the number of candidates
+        and matches and the time spent are reported for every node.
+
+        :raises SaltInvocationError: when the expression is invalid
+        """
+        plan = self._compile_compound(expr, pillar_exact=pillar_exact)
+        if not analyze:
+            return {"plan": plan.explain()}
+        ctx = self._compound_context(
+            greedy, pillar_exact, minions=minions, analyze=True
+        )
+        matched = plan.run(ctx, None)
+        return {
+            "plan": plan.explain(ctx.stats),
+            "minions": sorted(matched),
+            "missing": ctx.missing,
+        }
+
     def _check_compound_minions(
         self, expr, delimiter, greedy, pillar_exact=False, minions=None, fun=None
     ):  # pylint: disable=unused-argument
         """
         Return the minions found by looking via compound matcher
+
+        The expression is evaluated from its
+        :mod:`plan <salt.utils.compound_plan>`.
         """
         if not isinstance(expr, str) and not isinstance(expr, (list, tuple)):
             log.error("Compound target that is neither string, list nor tuple")
             return {"minions": [], "missing": []}
 
-        # we wrap this in a dict so we can assign to it from within the eval at
-        # the end of this method
-        _deferred_minions_scope = {"minions": minions}
-
-        def _deferred_minions():
-            if not _deferred_minions_scope["minions"]:
-                _deferred_minions_scope["minions"] = self._pki_minions()
-
-            return _deferred_minions_scope["minions"]
-
         log.debug("expr: %s, delimiter: %s, minions: %s", expr, delimiter, minions)
 
-        nodegroups = self.opts.get("nodegroups", {})
-
         if self.opts.get("minion_data_cache", False):
-            ref = {
-                "G": self._check_grain_minions,
-                "P": self._check_grain_pcre_minions,
-                "I": self._check_pillar_minions,
-                "J": self._check_pillar_pcre_minions,
-                "L": self._check_list_minions,
-                "N": None,  # nodegroups should already be expanded
-                "S": self._check_ipcidr_minions,
-                "E": self._check_pcre_minions,
-                "R": self._all_minions,
-                "T": self._check_resource_minions,
-                "M": self._check_managing_minion_minions,
-            }
-            if pillar_exact:
-                ref["I"] = self._check_pillar_exact_minions
-                ref["J"] = self._check_pillar_exact_minions
-
-            results = []
-            unmatched = []
-            opers = ["and", "or", "not", "(", ")"]
-            missing = []
-
-            if isinstance(expr, str):
-                words = expr.split()
-            else:
-                # we make a shallow copy in order to not affect the passed in arg
-                words = expr[:]
-
-            while words:
-                word = words.pop(0)
-                target_info = parse_target(word)
-
-                # Easy check first
-                if word in opers:
-                    if results:
-                        if results[-1] == "(" and word in ("and", "or"):
-                            log.error('Invalid beginning operator after "(": %s', word)
-                            return {"minions": [], "missing": []}
-                        if word == "not":
-                            if not results[-1] in ("&", "|", "("):
-                                results.append("&")
-                            results.append("(")
-                            results.append("set(all_minions())")
-                            results.append("-")
-                            unmatched.append("-")
-                        elif word == "and":
-                            results.append("&")
-                        elif word == "or":
-                            results.append("|")
-                        elif word == "(":
-                            results.append(word)
-                            unmatched.append(word)
-                        elif word == ")":
-                            if not unmatched or unmatched[-1] != "(":
-                                log.error(
-                                    "Invalid compound expr (unexpected "
-                                    "right parenthesis): %s",
-                                    expr,
-                                )
-                                return {"minions": [], "missing": []}
-                            results.append(word)
-                            unmatched.pop()
-                            if unmatched and unmatched[-1] == "-":
-                                results.append(")")
-                                unmatched.pop()
-                        else:  # Won't get here, unless oper is added
-                            log.error("Unhandled oper in compound expr: %s", expr)
-                            return {"minions": [], "missing": []}
-                    else:
-                        # seq start with oper, fail
-                        if word == "not":
-                            results.append("(")
-                            results.append("set(all_minions())")
-                            results.append("-")
-                            unmatched.append("-")
-                        elif word == "(":
-                            results.append(word)
-                            unmatched.append(word)
-                        else:
-                            log.error(
-                                "Expression may begin with binary operator: %s", word
-                            )
-                            return {"minions": [], "missing": []}
-
-                elif target_info and target_info["engine"]:
-                    if "N" == target_info["engine"]:
-                        # if we encounter a node group, just evaluate it in-place
-                        decomposed = nodegroup_comp(target_info["pattern"], nodegroups)
-                        if decomposed:
-                            words = decomposed + words
-                        continue
-
-                    engine = ref.get(target_info["engine"])
-                    if not engine:
-                        # If an unknown engine is called at any time, fail out
-                        log.error(
-                            'Unrecognized target engine "%s" for'
-                            ' target expression "%s"',
-                            target_info["engine"],
-                            word,
-                        )
-                        return {"minions": [], "missing": []}
-
-                    engine_args = [target_info["pattern"]]
-                    if target_info["engine"] in ("G", "P", "I", "J"):
-                        engine_args.append(target_info["delimiter"] or ":")
-                    engine_args.append(greedy)
-
-                    # ignore missing minions for lists if we exclude them with
-                    # a 'not'
-                    if "L" == target_info["engine"]:
-                        engine_args.append(results and results[-1] == "-")
-                    # Resource-engine matchers need the function name so that
-                    # merge-mode functions (state.apply etc.) wait for the
-                    # managing minion's combined response instead of the
-                    # individual resource ids that never produce a separate
-                    # return.
-                    engine_kwargs = {"minions": minions}
-                    if target_info["engine"] == "T":
-                        engine_kwargs["fun"] = fun
-                    _results = engine(*engine_args, **engine_kwargs)
-                    results.append(str(set(_results["minions"])))
-                    missing.extend(_results["missing"])
-                    if unmatched and unmatched[-1] == "-":
-                        results.append(")")
-                        unmatched.pop()
-
-                else:
-                    _results = self._check_glob_minions(word, True, minions=minions)
-                    results.append(str(set(_results["minions"])))
-                    if unmatched and unmatched[-1] == "-":
-                        results.append(")")
-                        unmatched.pop()
-
-            # Add a closing ')' for each item left in unmatched
-            results.extend([")" for item in unmatched])
-
-            results = " ".join(results)
-            log.debug("Evaluating final compound matching expr: %s", results)
             try:
-                minions = list(
-                    eval(  # pylint: disable=eval-used
-                        results,
-                        {
-                            "all_minions": _deferred_minions,
-                            "_deferred_minions_scope": _deferred_minions_scope,
-                        },
-                    )
-                )  # pylint: disable=W0123
-                return {"minions": minions, "missing": missing}
-            except Exception:  # pylint: disable=broad-except
-                log.error("Invalid compound target: %s", expr)
+                plan = self._compile_compound(expr, pillar_exact=pillar_exact)
+            except SaltInvocationError as exc:
+                log.error("Invalid compound target %s: %s", expr, exc)
                 return {"minions": [], "missing": []}
+            ctx = self._compound_context(greedy, pillar_exact, minions=minions, fun=fun)
+            return {"minions": list(plan.run(ctx, None)), "missing": ctx.missing}
 
         return {"minions": list(minions), "missing": []}
 
     def connected_ids(self, subset=None, show_ip=False):
         """
         Return a set of all connected minion ids, optionally within a subset
+
+        The minions connected from each address are looked up in the
+        :mod:`minion data index <salt.utils.minion_data_index>`, which is
+        only updated with the grains written since the previous call.
         """
         minions = set()
         if self.opts.get("minion_data_cache", False):
@@ -1021,6 +1116,12 @@ class CkMinions:
                 # Add in the address of a possible locally-connected minion.
                 addrs.discard("::1")
                 addrs.update(set(salt.utils.network.ip_addrs6(include_loopback=False)))
+            if not show_ip and self.opts.get("minion_data_index", True):
+                connected = self._query_minion_data_index(
+                    "grains", "match_addresses", addrs
+                )
+                if connected is not None:
+                    return connected & set(subset) if subset else connected
             if subset:
                 search = subset
             for id_ in search:
@@ -1196,10 +1297,20 @@ class CkMinions:
         stored for authentication. This should return a set of ids which
         match the regex, this will then be used to parse the returns to
         make sure everyone has checked back in.
+
+        Results are memoized by the :mod:`target cache
+        <salt.utils.target_cache>`.
         """
+        if expr is None:
+            expr = ""
+        target, version, stamps = self._target_version(
+            expr, tgt_type, delimiter, greedy, fun
+        )
+        if target is not None:
+            cached = self.target_cache.get(target, version)
+            if cached is not None:
+                return cached
         try:
-            if expr is None:
-                expr = ""
             check_func = getattr(self, f"_check_{tgt_type}_minions", None)
             if tgt_type in (
                 "grain",
@@ -1245,6 +1356,8 @@ class CkMinions:
                     _res["minions"].extend(ssh_minions)
                     _res["ssh_minions"] = True
                 roster.destroy()
+            if target is not None:
+                self.target_cache.put(target, version, _res, stamps)
         except Exception:  # pylint: disable=broad-except
             log.exception(
                 "Failed matching available minions with %s pattern: %s", tgt_type, expr
@@ -1252,6 +1365,45 @@ class CkMinions:
             _res = {"minions": [], "missing": []}
         return _res
 
+    def _target_version(self, expr, tgt_type, delimiter, greedy, fun):
+        """
+        Return the key of a target in the target cache, the version of what
+        it is resolved from and the modification times in that version, or
+        ``(None, None, ())`` when the target cannot be memoized.
+        """
+        if (
+            not self.target_cache.enabled
+            or tgt_type == "range"
+            or self.opts.get("enable_ssh_minions", False)
+        ):
+            return None, None, ()
+        if isinstance(expr, list):
+            expr = tuple(expr)
+        merge = isinstance(fun, str) and fun in _MERGE_RESOURCE_FUNS
+        target = (expr, tgt_type, delimiter, greedy, merge)
+        try:
+            hash(target)
+            stamps = [self.key.cache.bank_updated("keys")]
+            if tgt_type in _CACHE_TGT_TYPES and self.opts.get(
+                "minion_data_cache", False
+            ):
+                for bank in (
+                    "grains",
+                    "pillar",
+                    salt.utils.resource_registry.RESOURCE_GRAINS_BANK,
+                ):
+                    stamps.append(self.cache.bank_updated(bank))
+            if not all(isinstance(stamp, (int, float)) for stamp in stamps):
+                # The key store or the cache cannot tell when they changed
+                return None, None, ()
+            version = tuple(stamps)
+            if tgt_type not in _REGISTRY_FREE_TGT_TYPES:
+                version += (self.registry.content_version(),)
+        except Exception:  # pylint: disable=broad-except
+            log.debug("Target %s not memoized", expr, exc_info=True)
+            return None, None, ()
+        return target, version, stamps
+
     def validate_tgt(self, valid, expr, tgt_type, minions=None, expr_form=None):
         """
         Validate the target minions against the possible valid minions.
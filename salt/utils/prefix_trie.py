@@ -0,0 +1,76 @@
+"""
+Character trie of string prefixes, to find every registered prefix of a
+string in one pass over it.
+
+.. versionadded:: 3008.0
+
+.. code-block:: python
+
+    trie = PrefixTrie()
+    trie.add("salt/job/", "jobs")
+    trie.add("salt/", "all")
+    trie.match("salt/job/20260101/ret/web1")  # {"jobs", "all"}
+"""
+
+
+class PrefixTrie:
+    """
+    Map string prefixes to sets of values.
+    """
+
+    def __init__(self):
+        # Every node is a ``[children, values]`` pair, ``children`` mapping
+        # the next character to the child node.
+        self._root = [{}, set()]
+        self._len = 0
+
+    def __len__(self):
+        """
+        Return the number of ``(prefix, value)`` pairs.
+        """
+        return self._len
+
+    def add(self, prefix, value):
+        """
+        Register ``value`` under ``prefix``.
+        """
+        node = self._root
+        for char in prefix:
+            node = node[0].setdefault(char, [{}, set()])
+        if value not in node[1]:
+            node[1].add(value)
+            self._len += 1
+
+    def discard(self, prefix, value):
+        """
+        Unregister ``value`` from ``prefix``, if registered.
+        """
+        path = [self._root]
+        for char in prefix:
+            node = path[-1][0].get(char)
+            if node is None:
+                return
+            path.append(node)
+        if value not in path[-1][1]:
+            return
+        path[-1][1].discard(value)
+        self._len -= 1
+        # Prune the nodes left without values or children
+        for char in reversed(prefix):
+            node = path.pop()
+            if node[0] or node[1]:
+                break
+            del path[-1][0][char]
+
+    def match(self, string):
+        """
+        Return the values registered under any prefix of ``string``.
+        """
+        node = self._root
+        ret = set(node[1])
+        for char in string:
+            node = node[0].get(char)
+            if node is None:
+                break
+            ret.update(node[1])
+        return ret
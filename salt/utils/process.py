@@ -592,6 +592,62 @@ class ProcessManager:
 
         del self._process_map[pid]
 
+    def release_process(self, name):
+        """
+        Stop managing the process called ``name`` so it is not restarted,
+        without signalling it.  Returns its ``Process`` object, or ``None`` if
+        no such process is managed.
+        """
+        for pid, mapping in self._process_map.copy().items():
+            if mapping["Process"].name == name:
+                del self._process_map[pid]
+                return mapping["Process"]
+        return None
+
+    async def reap_process(self, process, grace=0):
+        """
+        Wait up to ``grace`` seconds for a released ``process`` to exit on its
+        own, then terminate it, and kill it if it is still alive after
+        ``wait_for_kill`` seconds.  The process is polled so the calling event
+        loop is never blocked.
+        """
+
+        async def _wait(timeout):
+            deadline = time.monotonic() + timeout
+            while process.is_alive() and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+            return not process.is_alive()
+
+        if not await _wait(grace):
+            log.debug("Stopping '%s' with pid %s", process.name, process.pid)
+            try:
+                process.terminate()
+            except OSError as exc:
+                if exc.errno not in (errno.ESRCH, errno.EACCES):
+                    raise
+            if not await _wait(self.wait_for_kill):
+                log.warning(
+                    "Process '%s' (%s) did not stop, killing it",
+                    process.name,
+                    process.pid,
+                )
+                process.kill()
+                await _wait(1)
+        # The process has exited, so this only reaps it
+        process.join(0)
+
+    async def stop_process(self, name, grace=0):
+        """
+        Stop the managed process called ``name`` and stop managing it, so it
+        is not restarted.  See :meth:`reap_process` for ``grace``.  Returns
+        ``True`` if such a process was found.
+        """
+        process = self.release_process(name)
+        if process is None:
+            return False
+        await self.reap_process(process, grace=grace)
+        return True
+
     def stop_restarting(self):
         self._restart_processes = False
 
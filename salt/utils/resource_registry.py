@@ -17,7 +17,9 @@ Architecture (Strategy 1 of ``mmap-compaction-design.md`` §"Secondaries"):
 * **Secondary indexes** (``by_type`` and ``by_minion``) are derived views.
   They live in-process only and are (re)materialised on first access after
   the primary file is observed to have been atomically swapped (inode
-  change). Each master worker carries its own derived snapshot.
+  change). Each master worker carries its own derived snapshot, kept as
+  posting lists with a bitmap of managing minions per resource type (see
+  :class:`_ResourcePostings`).
 
 * **Read consistency during compaction**: master worker processes that
   handle ``_register_resources`` can all write (Salt's MWorker pool).
@@ -79,14 +81,18 @@ auto-propagate to the master; the operator-level recipe is to fire
 ``resource_refresh`` on the minion event bus.
 """
 
+import contextlib
 import json
 import logging
 import os
+import tempfile
 import threading
 import time
 
 import salt.cache
+import salt.utils.files
 import salt.utils.mmap_cache
+import salt.utils.stringutils
 
 log = logging.getLogger(__name__)
 
@@ -138,6 +144,14 @@ DEFAULT_COMPACT_TOMBSTONE_RATIO = 0.2  # deleted / occupied
 #: rate is a first-order performance concern on hot write paths.
 DEFAULT_COMPACT_MIN_INTERVAL = 30.0
 
+#: Journal size above which :meth:`ResourceRegistry.maybe_compact` compacts
+#: the primary, which starts a new, empty journal.
+DEFAULT_COMPACT_JOURNAL_BYTES = 64 * 1024 * 1024
+
+#: Suffix of the journal of primary writes kept next to the primary mmap file
+#: (see :class:`_ResourceIndexStore`).
+JOURNAL_SUFFIX = ".journal"
+
 #: Persisted schema version for the in-cache fallback dict (legacy path).
 RESOURCE_INDEX_SCHEMA_VERSION = 2
 
@@ -220,6 +234,117 @@ def _decode_by_id_value(raw):
 # ---------------------------------------------------------------------------
 
 
+def _bitmap_members(bitmap):
+    """
+    Return the positions of the bits set in ``bitmap``, lowest first.
+    """
+    # Scanning the binary representation is cheaper than peeling the bits
+    # one by one with integer arithmetic.
+    return [pos for pos, bit in enumerate(bin(bitmap)[:1:-1]) if bit == "1"]
+
+
+class _ResourcePostings:
+    """
+    The derived views of the primary as posting lists.
+
+    Every managing minion gets a small integer ordinal. The minions managing
+    a resource type are a bitmap of ordinals (a Python ``int``), so asking
+    which minions manage a type, or whether one does, is a bit operation
+    instead of a walk over every minion. The resource ids of a type are an
+    insertion-ordered ``{rid: ordinal}`` posting list, and every bare
+    resource id maps to the types it is registered under, which answers bare
+    id lookups (``salt -L web-01``) without scanning the ids of every type.
+
+    Entries are added and removed one at a time, so a registration can be
+    applied in place as well as replayed from a full primary scan.
+    """
+
+    def __init__(self):
+        self.minion_ids = []  # [minion_id, ...] indexed by ordinal
+        self.ordinals = {}  # {minion_id: ordinal}
+        self.by_type = {}  # {rtype: {rid: ordinal}}
+        self.type_minions = {}  # {rtype: bitmap of ordinals}
+        self.by_minion = {}  # {ordinal: {rtype: {rid: None}}}
+        self.types_by_rid = {}  # {rid: {rtype: None}}
+
+    def _ordinal(self, minion_id):
+        ordinal = self.ordinals.get(minion_id)
+        if ordinal is None:
+            ordinal = self.ordinals[minion_id] = len(self.minion_ids)
+            self.minion_ids.append(minion_id)
+        return ordinal
+
+    def add(self, resource_type, resource_id, minion_id):
+        """
+        Record that ``minion_id`` manages ``resource_type:resource_id``,
+        replacing any other managing minion.
+        """
+        ordinal = self._ordinal(minion_id)
+        rids = self.by_type.setdefault(resource_type, {})
+        previous = rids.get(resource_id)
+        if previous == ordinal:
+            return
+        if previous is not None:
+            self.remove(resource_type, resource_id)
+            rids = self.by_type.setdefault(resource_type, {})
+        rids[resource_id] = ordinal
+        self.type_minions[resource_type] = self.type_minions.get(resource_type, 0) | (
+            1 << ordinal
+        )
+        self.by_minion.setdefault(ordinal, {}).setdefault(resource_type, {})[
+            resource_id
+        ] = None
+        self.types_by_rid.setdefault(resource_id, {})[resource_type] = None
+
+    def remove(self, resource_type, resource_id):
+        """
+        Forget ``resource_type:resource_id``. Absent entries are ignored.
+        """
+        rids = self.by_type.get(resource_type)
+        if rids is None or resource_id not in rids:
+            return
+        ordinal = rids.pop(resource_id)
+        if not rids:
+            del self.by_type[resource_type]
+        by_rtype = self.by_minion[ordinal]
+        minion_rids = by_rtype[resource_type]
+        del minion_rids[resource_id]
+        if not minion_rids:
+            # That was the last resource of this type the minion manages
+            del by_rtype[resource_type]
+            bitmap = self.type_minions[resource_type] & ~(1 << ordinal)
+            if bitmap:
+                self.type_minions[resource_type] = bitmap
+            else:
+                del self.type_minions[resource_type]
+            if not by_rtype:
+                del self.by_minion[ordinal]
+        rtypes = self.types_by_rid[resource_id]
+        del rtypes[resource_type]
+        if not rtypes:
+            del self.types_by_rid[resource_id]
+
+    def minions(self, bitmap):
+        """
+        Return the minion ids of the ordinals set in ``bitmap``.
+        """
+        return {self.minion_ids[ordinal] for ordinal in _bitmap_members(bitmap)}
+
+    def resources_by_minion(self, minion_id):
+        ordinal = self.ordinals.get(minion_id)
+        if ordinal is None:
+            return {}
+        return {
+            rtype: list(rids) for rtype, rids in self.by_minion.get(ordinal, {}).items()
+        }
+
+    def manages_type(self, minion_id, resource_type):
+        ordinal = self.ordinals.get(minion_id)
+        if ordinal is None:
+            return False
+        return bool(self.type_minions.get(resource_type, 0) >> ordinal & 1)
+
+
 class _ResourceIndexStore:
     """
     Mmap-backed primary plus in-process derived indexes.
@@ -236,16 +361,27 @@ class _ResourceIndexStore:
         resources = store.resources_by_minion("vcenter-1")
         store.compact()
 
-    Derived indexes (``by_type``, ``by_minion``) are recomputed from a full
-    scan of the primary whenever the primary's *content version* has changed
-    since the last rebuild. ``content_version`` is ``(st_ino, st_mtime_ns)``
-    — writers bump the file's ``mtime`` on every ``put``/``delete`` (see
+    Derived indexes (``by_type``, ``by_minion``, see
+    :class:`_ResourcePostings`) are brought up to date whenever the
+    primary's *content version* has changed since they were last updated.
+    ``content_version`` is ``(st_ino, st_mtime_ns)`` — writers bump the
+    file's ``mtime`` on every ``put``/``delete`` (see
     :meth:`MmapCache._touch_mtime`), so the signal catches both:
 
     * compactions (``os.replace`` -> new inode), and
     * in-place mutations from other worker processes (same inode, fresh mtime).
 
-    Rebuilds are serialised under an internal lock so concurrent readers
+    Every write is also appended to a journal next to the primary file
+    (``<path>.journal``, one JSON record per line), under an exclusive lock
+    of the journal held across the primary write, so the journal lists the
+    writes of every master worker in the order they hit the primary. Readers
+    remember how far into the journal their derived views go and apply only
+    the records appended since, so re-registering one minion costs
+    O(its resources) instead of a scan of the whole primary. The views are
+    rebuilt from a full scan only on first use, after a compaction (which
+    starts a new journal) and to recover from a journal they cannot follow.
+
+    Updates are serialised under an internal lock so concurrent readers
     share the cost.
     """
 
@@ -273,12 +409,15 @@ class _ResourceIndexStore:
         )
 
         # Derived views, keyed by the primary content_version they were
-        # built from (``(st_ino, st_mtime_ns)``). On version mismatch the
-        # views are discarded and rebuilt.
+        # last updated at (``(st_ino, st_mtime_ns)``). On version mismatch
+        # the journal records appended since are applied to the views.
         self._derived_lock = threading.Lock()
         self._derived_version = None
-        self._by_type: dict = {}  # {rtype: [rid, ...]}
-        self._by_minion: dict = {}  # {minion_id: {rtype: [rid, ...]}}
+        self._postings = _ResourcePostings()
+        self._journal_path = path + JOURNAL_SUFFIX
+        # Inode of the journal the views follow and how far into it they go
+        self._journal_id = None
+        self._journal_offset = 0
 
         # Throttled staleness check: remember the last time we stat()ed the
         # file and the version we saw, so hot read paths don't syscall per
@@ -322,8 +461,9 @@ class _ResourceIndexStore:
         flushes via ``mmap.flush()`` — which on Linux does **not** advance
         the backing file's ``st_mtime``/``st_size`` — we explicitly bump the
         file's mtime via :func:`os.utime`. Other master workers stat() the
-        file on their throttled staleness check and rebuild their derived
-        view when they see the new mtime.
+        file on their throttled staleness check and apply the journal
+        record of the write to their derived view when they see the new
+        mtime.
 
         Same-process visibility: in addition to the mtime bump, we
         increment :py:attr:`_write_generation` and invalidate the
@@ -332,23 +472,50 @@ class _ResourceIndexStore:
 
         :returns: ``True`` on success.
         """
-        blob = _encode_by_id_value(minion_id, resource_type)
-        ok = self._primary.put(srn_key, blob)
-        if ok:
-            self._invalidate_version_cache()
-            self._touch_primary_mtime()
-        return ok
+        return self.put_many([(srn_key, minion_id, resource_type)])
 
     def delete(self, srn_key):
         """
         Mark a primary entry as DELETED (tombstone). Compaction reclaims
         the slot. O(1) amortised.
         """
-        ok = self._primary.delete(srn_key)
-        if ok:
-            self._invalidate_version_cache()
-            self._touch_primary_mtime()
-        return ok
+        return bool(self._delete_many([srn_key]))
+
+    @contextlib.contextmanager
+    def _journal_locked(self):
+        """
+        Hold the exclusive lock of the journal and yield it, opened for
+        appending.
+
+        :meth:`compact` replaces the journal with an empty one while holding
+        the lock of the old one, so a writer which was waiting on the old
+        journal tries again with the new one.
+        """
+        os.makedirs(os.path.dirname(self._journal_path), exist_ok=True)
+        while True:
+            with salt.utils.files.flopen(self._journal_path, "ab") as fh_:
+                try:
+                    current = os.stat(self._journal_path).st_ino
+                except FileNotFoundError:
+                    continue
+                if os.fstat(fh_.fileno()).st_ino == current:
+                    yield fh_
+                    return
+
+    def _journal_append(self, fh_, records):
+        """
+        Append ``records`` to the journal ``fh_`` in a single write.
+        """
+        if records:
+            fh_.write(
+                b"".join(
+                    salt.utils.stringutils.to_bytes(
+                        json.dumps(record, separators=(",", ":")) + "\n"
+                    )
+                    for record in records
+                )
+            )
+            fh_.flush()
 
     def _touch_primary_mtime(self):
         """
@@ -396,10 +563,22 @@ class _ResourceIndexStore:
         Each put acquires its own file lock; for very large inputs prefer
         :meth:`compact` feeding :meth:`~MmapCache.atomic_rebuild`.
         """
+        entries = list(entries)
+        if not entries:
+            return True
         ok = True
-        for srn_key, minion_id, rtype in entries:
-            if not self.put(srn_key, minion_id, rtype):
-                ok = False
+        records = []
+        with self._journal_locked() as journal:
+            for srn_key, minion_id, rtype in entries:
+                blob = _encode_by_id_value(minion_id, rtype)
+                if self._primary.put(srn_key, blob):
+                    records.append(["p", srn_key, minion_id, rtype])
+                else:
+                    ok = False
+            self._journal_append(journal, records)
+        if records:
+            self._invalidate_version_cache()
+            self._touch_primary_mtime()
         return ok
 
     def delete_many(self, srn_keys):
@@ -407,10 +586,27 @@ class _ResourceIndexStore:
         Tombstone many primary entries. Idempotent: absent keys are
         silently ignored.
         """
-        for k in srn_keys:
-            self.delete(k)
+        self._delete_many(srn_keys)
         return True
 
+    def _delete_many(self, srn_keys):
+        """
+        Tombstone ``srn_keys`` and return how many of them were present.
+        """
+        srn_keys = list(srn_keys)
+        if not srn_keys:
+            return 0
+        records = []
+        with self._journal_locked() as journal:
+            for srn_key in srn_keys:
+                if self._primary.delete(srn_key):
+                    records.append(["d", srn_key])
+            self._journal_append(journal, records)
+        if records:
+            self._invalidate_version_cache()
+            self._touch_primary_mtime()
+        return len(records)
+
     # ------------------------------------------------------------------
     # Compaction
     # ------------------------------------------------------------------
@@ -427,15 +623,23 @@ class _ResourceIndexStore:
         :returns: ``(occupied_before, occupied_after)`` for caller logging.
         """
         before = self._primary.get_stats().get("occupied", 0)
-        # ``list_items`` is a full scan of OCCUPIED slots. It returns
-        # ``[(key, value), ...]`` where ``value`` is the JSON blob (str)
-        # or ``True`` for set-member entries. ``atomic_rebuild`` handles
-        # both shapes via :func:`MmapCache._normalize_iterator`.
-        items = self._primary.list_items()
-        ok = self._primary.atomic_rebuild(items)
-        if not ok:
-            log.error("resource_registry: atomic_rebuild failed for %s", self._path)
-            return before, before
+        with self._journal_locked():
+            # ``list_items`` is a full scan of OCCUPIED slots. It returns
+            # ``[(key, value), ...]`` where ``value`` is the JSON blob (str)
+            # or ``True`` for set-member entries. ``atomic_rebuild`` handles
+            # both shapes via :func:`MmapCache._normalize_iterator`.
+            items = self._primary.list_items()
+            ok = self._primary.atomic_rebuild(items)
+            if not ok:
+                log.error("resource_registry: atomic_rebuild failed for %s", self._path)
+                return before, before
+            # The compacted primary holds every write journaled so far:
+            # start a new journal. Readers see its new inode and rebuild.
+            fd_, tmp = tempfile.mkstemp(
+                dir=os.path.dirname(self._journal_path), prefix=".journal_"
+            )
+            os.close(fd_)
+            os.replace(tmp, self._journal_path)
         # The swap invalidates any cached derived view: both inode and
         # mtime change, so the next reader's ``_current_version`` will
         # pick it up. Proactively invalidate here too, to avoid a stale
@@ -458,7 +662,7 @@ class _ResourceIndexStore:
         :rtype: list[str]
         """
         self._ensure_derived_fresh()
-        return list(self._by_type.get(resource_type, ()))
+        return list(self._postings.by_type.get(resource_type, ()))
 
     def resource_types(self):
         """
@@ -467,7 +671,16 @@ class _ResourceIndexStore:
         :rtype: tuple[str, ...]
         """
         self._ensure_derived_fresh()
-        return tuple(self._by_type.keys())
+        return tuple(self._postings.by_type)
+
+    def types_by_rid(self, resource_id):
+        """
+        Return the resource types ``resource_id`` is registered under.
+
+        :rtype: tuple[str, ...]
+        """
+        self._ensure_derived_fresh()
+        return tuple(self._postings.types_by_rid.get(resource_id, ()))
 
     def resources_by_minion(self, minion_id):
         """
@@ -476,9 +689,17 @@ class _ResourceIndexStore:
         :rtype: dict[str, list[str]]
         """
         self._ensure_derived_fresh()
-        return {
-            rt: list(rids) for rt, rids in self._by_minion.get(minion_id, {}).items()
-        }
+        return self._postings.resources_by_minion(minion_id)
+
+    def minion_has_type(self, minion_id, resource_type):
+        """
+        Return ``True`` if ``minion_id`` manages a resource of
+        ``resource_type``.
+
+        :rtype: bool
+        """
+        self._ensure_derived_fresh()
+        return self._postings.manages_type(minion_id, resource_type)
 
     def all_minions_by_type(self, resource_type):
         """
@@ -488,11 +709,8 @@ class _ResourceIndexStore:
         :rtype: set[str]
         """
         self._ensure_derived_fresh()
-        out = set()
-        for mid, by_rtype in self._by_minion.items():
-            if resource_type in by_rtype:
-                out.add(mid)
-        return out
+        postings = self._postings
+        return postings.minions(postings.type_minions.get(resource_type, 0))
 
     # ------------------------------------------------------------------
     # Staleness / derived-rebuild plumbing
@@ -528,10 +746,22 @@ class _ResourceIndexStore:
         self._last_stat_time = now
         return version
 
+    def journal_size(self):
+        """
+        Return the size in bytes of the journal of primary writes.
+
+        :rtype: int
+        """
+        try:
+            return os.stat(self._journal_path).st_size
+        except OSError:
+            return 0
+
     def _ensure_derived_fresh(self):
         """
-        Rebuild the derived ``by_type`` / ``by_minion`` views if the primary
-        has changed since the last rebuild.
+        Update the derived ``by_type`` / ``by_minion`` views if the primary
+        has changed since they were last updated: apply the journal records
+        appended since, or rebuild them when the journal cannot be followed.
 
         Freshness is driven by :meth:`_current_version`, which combines
         the file ``stat()`` tuple (cross-process detection: new inode on
@@ -548,18 +778,81 @@ class _ResourceIndexStore:
         with self._derived_lock:
             if current == self._derived_version:
                 return
+            if self._derived_version is not None and self._replay_journal():
+                self._derived_version = current
+                return
             self._rebuild_derived(current)
 
+    def _replay_journal(self):
+        """
+        Apply the journal records appended since the derived views were last
+        updated. O(records).
+
+        Returns ``False`` when the views must be rebuilt instead: the journal
+        was replaced by a compaction, truncated, or holds a record that does
+        not decode. Callers must hold ``self._derived_lock``.
+        """
+        try:
+            with salt.utils.files.fopen(self._journal_path, "rb") as fh_:
+                stat = os.fstat(fh_.fileno())
+                if self._journal_id is None:
+                    # The journal was created after the views were built,
+                    # every record in it is newer than them.
+                    self._journal_id = stat.st_ino
+                if (
+                    stat.st_ino != self._journal_id
+                    or stat.st_size < self._journal_offset
+                ):
+                    return False
+                fh_.seek(self._journal_offset)
+                data = fh_.read()
+        except FileNotFoundError:
+            # Nothing was ever journaled, or the views followed a journal
+            # which is gone now.
+            return self._journal_id is None
+        except OSError:
+            return False
+        # A record still being written is applied on the next update
+        end = data.rfind(b"\n") + 1
+        postings = self._postings
+        try:
+            for line in data[:end].splitlines():
+                record = json.loads(line)
+                rtype, _, rid = record[1].partition(":")
+                if record[0] == "p":
+                    postings.add(record[3], rid, record[2])
+                elif record[0] == "d":
+                    postings.remove(rtype, rid)
+                else:
+                    raise ValueError(f"unknown operation {record[0]!r}")
+        except (TypeError, ValueError, IndexError, AttributeError) as exc:
+            log.warning(
+                "resource_registry: cannot follow journal %s (%s), rebuilding",
+                self._journal_path,
+                exc,
+            )
+            return False
+        self._journal_offset += end
+        return True
+
     def _rebuild_derived(self, version):
         """
         Walk every OCCUPIED slot in the primary, decode the value, and
-        rebuild the in-process derived dicts from scratch. O(N_slots).
+        rebuild the in-process posting lists from scratch. O(N_slots).
 
         Callers must hold ``self._derived_lock``.
         """
         t0 = time.perf_counter()
-        by_type: dict = {}
-        by_minion: dict = {}
+        postings = _ResourcePostings()
+        # Records appended to the journal from here on are applied on top
+        # of the scan. The scan may already include some of them, which is
+        # harmless: records set or remove an entry, applying one again
+        # leaves the views as they are.
+        try:
+            stat = os.stat(self._journal_path)
+            journal_id, journal_offset = stat.st_ino, stat.st_size
+        except OSError:
+            journal_id, journal_offset = None, 0
 
         # list_items() tolerates a missing file (returns []); perfect for
         # first use before any writes have happened.
@@ -577,11 +870,11 @@ class _ResourceIndexStore:
             _rtype_from_key, _, rid = srn_key.partition(":")
             if not rid:
                 continue
-            by_type.setdefault(rtype, []).append(rid)
-            by_minion.setdefault(mid, {}).setdefault(rtype, []).append(rid)
+            postings.add(rtype, rid, mid)
 
-        self._by_type = by_type
-        self._by_minion = by_minion
+        self._postings = postings
+        self._journal_id = journal_id
+        self._journal_offset = journal_offset
         self._derived_version = version
         elapsed = time.perf_counter() - t0
         if elapsed > DERIVED_REBUILD_BUDGET_SECONDS:
@@ -590,16 +883,16 @@ class _ResourceIndexStore:
                 "(budget %.2fs, %d types, %d minions)",
                 elapsed,
                 DERIVED_REBUILD_BUDGET_SECONDS,
-                len(by_type),
-                len(by_minion),
+                len(postings.by_type),
+                len(postings.by_minion),
             )
         else:
             log.debug(
                 "resource_registry: derived-index rebuild %.3fs "
                 "(%d types, %d minions, version=%s)",
                 elapsed,
-                len(by_type),
-                len(by_minion),
+                len(postings.by_type),
+                len(postings.by_minion),
                 version,
             )
 
@@ -670,6 +963,12 @@ class ResourceRegistry:
                 DEFAULT_COMPACT_MIN_INTERVAL,
             )
         )
+        self._compact_journal_bytes = int(
+            opts.get(
+                "resource_registry_compact_journal_bytes",
+                DEFAULT_COMPACT_JOURNAL_BYTES,
+            )
+        )
         self._last_compact_check = 0.0
 
     def close(self):
@@ -748,6 +1047,13 @@ class ResourceRegistry:
             return []
         return list(managing)
 
+    def content_version(self):
+        """
+        Return an opaque value which changes whenever the registry contents
+        change, in this process or another one.
+        """
+        return self._store._current_version()
+
     def get_resources_for_minion(self, minion_id):
         """
         Return ``{resource_type: [resource_id, ...]}`` for ``minion_id``.
@@ -761,7 +1067,7 @@ class ResourceRegistry:
         Return ``True`` if ``minion_id`` manages any resource of
         ``resource_type``.
         """
-        return resource_type in self._store.resources_by_minion(minion_id)
+        return self._store.minion_has_type(minion_id, resource_type)
 
     def has_resource(self, minion_id, resource_type, resource_id):
         """
@@ -795,9 +1101,8 @@ class ResourceRegistry:
             return []
         out = []
         try:
-            for rtype in self._store.resource_types():
-                if resource_id in self._store.rids_by_type(rtype):
-                    out.append((rtype, resource_id))
+            for rtype in self._store.types_by_rid(resource_id):
+                out.append((rtype, resource_id))
         except Exception as exc:  # pylint: disable=broad-except
             log.warning(
                 "resource_registry: resolve_bare_resource_id(%r) failed: %s",
@@ -831,21 +1136,24 @@ class ResourceRegistry:
         :returns: ``(n_put, n_deleted)``.
         """
         previous = self._store.resources_by_minion(minion_id)
+        previous_keys = {
+            resource_index_srn_key(rtype, rid)
+            for rtype, rids in previous.items()
+            for rid in rids
+        }
 
         new_keys = set()
         to_put = []
         for rtype, rids in (resources or {}).items():
             for rid in rids or ():
                 srn = resource_index_srn_key(rtype, rid)
+                if srn in new_keys:
+                    continue
                 new_keys.add(srn)
-                to_put.append((srn, minion_id, rtype))
+                if srn not in previous_keys:
+                    to_put.append((srn, minion_id, rtype))
 
-        to_delete = []
-        for rtype, rids in previous.items():
-            for rid in rids:
-                srn = resource_index_srn_key(rtype, rid)
-                if srn not in new_keys:
-                    to_delete.append(srn)
+        to_delete = [srn for srn in previous_keys if srn not in new_keys]
 
         # Order matters only for correctness under concurrent reads: puts
         # first so that a resource moving from one type to another (rare)
@@ -905,6 +1213,8 @@ class ResourceRegistry:
           (default 0.6). Prevents linear probing from degrading.
         * Tombstone ratio = ``deleted / occupied > compact_tombstone_ratio``
           (default 0.2). Reclaims dead slots.
+        * Journal size > ``compact_journal_bytes`` (default 64 MiB). The
+          journal of primary writes only starts over on compaction.
 
         Time-throttled to at most one stats read per
         :data:`DEFAULT_COMPACT_MIN_INTERVAL` seconds, because
@@ -939,20 +1249,25 @@ class ResourceRegistry:
         load_factor = stats.get("load_factor", (occupied + deleted) / total)
         tombstone_ratio = (deleted / occupied) if occupied else 0.0
 
+        journal_bytes = self._store.journal_size()
+
         need = (
             load_factor > self._compact_load_factor
             or tombstone_ratio > self._compact_tombstone_ratio
+            or journal_bytes > self._compact_journal_bytes
         )
         if not need:
             return False, stats
 
         log.info(
             "resource_registry: auto-compact triggered "
-            "(load_factor=%.3f, tombstone_ratio=%.3f, occupied=%d, deleted=%d)",
+            "(load_factor=%.3f, tombstone_ratio=%.3f, occupied=%d, deleted=%d, "
+            "journal_bytes=%d)",
             load_factor,
             tombstone_ratio,
             occupied,
             deleted,
+            journal_bytes,
         )
         before, after = self._store.compact()
         log.info(
@@ -973,8 +1288,9 @@ class ResourceRegistry:
         return {
             "primary": primary,
             "derived_version": self._store._derived_version,
-            "derived_by_type_count": len(self._store._by_type),
-            "derived_by_minion_count": len(self._store._by_minion),
+            "derived_by_type_count": len(self._store._postings.by_type),
+            "derived_by_minion_count": len(self._store._postings.by_minion),
+            "journal_bytes": self._store.journal_size(),
             "path": self._store._path,
         }
 
@@ -1010,6 +1326,9 @@ class _NullResourceRegistry:
     def get_resources_for_minion(self, minion_id):
         return {}
 
+    def content_version(self):
+        return None
+
     def register_minion(self, minion_id, resources):
         return (0, 0)
 
@@ -1024,6 +1343,7 @@ class _NullResourceRegistry:
             "derived_version": (0, 0),
             "derived_by_type_count": 0,
             "derived_by_minion_count": 0,
+            "journal_bytes": 0,
             "path": None,
         }
 
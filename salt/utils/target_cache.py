@@ -0,0 +1,102 @@
+"""
+Short lived memoization of the minions resolved for a target.
+
+.. versionadded:: 3008.0
+
+Orchestration steps and API clients publish the same target over and over,
+and :meth:`CkMinions.check_minions <salt.utils.minions.CkMinions.check_minions>`
+resolved it again every time.  A :class:`TargetCache` remembers the result
+of the most recently resolved targets for :conf_master:`target_cache_ttl`
+seconds.
+
+Every result is stored along with the version of what it was resolved from:
+when the accepted keys, the minion data cache or the resource registry
+changed since, whichever process changed them, the result is resolved
+again.
+"""
+
+import collections
+import threading
+import time
+
+# Versions are modification times, only as precise as the filesystem clock:
+# a result resolved less than this many seconds after the last change may
+# have missed a change made in the same tick and is not stored.
+SETTLE_TIME = 1
+
+
+def _copy(result):
+    return {
+        key: value.copy() if isinstance(value, (list, set, dict)) else value
+        for key, value in result.items()
+    }
+
+
+class TargetCache:
+    """
+    Bounded LRU of resolved targets.
+    """
+
+    def __init__(self, size=1024, ttl=5):
+        self.size = size
+        self.ttl = ttl
+        # Target -> (version, monotonic time it was stored, result)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.size > 0 and self.ttl > 0
+
+    def get(self, target, version):
+        """
+        Return a copy of the result stored for ``target`` if it was resolved
+        from ``version`` less than :attr:`ttl` seconds ago, else ``None``.
+        """
+        with self._lock:
+            entry = self._entries.get(target)
+            if entry is not None:
+                if entry[0] == version and time.monotonic() - entry[1] <= self.ttl:
+                    self._entries.move_to_end(target)
+                    self.hits += 1
+                    return _copy(entry[2])
+                del self._entries[target]
+                self.invalidations += 1
+            self.misses += 1
+        return None
+
+    def put(self, target, version, result, stamps=()):
+        """
+        Store a copy of ``result``, resolved for ``target`` from ``version``.
+
+        ``stamps`` are the modification times part of ``version``: results
+        resolved right after one of them are not stored.
+        """
+        if max(stamps, default=0) > time.time() - SETTLE_TIME:
+            return
+        with self._lock:
+            self._entries[target] = (version, time.monotonic(), _copy(result))
+            self._entries.move_to_end(target)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return the counters of the cache as a dict.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,300 @@
+"""
+Runtime support for autoscaling the master's MWorker pools.
+
+.. versionadded:: 3008.0
+
+Each pool defined in :conf_master:`worker_pools` may give a ``min_workers``
+and ``max_workers`` bound around its ``worker_count``.  The master then keeps
+a :class:`PoolStats` block in shared memory for every pool.  MWorkers record
+every payload they handle in it, and the ``RequestServer`` runs a
+:class:`PoolAutoscaler` that periodically reads those statistics and starts
+or stops MWorkers so each pool tracks its load:
+
+* A pool whose workers were busy for at least :data:`SCALE_UP_UTILIZATION`
+  of the last interval, or whose p99 handling latency exceeds the pool's
+  ``p99_latency_target``, grows by half its current size (at least one
+  worker) up to ``max_workers``.
+* A pool whose workers were busy for less than
+  :data:`SCALE_DOWN_UTILIZATION` of the last interval, and has not been
+  resized for :conf_master:`worker_pools_autoscale_cooldown` seconds,
+  shrinks by one worker down to ``min_workers``.
+
+Workers are retired gracefully: the autoscaler bumps the retired slot's
+generation in :class:`PoolStats`, and the MWorker started for the old
+generation drains its request channels and exits on its own.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+
+import salt.utils.metrics
+
+log = logging.getLogger(__name__)
+
+# Number of recent handling durations kept per pool for the p99 estimate
+LATENCY_WINDOW = 1024
+
+# Busy fraction of a pool's workers over one interval above which the pool
+# grows and below which it may shrink.
+SCALE_UP_UTILIZATION = 0.75
+SCALE_DOWN_UTILIZATION = 0.25
+
+
+def autoscaling_enabled(pool_config):
+    """
+    Return ``True`` when *pool_config* allows its worker count to change.
+    """
+    worker_count = pool_config.get("worker_count", 1)
+    return (
+        pool_config.get("min_workers", worker_count) < worker_count
+        or pool_config.get("max_workers", worker_count) > worker_count
+    )
+
+
+class PoolStats:
+    """
+    Load statistics for one worker pool, shared between the master, the
+    ``RequestServer`` and the pool's MWorkers.
+
+    All counters live in ``multiprocessing`` shared memory so they must be
+    created in a parent process before the workers are started, and handed
+    to the workers explicitly so spawning platforms see the same memory.
+    """
+
+    def __init__(self, worker_count, window=LATENCY_WINDOW, max_workers=None):
+        # Payloads currently being handled by the pool's workers
+        self.inflight = multiprocessing.Value("i", 0)
+        # Number of workers the pool is currently running
+        self.workers = multiprocessing.Value("i", worker_count)
+        # Accumulated seconds spent handling payloads and payloads handled
+        self.busy = multiprocessing.Value("d", 0.0)
+        self.handled = multiprocessing.Value("Q", 0)
+        # Ring buffer of the most recent handling durations
+        self.latencies = multiprocessing.Array("d", window)
+        # Generation of every worker slot, bumped when the slot's worker is
+        # retired so it drains even if the slot is reused right away
+        self.generations = multiprocessing.Array(
+            "i", max(worker_count, max_workers or 0, 1)
+        )
+
+    def start(self):
+        """
+        Record that a worker picked up a payload.
+        """
+        with self.inflight.get_lock():
+            self.inflight.value += 1
+
+    def finish(self, duration):
+        """
+        Record that a worker finished a payload after *duration* seconds.
+        """
+        with self.inflight.get_lock():
+            self.inflight.value -= 1
+        with self.busy.get_lock():
+            self.busy.value += duration
+            slot = self.handled.value % len(self.latencies)
+            self.latencies[slot] = duration
+            self.handled.value += 1
+
+    def latency_percentile(self, percentile=99, since=0):
+        """
+        Return the *percentile* of the most recent handling durations in
+        seconds, or ``0.0`` when nothing has been handled yet.
+
+        Only the payloads handled after the first *since* payloads are
+        considered, so old bursts do not skew the estimate.
+        """
+        window = len(self.latencies)
+        with self.busy.get_lock():
+            handled = self.handled.value
+            first = max(since, handled - window)
+            samples = sorted(
+                self.latencies[seq % window] for seq in range(first, handled)
+            )
+        if not samples:
+            return 0.0
+        index = max(0, math.ceil(len(samples) * percentile / 100.0) - 1)
+        return samples[index]
+
+    def generation(self, pool_index):
+        """
+        Return the current generation of worker slot *pool_index*.
+        """
+        return self.generations[pool_index]
+
+    def retire(self, pool_index):
+        """
+        Ask the worker currently running in slot *pool_index* to drain and
+        exit.
+        """
+        with self.generations.get_lock():
+            self.generations[pool_index] += 1
+
+    def snapshot(self):
+        """
+        Return a dict of the current counter values.
+        """
+        with self.busy.get_lock():
+            busy = self.busy.value
+            handled = self.handled.value
+        return {
+            "inflight": self.inflight.value,
+            "workers": self.workers.value,
+            "busy": busy,
+            "handled": handled,
+        }
+
+
+def create_pool_stats(worker_pools):
+    """
+    Create a :class:`PoolStats` for every pool in *worker_pools*.
+
+    :param dict worker_pools: The effective pool layout, as returned by
+        :func:`salt.config.worker_pools.get_worker_pools_config`.
+    :returns: A dict mapping pool names to :class:`PoolStats`.
+    """
+    return {
+        pool_name: PoolStats(
+            pool_config.get("worker_count", 1),
+            max_workers=pool_config.get("max_workers"),
+        )
+        for pool_name, pool_config in (worker_pools or {}).items()
+    }
+
+
+class PoolAutoscaler:
+    """
+    Grow and shrink worker pools between their ``min_workers`` and
+    ``max_workers`` based on :class:`PoolStats`.
+
+    The autoscaler only decides; starting and stopping processes is left to
+    the ``add_worker(pool_name, pool_index)`` and
+    ``remove_worker(pool_name, pool_index)`` callables so the owner of the
+    process manager stays in charge of its children.  Workers are added with
+    the next free index and removed highest index first.  The pool's worker
+    count in :class:`PoolStats` is updated before either callable runs.
+    """
+
+    def __init__(self, opts, worker_pools, pool_stats, add_worker, remove_worker):
+        self.opts = opts
+        self.interval = opts.get("worker_pools_autoscale_interval", 5)
+        self.cooldown = opts.get("worker_pools_autoscale_cooldown", 60)
+        self.add_worker = add_worker
+        self.remove_worker = remove_worker
+        self.pool_stats = pool_stats
+        self.pools = {
+            pool_name: pool_config
+            for pool_name, pool_config in worker_pools.items()
+            if autoscaling_enabled(pool_config) and pool_name in pool_stats
+        }
+        now = time.monotonic()
+        self._last_scaled = {pool_name: now for pool_name in self.pools}
+        self._last = {
+            pool_name: (now, pool_stats[pool_name].snapshot())
+            for pool_name in self.pools
+        }
+        self._resizes = salt.utils.metrics.counter(
+            "salt.master.workers.resizes",
+            description="Worker pool autoscaling decisions that changed a pool size.",
+        )
+
+    @property
+    def enabled(self):
+        return bool(self.pools)
+
+    def desired_workers(self, pool_name, utilization, p99, now):
+        """
+        Return the number of workers *pool_name* should run given its
+        *utilization* (busy fraction over the last interval) and *p99*
+        handling latency in seconds.
+        """
+        pool_config = self.pools[pool_name]
+        current = self.pool_stats[pool_name].workers.value
+        min_workers = pool_config.get("min_workers", pool_config["worker_count"])
+        max_workers = pool_config.get("max_workers", pool_config["worker_count"])
+        latency_target = pool_config.get("p99_latency_target")
+
+        if current < min_workers:
+            return min_workers
+        if current > max_workers:
+            return max_workers
+
+        overloaded = utilization >= SCALE_UP_UTILIZATION or (
+            latency_target and p99 > latency_target
+        )
+        if overloaded:
+            return min(max_workers, current + max(1, current // 2))
+        if (
+            utilization < SCALE_DOWN_UTILIZATION
+            and now - self._last_scaled[pool_name] >= self.cooldown
+        ):
+            return max(min_workers, current - 1)
+        return current
+
+    def evaluate(self, now=None):
+        """
+        Sample every autoscaled pool once and resize the pools that need it.
+        """
+        if now is None:
+            now = time.monotonic()
+        for pool_name in self.pools:
+            stats = self.pool_stats[pool_name]
+            snapshot = stats.snapshot()
+            last_time, last = self._last[pool_name]
+            self._last[pool_name] = (now, snapshot)
+            elapsed = now - last_time
+            if elapsed <= 0:
+                continue
+            utilization = (snapshot["busy"] - last["busy"]) / (
+                elapsed * max(1, snapshot["workers"])
+            )
+            # Requests still running count as busy even though their
+            # duration has not been recorded yet.
+            utilization = max(utilization, snapshot["inflight"] / snapshot["workers"])
+            p99 = stats.latency_percentile(99, since=last["handled"])
+            desired = self.desired_workers(pool_name, utilization, p99, now)
+            if desired != snapshot["workers"]:
+                self.resize(pool_name, desired, utilization, p99)
+                self._last_scaled[pool_name] = now
+
+    def resize(self, pool_name, desired, utilization=None, p99=None):
+        """
+        Start or stop workers until *pool_name* runs *desired* workers.
+        """
+        stats = self.pool_stats[pool_name]
+        current = stats.workers.value
+        direction = "up" if desired > current else "down"
+        log.info(
+            "Resizing worker pool '%s' from %d to %d workers "
+            "(utilization=%s, p99=%s)",
+            pool_name,
+            current,
+            desired,
+            utilization,
+            p99,
+        )
+        while current < desired:
+            with stats.workers.get_lock():
+                stats.workers.value = current + 1
+            self.add_worker(pool_name, current)
+            current += 1
+        while current > desired:
+            current -= 1
+            with stats.workers.get_lock():
+                stats.workers.value = current
+            self.remove_worker(pool_name, current)
+        self._resizes.add(1, {"pool": pool_name, "direction": direction})
+
+    async def run(self):
+        """
+        Evaluate the pools every ``worker_pools_autoscale_interval`` seconds.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.evaluate()
+            except Exception:  # pylint: disable=broad-except
+                log.error("Worker pool autoscaling failed", exc_info=True)
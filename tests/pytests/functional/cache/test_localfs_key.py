@@ -110,6 +110,27 @@ def test_updated(cache):
     assert cache.updated("keys", "nonexistant") is None
 
 
+def test_bank_updated(cache):
+    pki_dir = cache.opts["pki_dir"]
+    cache.store("keys", "minion_a", {"state": "accepted", "pub": "RSAKEY_minion_a"})
+    for base in ("", "minions", "minions_pre", "minions_rejected"):
+        path = os.path.join(pki_dir, base)
+        if os.path.isdir(path):
+            os.utime(path, (1000, 1000))
+    assert cache.bank_updated("keys") == 1000
+
+    # accepting, rejecting and deleting keys change it
+    cache.store("keys", "minion_x", {"state": "accepted", "pub": "RSAKEY_minion_x"})
+    accepted = cache.bank_updated("keys")
+    assert accepted > 1000
+    os.utime(os.path.join(pki_dir, "minions"), (1000, 1000))
+    cache.flush("keys", "minion_x")
+    assert cache.bank_updated("keys") > 1000
+
+    with pytest.raises(SaltCacheError, match="Unrecognized bank"):
+        cache.bank_updated("nope")
+
+
 def test_minion_id_validity(cache):
     with pytest.raises(SaltCacheError, match="not a valid minion_id"):
         cache.store("keys", "foo/bar/..", {})
@@ -108,6 +108,20 @@ def test_updated(cache):
     assert cache.updated("keys", "nonexistent") is None
 
 
+def test_bank_updated(cache, tmp_path):
+    assert cache.bank_updated("keys") is None
+    cache.store("keys", "minion_a", {"state": "accepted", "pub": _SAMPLE_PUB})
+    for name in os.listdir(tmp_path / "pki"):
+        os.utime(tmp_path / "pki" / name, (1000, 1000))
+    assert cache.bank_updated("keys") == 1000
+
+    cache.store("keys", "minion_b", {"state": "accepted", "pub": _SAMPLE_PUB})
+    assert cache.bank_updated("keys") > 1000
+
+    with pytest.raises(SaltCacheError):
+        cache.bank_updated("nope")
+
+
 # ---------------------------------------------------------------------------
 # minion_id validity
 # ---------------------------------------------------------------------------
@@ -0,0 +1,141 @@
+"""
+Performance benchmarks: compound target planning over a large minion data
+cache.
+
+Run with::
+
+    pytest tests/pytests/perf/test_compound_benchmarks.py -v \
+        --benchmark-columns=mean,stddev,median,ops,rounds \
+        --benchmark-group-by=param:expr
+
+The localfs minion data cache is populated once per session with the grains
+and pillar of ``_N_MINIONS`` synthetic minions, which takes a few minutes.
+
+Benchmark matrix
+----------------
+Every expression of ``_EXPRESSIONS`` is an ``and`` of terms, run with and
+without the :conf_master:`minion_data_index`:
+
+``plan``
+    ``CkMinions.check_minions(expr, "compound")``: the terms are ordered by
+    the compound planner and later terms only look at the minions matched
+    by the earlier ones.
+``terms``
+    Every term evaluated on its own over every minion and the results
+    intersected, which is how compound expressions were evaluated before
+    the planner.
+"""
+
+import fnmatch
+
+import pytest
+
+import salt.utils.minion_data_index
+import salt.utils.minions
+from tests.support.mock import patch
+
+_N_MINIONS = 50_000
+_ROUNDS = 5
+_OSES = ("Ubuntu", "Debian", "CentOS", "Windows", "FreeBSD")
+_ENVS = ("prod", "staging", "dev")
+_ROLES = ("web", "db", "cache", "worker")
+
+_EXPRESSIONS = [
+    # A short list narrows an expensive grain term
+    "G@os:Ubuntu and L@minion-00001,minion-00002,minion-00003",
+    # Regular expressions are never answered from the index
+    "P@os:^Ubu and L@minion-00001,minion-00002,minion-00003",
+    "J@env:^prod and P@os:^Cent and E@^minion-000",
+    "G@roles:web and I@env:prod and minion-0001*",
+]
+
+pytestmark = [pytest.mark.timeout(1800, func_only=True)]
+
+
+def _minion_id(idx):
+    return f"minion-{idx:05d}"
+
+
+class _FakeKey:
+    ACC = "minions"
+
+    def __init__(self, accepted):
+        self.accepted = accepted
+
+    def glob_match(self, expr):
+        return {self.ACC: fnmatch.filter(self.accepted, expr)}
+
+    def list_match(self, expr):
+        accepted = set(self.accepted)
+        return {self.ACC: [minion for minion in expr if minion in accepted]}
+
+
+@pytest.fixture(scope="session")
+def cachedir(tmp_path_factory):
+    cachedir = tmp_path_factory.mktemp("compound-cache")
+    ckminions = salt.utils.minions.CkMinions(_opts(cachedir, True))
+    for idx in range(_N_MINIONS):
+        minion_id = _minion_id(idx)
+        ckminions.cache.store(
+            "grains",
+            minion_id,
+            {
+                "id": minion_id,
+                "os": _OSES[idx % len(_OSES)],
+                "roles": [_ROLES[idx % len(_ROLES)], "base"],
+                "num_cpus": 2 ** (idx % 5),
+            },
+        )
+        ckminions.cache.store("pillar", minion_id, {"env": _ENVS[idx % len(_ENVS)]})
+    return cachedir
+
+
+def _opts(cachedir, minion_data_index):
+    return {
+        "pki_dir": str(cachedir / "pki"),
+        "minion_data_cache": True,
+        "minion_data_index": minion_data_index,
+        "key_cache": False,
+        "transport": "zeromq",
+        "extension_modules": str(cachedir / "extmods"),
+        "cachedir": str(cachedir),
+        "keys.cache_driver": "localfs_key",
+        "__role": "master",
+    }
+
+
+@pytest.fixture(params=[True, False], ids=["indexed", "unindexed"])
+def ckminions(cachedir, request):
+    ckminions = salt.utils.minions.CkMinions(_opts(cachedir, request.param))
+    accepted = [_minion_id(idx) for idx in range(_N_MINIONS)]
+    ckminions.key = _FakeKey(accepted)
+    with patch.object(ckminions, "_pki_minions", return_value=set(accepted)):
+        yield ckminions
+
+
+def _terms(ckminions, expr):
+    ret = None
+    for word in expr.split(" and "):
+        minions = set(ckminions.check_minions(word, "compound")["minions"])
+        ret = minions if ret is None else ret & minions
+    return ret
+
+
+@pytest.mark.parametrize("expr", _EXPRESSIONS)
+def test_plan(benchmark, ckminions, expr):
+    ret = benchmark.pedantic(
+        ckminions.check_minions,
+        args=(expr, "compound"),
+        rounds=_ROUNDS,
+        warmup_rounds=1,
+    )
+    assert set(ret["minions"]) == _terms(ckminions, expr)
+    benchmark.extra_info["matched"] = len(ret["minions"])
+
+
+@pytest.mark.parametrize("expr", _EXPRESSIONS)
+def test_terms(benchmark, ckminions, expr):
+    ret = benchmark.pedantic(
+        _terms, args=(ckminions, expr), rounds=_ROUNDS, warmup_rounds=1
+    )
+    benchmark.extra_info["matched"] = len(ret)
@@ -0,0 +1,122 @@
+"""
+Performance benchmarks: re-registering one minion in a large resource
+registry.
+
+Run with::
+
+    pytest tests/pytests/perf/test_resource_registry_benchmarks.py -v \
+        --benchmark-columns=mean,stddev,median,ops,rounds \
+        --benchmark-group-by=param:workers
+
+Benchmark matrix
+----------------
+Two registries share the primary mmap file, like two master workers. One
+worker re-registers a minion whose inventory changed by one resource, then
+the other worker reads that minion's resources, for registries of ``size``
+resources:
+
+``journal``
+    The reading worker applies the journaled writes to its derived views.
+``rebuild``
+    The reading worker rebuilds its derived views from a scan of the whole
+    primary, which is what every write used to cost.
+"""
+
+import itertools
+
+import pytest
+
+import salt.utils.resource_registry as rr
+from tests.support.mock import patch
+
+_RESOURCES_PER_MINION = 100
+_TYPES = ("ssh", "vm", "switch", "pdu")
+_CAPACITY = 1 << 18
+_ROUNDS = 20
+
+pytestmark = [pytest.mark.timeout(1800, func_only=True)]
+
+
+def _inventory(minion_idx, extra=None):
+    inventory = {}
+    for idx in range(_RESOURCES_PER_MINION):
+        rtype = _TYPES[idx % len(_TYPES)]
+        inventory.setdefault(rtype, []).append(f"r-{minion_idx}-{idx}")
+    if extra is not None:
+        inventory["ssh"].append(f"r-{minion_idx}-extra-{extra}")
+    return inventory
+
+
+def _registry(cachedir):
+    registry = rr.ResourceRegistry(
+        {
+            "cachedir": str(cachedir),
+            "resource_index_primary_capacity": _CAPACITY,
+            "resource_registry_compact_min_interval": 3600,
+        },
+        cache=object(),
+    )
+    # Keep compaction out of the measurements
+    registry._last_compact_check = float("inf")
+    return registry
+
+
+@pytest.fixture(params=[1_000, 10_000, 100_000], ids=lambda size: f"size={size}")
+def workers(tmp_path, request):
+    size = request.param
+    with patch.object(rr, "STALENESS_CHECK_INTERVAL", 0):
+        writer = _registry(tmp_path)
+        items = []
+        for minion_idx in range(size // _RESOURCES_PER_MINION):
+            for rtype, rids in _inventory(minion_idx).items():
+                items.extend(
+                    (
+                        rr.resource_index_srn_key(rtype, rid),
+                        rr._encode_by_id_value(f"minion-{minion_idx}", rtype),
+                    )
+                    for rid in rids
+                )
+        writer._store._primary.atomic_rebuild(items)
+        reader = _registry(tmp_path)
+        try:
+            yield writer, reader
+        finally:
+            writer.close()
+            reader.close()
+
+
+def _reregister(writer, reader, counter):
+    writer.register_minion("minion-0", _inventory(0, extra=next(counter) % 2))
+    return reader.get_resources_for_minion("minion-0")
+
+
+def _run(benchmark, writer, reader):
+    counter = itertools.count()
+    # Both workers build their views once
+    _reregister(writer, reader, counter)
+    ret = benchmark.pedantic(
+        _reregister,
+        args=(writer, reader, counter),
+        rounds=_ROUNDS,
+        warmup_rounds=1,
+    )
+    assert len(ret["ssh"]) == _RESOURCES_PER_MINION // len(_TYPES) + 1
+
+
+def test_journal(benchmark, workers):
+    writer, reader = workers
+    with patch.object(
+        rr._ResourceIndexStore,
+        "_rebuild_derived",
+        autospec=True,
+        side_effect=rr._ResourceIndexStore._rebuild_derived,
+    ) as rebuild:
+        _run(benchmark, writer, reader)
+    # Only the first reads of both workers scan the primary
+    assert rebuild.call_count == 2
+
+
+def test_rebuild(benchmark, workers):
+    writer, reader = workers
+    with patch.object(rr._ResourceIndexStore, "_replay_journal", return_value=False):
+        _run(benchmark, writer, reader)
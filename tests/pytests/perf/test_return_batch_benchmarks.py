@@ -0,0 +1,128 @@
+"""
+Performance benchmarks: per-return ``store_job`` vs batched ``store_jobs``.
+
+Run with::
+
+    pytest tests/pytests/perf/test_return_batch_benchmarks.py -v \
+        --benchmark-columns=mean,stddev,median,ops,rounds \
+        --benchmark-sort=name
+
+Each round stores ``_N_RETURNS`` minion returns for a fresh jid in the
+``local_cache`` job cache, the way an MWorker does when a large job comes
+back.  ``returns_per_second`` is recorded in the benchmark ``extra_info`` so
+the two strategies can be compared directly (and across runs with
+``--benchmark-compare``).
+"""
+
+import itertools
+import types
+
+import pytest
+
+import salt.returners.local_cache as local_cache
+import salt.utils.job
+
+_N_RETURNS = 500
+
+# A ``state.apply``-like return (~1 KB serialised)
+_RETURN = {
+    f"file_|-/etc/motd{idx}_|-/etc/motd{idx}_|-managed": {
+        "result": True,
+        "comment": "File /etc/motd is in the correct state",
+        "changes": {},
+        "duration": 1.234,
+        "__run_num__": idx,
+    }
+    for idx in range(5)
+}
+
+pytestmark = pytest.mark.usefixtures("configure_loader_modules")
+
+
+@pytest.fixture
+def configure_loader_modules(tmp_path):
+    return {
+        local_cache: {
+            "__opts__": {
+                "cachedir": str(tmp_path / "cache"),
+                "hash_type": "sha256",
+            }
+        }
+    }
+
+
+@pytest.fixture
+def opts(tmp_path):
+    (tmp_path / "pki").mkdir()
+    return {
+        "pki_dir": str(tmp_path / "pki"),
+        "job_cache": True,
+        "ext_job_cache": "",
+        "master_job_cache": "local_cache",
+        "unique_jid": False,
+    }
+
+
+@pytest.fixture
+def mminion():
+    """
+    Just enough of a MasterMinion for the job cache functions: the
+    ``local_cache`` returner functions keyed like the returner loader.
+    """
+    returners = {
+        f"local_cache.{name}": getattr(local_cache, name)
+        for name in ("prep_jid", "save_load", "get_load", "returner", "returner_batch")
+    }
+    return types.SimpleNamespace(returners=returners)
+
+
+@pytest.fixture
+def make_loads():
+    jids = itertools.count(1)
+
+    def _make_loads():
+        # The publish is saved before any return arrives, as on a master
+        jid = f"2026{next(jids):016d}"
+        minions = [f"minion-{idx:05d}" for idx in range(_N_RETURNS)]
+        local_cache.prep_jid(passed_jid=jid)
+        local_cache.save_load(
+            jid,
+            {"jid": jid, "fun": "state.apply", "tgt": minions, "tgt_type": "list"},
+            minions=minions,
+        )
+        loads = [
+            {
+                "jid": jid,
+                "id": minion_id,
+                "fun": "state.apply",
+                "fun_args": [],
+                "return": _RETURN,
+                "retcode": 0,
+                "success": True,
+            }
+            for minion_id in minions
+        ]
+        return (loads,), {}
+
+    return _make_loads
+
+
+def _record_rate(benchmark):
+    benchmark.extra_info["returns_per_second"] = _N_RETURNS / benchmark.stats["mean"]
+
+
+def test_store_job_per_return(benchmark, opts, mminion, make_loads):
+    def run(loads):
+        for load in loads:
+            salt.utils.job.store_job(opts, load, mminion=mminion)
+
+    benchmark.pedantic(run, setup=make_loads, rounds=10, warmup_rounds=1)
+    _record_rate(benchmark)
+
+
+def test_store_jobs_batched(benchmark, opts, mminion, make_loads):
+    def run(loads):
+        salt.utils.job.store_jobs(opts, loads, mminion=mminion)
+
+    benchmark.pedantic(run, setup=make_loads, rounds=10, warmup_rounds=1)
+    _record_rate(benchmark)
@@ -0,0 +1,341 @@
+"""
+Performance benchmarks: zeromq vs tcp vs ws transports over loopback.
+
+Run with::
+
+    pytest tests/pytests/perf/test_transport_benchmarks.py -v \
+        --benchmark-columns=mean,stddev,median,ops,rounds \
+        --benchmark-sort=name
+
+Every server and client runs in the test process on ``127.0.0.1`` (the
+publish daemon is the only child process), so the numbers measure the
+transport code rather than the network.  Save a run with
+``--benchmark-autosave`` and compare later runs against it with
+``--benchmark-compare`` to catch transport regressions.
+
+Benchmark matrix
+----------------
+Each benchmark runs against ``zeromq``, ``tcp`` and ``ws``, and again for
+``tcp`` and ``ws`` over TLS (the ``ssl`` option with ``CERT_REQUIRED``;
+ZeroMQ has no TLS support).
+
+``req_latency``
+    ``_N_REQUESTS`` sequential small requests per round.  The latency
+    percentiles of every request, in microseconds, are recorded in the
+    benchmark ``extra_info``.
+``req_large``
+    ``_N_LARGE_REQUESTS`` sequential requests of ``_LARGE_SIZE`` bytes per
+    round; ``megabytes_per_second`` is recorded in ``extra_info``.
+``pub_fanout``
+    ``_N_PUBLISHES`` publishes per round, each received by
+    ``_N_SUBSCRIBERS`` in-process subscribers;
+    ``messages_per_second`` (publishes times subscribers) is recorded in
+    ``extra_info``.
+"""
+
+# pylint: disable=unused-import
+
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+import pytestshellutils.utils.ports
+
+import salt.config
+import salt.payload
+import salt.transport
+import salt.utils.data
+import salt.utils.process
+from tests.conftest import FIPS_TESTRUN
+from tests.support.pytest.transport_ssl import (  # noqa: F401
+    ssl_ca_cert_key,
+    ssl_client_cert_key,
+    ssl_master_config,
+    ssl_minion_config,
+    ssl_server_cert_key,
+)
+
+_ROUNDS = 5
+_N_REQUESTS = 200
+_N_LARGE_REQUESTS = 10
+# Below the 4 MiB message size limit of the ws transport's aiohttp client
+_LARGE_SIZE = 1024 * 1024
+_N_PUBLISHES = 200
+_N_SUBSCRIBERS = 20
+
+# A ``_return``-like request (~1 KB serialised)
+_REQUEST = {
+    "cmd": "_return",
+    "id": "minion-001",
+    "jid": "20260101000000000000",
+    "fun": "test.ping",
+    "fun_args": [],
+    "return": True,
+    "retcode": 0,
+    "success": True,
+    "padding": "x" * 800,
+}
+_REPLY = {"ret": True}
+
+# A job publish (~1 KB serialised).  The zeromq publish server expects an
+# already serialised payload.
+_PUBLISH = {
+    "fun": "test.ping",
+    "arg": [],
+    "tgt": "*",
+    "tgt_type": "glob",
+    "jid": "20260101000000000000",
+    "padding": "x" * 800,
+}
+_WARMUP = {"fun": "test.ping", "warmup": True}
+
+# ws requests over TLS take a handshake each, far beyond the default timeout
+pytestmark = [pytest.mark.timeout(600, func_only=True)]
+
+
+@pytest.fixture(
+    params=[
+        ("zeromq", False),
+        ("tcp", False),
+        ("ws", False),
+        ("tcp", True),
+        ("ws", True),
+    ],
+    ids=["zeromq", "tcp", "ws", "tcp-tls", "ws-tls"],
+)
+def transport(request):
+    return request.param
+
+
+@pytest.fixture
+def process_manager():
+    pm = salt.utils.process.ProcessManager()
+    try:
+        yield pm
+    finally:
+        pm.terminate()
+
+
+def _mkdirs(opts, root_dir):
+    opts["root_dir"] = str(root_dir)
+    for name in ("cachedir", "pki_dir", "sock_dir", "conf_dir"):
+        dirpath = root_dir / name
+        dirpath.mkdir(parents=True)
+        opts[name] = str(dirpath)
+    opts["fips_mode"] = FIPS_TESTRUN
+
+
+@pytest.fixture
+def opts(tmp_path, transport, request):
+    """
+    Master and minion options for ``transport`` on free loopback ports.
+    """
+    name, tls = transport
+    master_opts = salt.config.master_config(None)
+    master_opts["__role"] = "master"
+    _mkdirs(master_opts, tmp_path / "master")
+    minion_opts = salt.config.DEFAULT_MINION_OPTS.copy()
+    minion_opts["__role"] = "minion"
+    _mkdirs(minion_opts, tmp_path / "minion")
+
+    master_opts.update(
+        transport=name,
+        interface="127.0.0.1",
+        ret_port=pytestshellutils.utils.ports.get_unused_localhost_port(),
+        publish_port=pytestshellutils.utils.ports.get_unused_localhost_port(),
+        worker_pools_enabled=False,
+    )
+    minion_opts.update(
+        transport=name,
+        id="minion-001",
+        master_ip="127.0.0.1",
+        master_port=master_opts["ret_port"],
+        publish_port=master_opts["publish_port"],
+        master_uri=f"tcp://127.0.0.1:{master_opts['ret_port']}",
+    )
+    if tls:
+        master_opts["ssl"] = request.getfixturevalue("ssl_master_config").copy()
+        minion_opts["ssl"] = request.getfixturevalue("ssl_minion_config").copy()
+        salt.config._update_ssl_config(master_opts)
+        salt.config._update_ssl_config(minion_opts)
+    return master_opts, minion_opts
+
+
+async def _wait_for_port(port, timeout=30):
+    start = time.monotonic()
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            if time.monotonic() - start > timeout:
+                raise
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+
+
+@pytest.fixture
+def req_pair(opts, io_loop, process_manager):
+    """
+    A request server answering every request with ``_REPLY`` and a client
+    connected to it.
+    """
+    master_opts, minion_opts = opts
+
+    async def handler(message):
+        return _REPLY
+
+    async def start():
+        server = salt.transport.request_server(master_opts)
+        server.pre_fork(process_manager)
+        server.post_fork(handler, io_loop)
+        await _wait_for_port(master_opts["ret_port"])
+        client = salt.transport.request_client(minion_opts, io_loop)
+        # Connect and complete any handshake outside the measured rounds
+        assert await client.send(_REQUEST) == _REPLY
+        return server, client
+
+    async def stop():
+        client.close()
+        server.close()
+        # Let the background close methods finish
+        await asyncio.sleep(0.3)
+
+    server, client = io_loop.run_sync(start)
+    try:
+        yield client
+    finally:
+        io_loop.run_sync(stop)
+
+
+@pytest.fixture
+def pub_pair(opts, io_loop, process_manager):
+    """
+    A publish server and ``_N_SUBSCRIBERS`` connected clients.  Returns the
+    server, a function building the payload to publish and the list of
+    per-subscriber receive counters.
+    """
+    master_opts, minion_opts = opts
+    if master_opts["transport"] == "zeromq":
+
+        def payload(load):
+            return salt.payload.dumps(load)
+
+    else:
+
+        def payload(load):
+            # Subscribers get the load back without decoding its strings
+            return salt.utils.data.encode(load)
+
+    counts = [0] * _N_SUBSCRIBERS
+    clients = []
+
+    def on_recv(idx):
+        async def handle(message):
+            if message == payload(_PUBLISH):
+                counts[idx] += 1
+            elif message == payload(_WARMUP) and counts[idx] < 0:
+                counts[idx] = 0
+
+        return handle
+
+    async def start():
+        server = salt.transport.publish_server(master_opts)
+        server.pre_fork(process_manager)
+        await _wait_for_port(master_opts["publish_port"])
+        for idx in range(_N_SUBSCRIBERS):
+            client = salt.transport.publish_client(
+                minion_opts, io_loop, "127.0.0.1", master_opts["publish_port"]
+            )
+            await client.connect()
+            client.on_recv(on_recv(idx))
+            clients.append(client)
+        # Subscriptions complete asynchronously: publish until every client
+        # received something so the measured rounds start fully connected.
+        counts[:] = [-1] * _N_SUBSCRIBERS
+        start = time.monotonic()
+        while min(counts) < 0:
+            assert time.monotonic() - start < 30, "Subscribers never connected"
+            await server.publish(payload(_WARMUP))
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(0.5)
+        return server
+
+    async def stop():
+        for client in clients:
+            client.close()
+        server.close()
+        # Let the background close methods finish
+        await asyncio.sleep(0.3)
+
+    server = io_loop.run_sync(start)
+    try:
+        yield server, payload, counts
+    finally:
+        io_loop.run_sync(stop)
+
+
+def _percentile(samples, percent):
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+def test_req_latency(benchmark, io_loop, req_pair):
+    latencies = []
+
+    async def run():
+        for _ in range(_N_REQUESTS):
+            start = time.perf_counter()
+            await req_pair.send(_REQUEST)
+            latencies.append(time.perf_counter() - start)
+
+    benchmark.pedantic(
+        io_loop.run_sync, args=(run,), rounds=_ROUNDS, warmup_rounds=1, iterations=1
+    )
+    # Leave out the warmup round
+    latencies = sorted(latencies[-_ROUNDS * _N_REQUESTS :])
+    for percent in (50, 90, 99):
+        benchmark.extra_info[f"p{percent}_us"] = round(
+            _percentile(latencies, percent) * 1e6, 1
+        )
+    benchmark.extra_info["mean_us"] = round(statistics.fmean(latencies) * 1e6, 1)
+
+
+def test_req_large(benchmark, io_loop, req_pair):
+    request = dict(_REQUEST, padding=os.urandom(_LARGE_SIZE))
+
+    async def run():
+        for _ in range(_N_LARGE_REQUESTS):
+            await req_pair.send(request)
+
+    benchmark.pedantic(
+        io_loop.run_sync, args=(run,), rounds=_ROUNDS, warmup_rounds=1, iterations=1
+    )
+    benchmark.extra_info["megabytes_per_second"] = round(
+        _N_LARGE_REQUESTS * _LARGE_SIZE / 1e6 / benchmark.stats["mean"], 1
+    )
+
+
+def test_pub_fanout(benchmark, io_loop, pub_pair):
+    server, payload, counts = pub_pair
+    message = payload(_PUBLISH)
+
+    def setup():
+        counts[:] = [0] * _N_SUBSCRIBERS
+
+    async def run():
+        for _ in range(_N_PUBLISHES):
+            await server.publish(message)
+        start = time.monotonic()
+        while min(counts) < _N_PUBLISHES:
+            assert time.monotonic() - start < 60, f"Publishes lost: {counts}"
+            await asyncio.sleep(0.001)
+
+    benchmark.pedantic(
+        lambda: io_loop.run_sync(run), setup=setup, rounds=_ROUNDS, warmup_rounds=1
+    )
+    benchmark.extra_info["messages_per_second"] = round(
+        _N_PUBLISHES * _N_SUBSCRIBERS / benchmark.stats["mean"]
+    )
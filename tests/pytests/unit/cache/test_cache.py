@@ -29,3 +29,15 @@ def test_factory_memcache(opts):
     with patch.dict(opts, {"memcache_expire_seconds": 10}):
         ret = salt.cache.factory(opts)
         assert isinstance(ret, salt.cache.MemCache)
+
+
+def test_list_updated_fallback(opts, tmp_path):
+    opts["cachedir"] = str(tmp_path)
+    cache = salt.cache.factory(opts)
+    cache.store("bank", "key", "data")
+    expected = {"key": cache.updated("bank", "key")}
+    assert cache.list_updated("bank") == expected
+    with patch.dict(cache.modules._dict, {"localfs.list_updated": None}):
+        cache.modules._dict.pop("localfs.list_updated")
+        assert "localfs.list_updated" not in cache.modules
+        assert cache.list_updated("bank") == expected
@@ -3,6 +3,7 @@ Validate the functions in the localfs cache
 """
 
 import errno
+import os
 import shutil
 
 import pytest
@@ -239,6 +240,37 @@ def test_list_success(tmp_cache_file):
     assert localfs.list_(bank="bank", cachedir=str(tmp_cache_file)) == ["key"]
 
 
+def test_list_updated_success(tmp_cache_file):
+    """
+    Tests the return of the list_updated function containing bank entries and
+    their mtime.
+    """
+    (tmp_cache_file / "bank" / "sub").mkdir()
+    assert localfs.list_updated(bank="bank", cachedir=str(tmp_cache_file)) == {
+        "key": localfs.updated(bank="bank", key="key", cachedir=str(tmp_cache_file)),
+        "sub": None,
+    }
+    assert localfs.list_updated(bank="missing", cachedir=str(tmp_cache_file)) == {}
+
+
+def test_bank_updated(tmp_cache_file):
+    """
+    Tests that bank_updated follows the entries written to and removed from
+    the bank.
+    """
+    cachedir = str(tmp_cache_file)
+    os.utime(tmp_cache_file, (1000, 1000))
+    os.utime(tmp_cache_file / "bank", (1000, 1000))
+    assert localfs.bank_updated(bank="bank", cachedir=cachedir) == 1000
+    localfs.store(bank="bank", key="other", data="value", cachedir=cachedir)
+    assert localfs.bank_updated(bank="bank", cachedir=cachedir) > 1000
+    os.utime(tmp_cache_file / "bank", (1000, 1000))
+    localfs.flush(bank="bank", key="other", cachedir=cachedir)
+    assert localfs.bank_updated(bank="bank", cachedir=cachedir) > 1000
+    # Banks created later change the cache directory
+    assert localfs.bank_updated(bank="missing", cachedir=cachedir) == 1000
+
+
 # # 'contains' function tests: 1
 
 
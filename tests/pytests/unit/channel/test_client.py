@@ -3,6 +3,7 @@ import pytest
 import salt.channel.client
 import salt.crypt
 import salt.exceptions
+from tests.support.mock import AsyncMock, MagicMock, patch
 
 
 def test_async_methods():
@@ -79,3 +80,74 @@ async def test_async_pub_channel_decode_payload_drops_undecrypted_payload():
     payload = {"enc": "aes", "load": b"ciphertext"}
 
     assert await channel._decode_payload(payload) is None
+
+
+@pytest.mark.parametrize(
+    "ret,expected",
+    [
+        ({"enc": "clear", "load": {"ret": "try_later", "retry_after": 2.5}}, 2.5),
+        ({"enc": "clear", "load": {"ret": "try_later", "retry_after": 1e9}}, 300),
+        ({"enc": "clear", "load": {"ret": "try_later", "retry_after": "x"}}, 0),
+        ({"enc": "clear", "load": {"ret": False, "cluster_retry": True}}, None),
+        (b"ciphertext", None),
+    ],
+)
+def test_try_later_delay(ret, expected):
+    assert salt.channel.client.try_later_delay(ret) == expected
+
+
+@pytest.mark.asyncio
+async def test_async_req_channel_send_honours_try_later():
+    """
+    A request the master shed with a "try later" reply is retried after the
+    requested backoff instead of failing to decrypt.
+    """
+    replies = [{"enc": "clear", "load": {"ret": "try_later", "retry_after": 0.01}}]
+
+    channel = salt.channel.client.AsyncReqChannel(
+        {"pki_dir": "/tmp"}, MagicMock(ttype="zeromq"), MagicMock(mpub="master.pub")
+    )
+
+    async def _crypted_transfer(load, timeout, raw=False):
+        if replies:
+            raise salt.exceptions.SaltMasterBusyError(
+                "busy",
+                retry_after=salt.channel.client.try_later_delay(replies.pop()),
+            )
+        return {"ret": True}
+
+    channel._crypted_transfer = _crypted_transfer
+    with patch("asyncio.sleep", AsyncMock()) as sleep:
+        assert await channel.send({"cmd": "_return"}) == {"ret": True}
+    sleep.assert_awaited_once_with(0.01)
+
+
+@pytest.mark.parametrize(
+    "master,compressed", [(["zlib"], True), ([], False), (None, False)]
+)
+def test_req_channel_package_load_compression(master, compressed):
+    """
+    Minions advertise the algorithms they accept and only compress their
+    load with one the master advertised.
+    """
+    key = salt.crypt.Crypticle.generate_key_string()
+    opts = {
+        "id": "minion",
+        "pki_dir": "/tmp",
+        "encryption_algorithm": salt.crypt.OAEP_SHA1,
+        "signing_algorithm": salt.crypt.PKCS1v15_SHA1,
+        "transport_compression": ["lzma", "zlib"],
+        "transport_compression_threshold": 0,
+    }
+    auth = MagicMock(
+        creds={"compression": master} if master is not None else {},
+        session_crypticle=salt.crypt.Crypticle(opts, key),
+    )
+    auth.gen_token.return_value = b"token"
+    channel = salt.channel.client.AsyncReqChannel(opts, MagicMock(ttype="zeromq"), auth)
+    ret = channel._package_load({"cmd": "_return", "data": "x" * 1000})
+    assert ret["compression"] == ["lzma", "zlib"]
+    crypticle = salt.crypt.Crypticle({}, key)
+    plain = crypticle.decrypt(ret["load"])[len(crypticle.PICKLE_PAD) :]
+    assert plain.startswith(b"zlib::") is compressed
+    assert crypticle.loads(ret["load"])["data"] == "x" * 1000
@@ -1,3 +1,4 @@
+import asyncio
 import ctypes
 import multiprocessing
 import pathlib
@@ -627,6 +628,36 @@ async def test_handle_message_exceptions(temp_salt_master):
                 assert ret == "Server-side exception handling payload"
 
 
+@pytest.mark.parametrize(
+    "advertised,compressed", [(["lzma", "zlib"], True), (None, False)]
+)
+async def test_handle_message_compresses_reply(
+    auth_master_opts, advertised, compressed
+):
+    """
+    The reply is only compressed when the minion advertised an algorithm the
+    master accepts, so older minions keep receiving plain replies.
+    """
+    auth_master_opts["transport_compression"] = ["zlib"]
+    auth_master_opts["transport_compression_threshold"] = 0
+    auth_master_opts["minimum_auth_version"] = 0
+    req_server = server.ReqServerChannel(auth_master_opts, None)
+    req_server.crypticle = salt.crypt.Crypticle(
+        req_server.opts, salt.crypt.Crypticle.generate_key_string()
+    )
+    req_server.payload_handler = AsyncMock(
+        return_value=({"ret": "x" * 1000}, {"fun": "send"})
+    )
+    payload = {"enc": "aes", "load": {"id": "minion", "cmd": "_return"}}
+    if advertised:
+        payload["compression"] = advertised
+    with patch.object(req_server, "_decode_payload", return_value=payload):
+        ret = await req_server.handle_message({"enc": "aes", "load": b"", "version": 2})
+    plain = req_server.crypticle.decrypt(ret)[len(req_server.crypticle.PICKLE_PAD) :]
+    assert plain.startswith(b"zlib::") is compressed
+    assert req_server.crypticle.loads(ret) == {"ret": "x" * 1000}
+
+
 async def test__auth_cmd_stats_passing(auth_master_opts):
     opts = auth_master_opts.copy()
     opts.update(
@@ -838,3 +869,149 @@ def test_send_aes_key_event_finds_peer_pub_with_bare_name(cluster_master_opts):
         "'Peer key missing' for every configured cluster_peer and is the "
         "root cause of issue #68462."
     )
+
+
+async def test_pool_routing_channel_request_lanes():
+    """
+    PoolRoutingChannel holds requests beyond a lane's max_inflight, and
+    answers requests beyond its max_queue with a "try later" reply.
+    """
+    chan = object.__new__(server.PoolRoutingChannel)
+    chan.opts = {
+        "worker_pools": {"default": {"worker_count": 1, "commands": ["*"]}},
+        "request_lanes": {
+            "auth": {
+                "commands": ["_auth"],
+                "max_inflight": 1,
+                "max_queue": 1,
+                "retry_after": 1,
+            }
+        },
+    }
+    chan.lanes = None
+    release = asyncio.Event()
+    handled = []
+
+    async def handler(name):
+        handled.append(name)
+        await release.wait()
+        return name
+
+    first = asyncio.ensure_future(chan._with_admission("_auth", lambda: handler("a")))
+    second = asyncio.ensure_future(chan._with_admission("_auth", lambda: handler("b")))
+    await asyncio.sleep(0)
+    rejected = await chan._with_admission("_auth", lambda: handler("c"))
+    assert rejected["load"]["ret"] == "try_later"
+
+    # Commands outside the lane are not held back
+    async def unlaned():
+        handled.append("r")
+        return "r"
+
+    assert await chan._with_admission("_return", unlaned) == "r"
+    assert handled == ["a", "r"]
+
+    release.set()
+    assert await first == "a"
+    assert await second == "b"
+    assert handled == ["a", "r", "b"]
+    assert chan.lanes.lanes["auth"].inflight == 0
+
+
+def _pub_server_channel(opts, transport=None):
+    chan = object.__new__(server.PubServerChannel)
+    chan.opts = opts
+    chan.transport = transport or MagicMock(publish=AsyncMock())
+    chan.ckminions = MagicMock()
+    return chan
+
+
+async def test_publish_once_encrypts_a_single_frame():
+    """
+    publish_once() encrypts a load once and hands the same frame to the
+    publish daemon of every transport.
+    """
+    opts = {"sign_pub_messages": False}
+    channels = [_pub_server_channel(dict(opts)) for _ in range(3)]
+    load = {"fun": "test.ping", "tgt": "*", "tgt_type": "glob", "jid": "1"}
+    with patch.object(
+        server.PubServerChannel, "encrypt_payload", return_value=b"frame"
+    ) as encrypt:
+        await server.publish_once(channels, load)
+    encrypt.assert_called_once()
+    for chan in channels:
+        sent = salt.payload.loads(chan.transport.publish.call_args[0][0])
+        assert sent == {server.PUB_FRAME_KEY: "frame", "tgt": "*", "tgt_type": "glob"}
+
+
+async def test_publish_once_tls_channels_build_their_own_frame():
+    channels = [
+        _pub_server_channel({"sign_pub_messages": False}),
+        _pub_server_channel({"sign_pub_messages": False, "disable_aes_with_tls": True}),
+    ]
+    load = {"fun": "test.ping", "tgt": "*", "tgt_type": "glob", "jid": "1"}
+    with patch.object(
+        server.PubServerChannel, "encrypt_payload", return_value=b"frame"
+    ) as encrypt:
+        await server.publish_once(channels, load)
+    encrypt.assert_called_once()
+    sent = salt.payload.loads(channels[1].transport.publish.call_args[0][0])
+    assert server.PUB_FRAME_KEY not in sent
+    assert sent["fun"] == "test.ping"
+
+
+async def test_publish_payload_sends_prebuilt_frame_as_is():
+    transport = MagicMock(publish_payload=AsyncMock(), topic_support=lambda: False)
+    chan = _pub_server_channel({"sign_pub_messages": False}, transport)
+    msg = salt.payload.dumps(
+        {server.PUB_FRAME_KEY: b"frame", "tgt": "*", "tgt_type": "glob"},
+        use_bin_type=True,
+    )
+    with patch.object(server.PubServerChannel, "encrypt_payload") as encrypt:
+        await chan.publish_payload(msg)
+    encrypt.assert_not_called()
+    transport.publish_payload.assert_awaited_once_with(b"frame")
+
+
+async def test_master_pub_server_encrypts_peer_event_once(cluster_master_opts):
+    """
+    An event forwarded to several cluster peers is encrypted once.
+    """
+    channel = server.MasterPubServerChannel.__new__(server.MasterPubServerChannel)
+    channel.opts = cluster_master_opts
+    channel.transport = MagicMock(publish_payload=AsyncMock())
+    channel.pushers = [
+        MagicMock(pull_host=f"peer{i}", publish=AsyncMock()) for i in range(3)
+    ]
+    crypticle = MagicMock()
+    crypticle.dumps.return_value = b"encrypted"
+    load = salt.utils.event.SaltEvent.pack("salt/job/1/ret/m", {"ret": True})
+    with patch.object(server, "_get_crypticle", return_value=crypticle), patch.dict(
+        SMaster.secrets, {"aes": {"secret": MagicMock(value=b"key")}}
+    ):
+        await channel.publish_payload(load)
+    crypticle.dumps.assert_called_once()
+    sent = {pusher.publish.call_args[0][0] for pusher in channel.pushers}
+    assert len(sent) == 1
+
+
+def test_session_crypticle_cached_until_aes_rotation(auth_master_opts):
+    req_server = server.ReqServerChannel(auth_master_opts, None)
+    aes = {
+        "secret": multiprocessing.Array(
+            ctypes.c_char,
+            salt.utils.stringutils.to_bytes(salt.crypt.Crypticle.generate_key_string()),
+        ),
+        "reload": salt.crypt.Crypticle.generate_key_string,
+    }
+    with patch.dict(SMaster.secrets, {"aes": aes}):
+        crypticle = req_server.session_crypticle("minion")
+        assert req_server.session_crypticle("minion") is crypticle
+        assert req_server.crypticles.hits == 1
+        assert crypticle.key_string == req_server.session_key("minion")
+
+        SMaster.rotate_secrets(use_lock=False)
+        rotated = req_server.session_crypticle("minion")
+        assert rotated is not crypticle
+        # The session key itself does not change with the AES key
+        assert rotated.key_string == crypticle.key_string
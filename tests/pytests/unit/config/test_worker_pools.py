@@ -7,6 +7,7 @@ import pytest
 from salt.config.worker_pools import (
     DEFAULT_WORKER_POOLS,
     get_worker_pools_config,
+    validate_request_lanes_config,
     validate_worker_pools_config,
 )
 
@@ -124,3 +125,85 @@ class TestWorkerPoolsConfig:
         """Test validation passes when pools are disabled"""
         opts = {"worker_pools_enabled": False}
         assert validate_worker_pools_config(opts) is True
+
+    def test_validate_worker_pools_config_autoscaling_bounds(self):
+        """Test validation accepts min_workers <= worker_count <= max_workers"""
+        opts = {
+            "worker_pools_enabled": True,
+            "worker_pools": {
+                "default": {
+                    "worker_count": 4,
+                    "min_workers": 2,
+                    "max_workers": 16,
+                    "p99_latency_target": 0.5,
+                    "commands": ["*"],
+                },
+            },
+        }
+        assert validate_worker_pools_config(opts) is True
+
+    @pytest.mark.parametrize(
+        "bounds,match",
+        [
+            ({"min_workers": 0}, "min_workers must be integer >= 1"),
+            ({"max_workers": "8"}, "max_workers must be integer >= 1"),
+            ({"min_workers": 5}, "worker_count must be between min_workers"),
+            ({"max_workers": 3}, "worker_count must be between min_workers"),
+            ({"p99_latency_target": 0}, "p99_latency_target must be a number > 0"),
+        ],
+    )
+    def test_validate_worker_pools_config_invalid_autoscaling(self, bounds, match):
+        """Test validation catches invalid autoscaling settings"""
+        opts = {
+            "worker_pools_enabled": True,
+            "worker_pools": {
+                "default": {"worker_count": 4, "commands": ["*"], **bounds},
+            },
+        }
+        with pytest.raises(ValueError, match=match):
+            validate_worker_pools_config(opts)
+
+
+class TestRequestLanesConfig:
+    """Test request_lanes validation"""
+
+    def test_validate_request_lanes_config_unset(self):
+        assert validate_request_lanes_config({}) is True
+
+    def test_validate_request_lanes_config_valid(self):
+        opts = {
+            "request_lanes": {
+                "auth": {
+                    "commands": ["_auth"],
+                    "max_inflight": 4,
+                    "max_queue": 100,
+                    "retry_after": 5,
+                },
+                "pillar": {"commands": ["_pillar"], "max_inflight": 8},
+            }
+        }
+        assert validate_request_lanes_config(opts) is True
+
+    @pytest.mark.parametrize(
+        "lane,match",
+        [
+            ({"commands": []}, "commands must be a non-empty list"),
+            ({"commands": ["*"]}, "command '\\*' must be a command name"),
+            ({"commands": ["_auth"], "max_inflight": 0}, "max_inflight must be"),
+            ({"commands": ["_auth"], "max_queue": -1}, "max_queue must be"),
+            ({"commands": ["_auth"], "retry_after": 0}, "retry_after must be"),
+        ],
+    )
+    def test_validate_request_lanes_config_invalid(self, lane, match):
+        with pytest.raises(ValueError, match=match):
+            validate_request_lanes_config({"request_lanes": {"auth": lane}})
+
+    def test_validate_request_lanes_config_duplicate_command(self):
+        opts = {
+            "request_lanes": {
+                "a": {"commands": ["_auth"]},
+                "b": {"commands": ["_auth"]},
+            }
+        }
+        with pytest.raises(ValueError, match="mapped to multiple lanes"):
+            validate_request_lanes_config(opts)
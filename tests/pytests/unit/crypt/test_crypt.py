@@ -6,6 +6,7 @@ Unit tests for salt's crypt module
 """
 
 import os.path
+import pickle
 import uuid
 
 import pytest
@@ -14,10 +15,11 @@ import salt.cache
 import salt.crypt
 import salt.master
 import salt.payload
+import salt.exceptions
 import salt.utils.files
 from tests.conftest import FIPS_TESTRUN
 from tests.support.helpers import dedent
-from tests.support.mock import ANY, MagicMock, call
+from tests.support.mock import ANY, MagicMock, call, patch
 
 from . import PRIV_KEY, PRIV_KEY2, PUB_KEY, PUB_KEY2
 
@@ -74,6 +76,29 @@ def test_cryptical_dumps_invalid_nonce():
         assert master_crypt.loads(ret, nonce="abcde")
 
 
+def test_cryptical_dumps_compressed():
+    nonce = uuid.uuid4().hex
+    key = salt.crypt.Crypticle.generate_key_string()
+    master_crypt = salt.crypt.Crypticle({"transport_compression_threshold": 0}, key)
+    data = {"foo": "bar" * 100}
+    ret = master_crypt.dumps(data, nonce=nonce, compression="zlib")
+
+    une = master_crypt.decrypt(ret)
+    assert une[len(master_crypt.PICKLE_PAD) + len(nonce) :].startswith(b"zlib::")
+    # A peer that does not compress itself still reads compressed payloads
+    assert salt.crypt.Crypticle({}, key).loads(ret, nonce=nonce) == data
+
+
+def test_cryptical_dumps_compression_threshold():
+    master_crypt = salt.crypt.Crypticle({}, salt.crypt.Crypticle.generate_key_string())
+    data = {"foo": "bar" * 100}
+    ret = master_crypt.dumps(data, compression="zlib")
+
+    une = master_crypt.decrypt(ret)
+    assert salt.payload.loads(une[len(master_crypt.PICKLE_PAD) :]) == data
+    assert master_crypt.loads(ret) == data
+
+
 @pytest.mark.skipif(FIPS_TESTRUN, reason="Legacy key can not be loaded in FIPS mode")
 def test_verify_signature(tmp_path):
     tmp_path.joinpath("foo.pem").write_text(PRIV_KEY.strip())
@@ -234,3 +259,105 @@ def test_pwdata_decrypt():
         b"\x07\xa5\xa1\x058\xc7\xce\xbeb\x92\xbf\x0bL\xec\xdf\xc3M\x83\xfb$\xec\xd5\xf9"
     )
     assert salt.crypt.pwdata_decrypt(key_string, pwdata) == "1234"
+
+
+def test_handle_signin_response_try_later(tmp_path):
+    """
+    A "try later" reply from a master shedding auth load makes the minion
+    retry after the master's backoff hint.
+    """
+    auth = object.__new__(salt.crypt.AsyncAuth)
+    auth.opts = {"pki_dir": str(tmp_path), "master_uri": "tcp://127.0.0.1:4506"}
+    auth.mpub = "minion_master.pub"
+    payload = {"enc": "clear", "load": {"ret": "try_later", "retry_after": 7.5}}
+    assert auth.handle_signin_response({}, payload) == "try later"
+    assert auth.retry_after == 7.5
+
+
+def test_sauth_authenticate_try_later_honours_auth_retries(tmp_path):
+    """
+    SAuth gives up after auth_retries "try later" replies, like AsyncAuth.
+    """
+    auth = object.__new__(salt.crypt.SAuth)
+    auth.opts = {
+        "acceptance_wait_time": 0,
+        "acceptance_wait_time_max": 0,
+        "auth_retries": 3,
+    }
+    auth.retry_after = 0
+    with patch("salt.channel.client.ReqChannel.factory", MagicMock()), patch.object(
+        auth, "sign_in", return_value="try later"
+    ) as sign_in, patch("time.sleep"):
+        with pytest.raises(salt.exceptions.SaltClientError):
+            auth.authenticate()
+    assert sign_in.call_count == 3
+
+
+def test_public_key_cache_from_str_reuses_parsed_key():
+    cache = salt.crypt.PublicKeyCache(size=1)
+    key = cache.from_str(PUB_KEY)
+    assert isinstance(key, salt.crypt.PublicKey)
+    assert cache.from_str(PUB_KEY) is key
+    # The least recently used key is evicted
+    other = cache.from_str(PUB_KEY2)
+    assert len(cache) == 1
+    assert cache.from_str(PUB_KEY2) is other
+    assert cache.from_str(PUB_KEY) is not key
+
+
+def test_public_key_cache_from_file_reloads_changed_key(tmp_path):
+    key_path = tmp_path / "minion.pub"
+    key_path.write_text(PUB_KEY)
+    cache = salt.crypt.PublicKeyCache()
+    key = cache.from_file(str(key_path))
+    assert cache.from_file(str(key_path)) is key
+
+    key_path.write_text(PUB_KEY2)
+    stat = key_path.stat()
+    os.utime(key_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = cache.from_file(str(key_path))
+    assert reloaded is not key
+    assert reloaded.key.public_numbers() == (
+        salt.crypt.PublicKey.from_str(PUB_KEY2).key.public_numbers()
+    )
+
+    key_path.unlink()
+    with pytest.raises(OSError):
+        cache.from_file(str(key_path))
+
+
+def test_public_key_cache_disabled():
+    cache = salt.crypt.PublicKeyCache(size=0)
+    assert cache.from_str(PUB_KEY) is not cache.from_str(PUB_KEY)
+    assert len(cache) == 0
+
+
+def test_crypticle_cache_reuses_crypticle():
+    cache = salt.crypt.CrypticleCache({}, size=1)
+    key = salt.crypt.Crypticle.generate_key_string()
+    crypticle = cache.get(key)
+    assert isinstance(crypticle, salt.crypt.Crypticle)
+    assert cache.get(key) is crypticle
+    assert (cache.hits, cache.misses) == (1, 1)
+    # The serial is part of the cache key
+    assert cache.get(key, serial=1) is not crypticle
+    # The least recently used crypticle is evicted
+    assert len(cache) == 1
+    assert cache.get(key) is not crypticle
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_crypticle_cache_disabled():
+    cache = salt.crypt.CrypticleCache({}, size=0)
+    key = salt.crypt.Crypticle.generate_key_string()
+    assert cache.get(key) is not cache.get(key)
+    assert len(cache) == 0
+
+
+def test_crypticle_pickle():
+    crypticle = salt.crypt.Crypticle({}, salt.crypt.Crypticle.generate_key_string())
+    unpickled = pickle.loads(pickle.dumps(crypticle))
+    assert unpickled.loads(crypticle.dumps({"foo": "bar"})) == {"foo": "bar"}
+    with pytest.raises(salt.crypt.AuthenticationError):
+        data = crypticle.encrypt(b"foo")
+        unpickled.decrypt(data[:-1] + bytes([data[-1] ^ 1]))
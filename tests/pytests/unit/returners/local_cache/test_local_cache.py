@@ -519,3 +519,28 @@ def test_returner_duplicate_differing_payload_logs_warning(tmp_cache_dir, caplog
             "differing duplicate return must log at WARNING; "
             f"got: {[(r.levelname, r.message) for r in caplog.records]}"
         )
+
+
+def test_returner_batch_writes_every_return(tmp_cache_dir):
+    """
+    ``returner_batch`` stores the same per-minion files as ``returner``
+    and skips jids that were prepped with ``nocache``.
+    """
+    jid = "20160603132323715303"
+    nocache_jid = "20160603132323715304"
+    loads = [
+        {"jid": jid, "id": f"minion-{idx}", "return": idx, "retcode": 0}
+        for idx in range(3)
+    ]
+    loads.append({"jid": nocache_jid, "id": "minion-0", "return": True})
+    with patch.dict(
+        local_cache.__opts__, {"cachedir": str(tmp_cache_dir), "hash_type": "sha256"}
+    ):
+        local_cache.prep_jid(passed_jid=jid)
+        local_cache.prep_jid(passed_jid=nocache_jid, nocache=True)
+        local_cache.returner_batch(loads)
+        ret = local_cache.get_jid(jid)
+        assert ret == {
+            f"minion-{idx}": {"return": idx, "retcode": 0} for idx in range(3)
+        }
+        assert local_cache.get_jid(nocache_jid) == {}
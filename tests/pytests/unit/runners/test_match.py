@@ -0,0 +1,47 @@
+"""
+unit tests for the match runner
+"""
+
+import pytest
+
+import salt.config
+import salt.runners.match as match
+from salt.exceptions import SaltInvocationError
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def configure_loader_modules(tmp_path):
+    master_config = salt.config.master_config(None)
+    master_config.update(
+        {
+            "cachedir": str(tmp_path / "cache"),
+            "pki_dir": str(tmp_path / "pki"),
+            "minion_data_cache": True,
+            "keys.cache_driver": "localfs_key",
+            "__role": "master",
+        }
+    )
+    return {match: {"__opts__": master_config}}
+
+
+def test_explain_compound():
+    ret = match.explain_compound("G@os:Ubuntu and L@web1,web2")
+    assert [term["term"] for term in ret["plan"]["and"]] == [
+        "L@web1,web2",
+        "G@os:Ubuntu",
+    ]
+
+
+def test_explain_compound_analyze():
+    with patch(
+        "salt.utils.minions.CkMinions._pki_minions", return_value={"web1", "db1"}
+    ):
+        ret = match.explain_compound("E@^web or not E@^db", analyze=True)
+    assert ret["minions"] == ["web1"]
+    assert ret["plan"]["matched"] == 1
+
+
+def test_explain_compound_invalid():
+    with pytest.raises(SaltInvocationError):
+        match.explain_compound("web1 and")
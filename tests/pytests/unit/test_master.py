@@ -1,5 +1,7 @@
 # pylint: skip-file
+import asyncio
 import collections
+import concurrent.futures
 import os
 import pathlib
 import stat
@@ -15,10 +17,12 @@ import salt.exceptions
 import salt.master
 import salt.serializers.msgpack
 import salt.utils.cache
+import salt.utils.crypto_pool
 import salt.utils.files
 import salt.utils.platform
 import salt.utils.stringutils
-from tests.support.mock import MagicMock, patch
+import salt.utils.worker_pools
+from tests.support.mock import AsyncMock, MagicMock, patch
 from tests.support.runtests import RUNTIME_VARS
 
 try:
@@ -1374,6 +1378,45 @@ def test_return_signature_verifies_after_channel_packaging(tmp_path, caplog):
     assert store_job.called
 
 
+def test_return_uses_return_batcher_when_enabled():
+    """
+    With ``return_batch_size`` set, ``_return`` hands the load to the
+    worker's ReturnBatcher instead of storing it inline.
+    """
+    aes_funcs = salt.master.AESFuncs.__new__(salt.master.AESFuncs)
+    aes_funcs.opts = {"require_minion_sign_messages": False}
+    aes_funcs.return_batcher = MagicMock(enabled=True)
+    load = {"id": "minion", "jid": "20260527000000000000", "return": True}
+    with patch("salt.utils.job.store_job") as store_job:
+        aes_funcs._return(load)
+    aes_funcs.return_batcher.add.assert_called_once_with(load)
+    store_job.assert_not_called()
+
+
+def test_handle_minion_event_merges_minions_per_jid():
+    """
+    Minion lists forwarded for the same jid are stored with one
+    save_minions call.
+    """
+    aes_funcs = salt.master.AESFuncs.__new__(salt.master.AESFuncs)
+    aes_funcs.opts = {}
+    aes_funcs.mminion = MagicMock()
+    load = {
+        "id": "syndic",
+        "events": [
+            {"data": {"jid": "20260527000000000000", "minions": ["a", "b"]}},
+            {"data": {"jid": "20260527000000000000", "minions": ["c"]}},
+            {"data": {"jid": "20260527000000000001", "minions": ["d"]}},
+        ],
+    }
+    with patch("salt.utils.job.store_minions") as store_minions:
+        aes_funcs._handle_minion_event(load)
+    assert [call.args[1:3] for call in store_minions.call_args_list] == [
+        ("20260527000000000000", ["a", "b", "c"]),
+        ("20260527000000000001", ["d"]),
+    ]
+
+
 def _git_pillar_base_config(tmp_path):
     return {
         "__role": "master",
@@ -1804,6 +1847,78 @@ async def test_collect__auth_to_master_stats():
         handle_clear_mock.assert_not_called()
 
 
+def test_post_stats_reports_target_cache():
+    opts = {"master_stats": True, "master_stats_event_iter": 10}
+    mworker = salt.master.MWorker(opts, {}, {}, [MagicMock()])
+    mworker.clear_funcs = MagicMock()
+    mworker.clear_funcs.ckminions.target_cache.stats.return_value = {"hits": 1}
+    mworker.aes_funcs = MagicMock()
+    mworker.aes_funcs.ckminions.target_cache.stats.return_value = {"hits": 2}
+    mworker.stat_clock = time.time() - 20
+    mworker.stats["publish"]["runs"] += 1
+    mworker._post_stats(time.time(), "publish")
+    data = mworker.aes_funcs.event.fire_event.call_args[0][0]
+    assert data["target_cache"] == {"clear": {"hits": 1}, "aes": {"hits": 2}}
+
+
+async def test_handle_payload_records_pool_stats():
+    """
+    Payloads handled by a pooled MWorker are recorded in its pool's stats,
+    which drive worker pool autoscaling.
+    """
+    opts = {"master_stats": False}
+    pool_stats = salt.utils.worker_pools.PoolStats(1)
+    mworker = salt.master.MWorker(
+        opts, {}, {}, [MagicMock()], pool_name="default", pool_stats=pool_stats
+    )
+    await mworker._handle_payload({"cmd": "_auth"})
+    snapshot = pool_stats.snapshot()
+    assert snapshot["inflight"] == 0
+    assert snapshot["handled"] == 1
+
+
+async def test_retired_mworker_drains_and_flushes():
+    """
+    A pooled MWorker whose slot is retired drains its channels and flushes
+    its buffered returns before stopping its loop.
+    """
+    pool_stats = salt.utils.worker_pools.PoolStats(2)
+    channel = MagicMock(drain=AsyncMock())
+    mworker = salt.master.MWorker(
+        {}, {}, {}, [channel], pool_name="default", pool_index=1, pool_stats=pool_stats
+    )
+    mworker.aes_funcs = MagicMock()
+    mworker.io_loop = MagicMock()
+    pool_stats.retire(1)
+    await mworker._watch_retirement()
+    channel.drain.assert_awaited_once()
+    mworker.aes_funcs.destroy.assert_called_once()
+    mworker.io_loop.stop.assert_called_once()
+
+
+async def test_remove_pool_worker_releases_without_blocking():
+    """
+    Removing a pooled worker retires its slot and reaps the process in the
+    background instead of terminating it on the spot.
+    """
+    pool_stats = {"default": salt.utils.worker_pools.PoolStats(2)}
+    server = salt.master.RequestServer(
+        {"worker_pools_drain_timeout": 5}, {}, {}, pool_stats=pool_stats
+    )
+    process = MagicMock()
+    server.process_manager = MagicMock(
+        release_process=MagicMock(return_value=process), reap_process=AsyncMock()
+    )
+    server._remove_pool_worker("default", 1)
+    assert pool_stats["default"].generation(1) == 1
+    server.process_manager.release_process.assert_called_once_with("MWorker-default-1")
+    process.terminate.assert_not_called()
+    await asyncio.sleep(0)
+    server.process_manager.reap_process.assert_awaited_once_with(process, grace=5)
+    await asyncio.sleep(0)
+    assert server._reapers == {}
+
+
 # ---------------------------------------------------------------------------
 # AuthFuncs
 # ---------------------------------------------------------------------------
@@ -1972,6 +2087,80 @@ def test_auth_funcs_pending_when_new_minion(auth_funcs):
     )
 
 
+@pytest.fixture
+def accepted_auth(auth_funcs):
+    """
+    Set ``auth_funcs`` up to accept the returned ``_auth`` load.
+    """
+    _, pub = salt.crypt.gen_keys(2048)
+    pub = salt.utils.stringutils.to_str(pub).strip()
+    auth_funcs.opts["max_minions"] = 0
+    auth_funcs.opts["auth_events"] = False
+    auth_funcs.opts["open_mode"] = False
+    auth_funcs.opts["master_sign_pubkey"] = False
+    auth_funcs.auto_key = MagicMock()
+    auth_funcs.auto_key.check_autoreject.return_value = False
+    auth_funcs.auto_key.check_autosign.return_value = False
+    auth_funcs.cache = MagicMock()
+    auth_funcs.cache.fetch.side_effect = lambda bucket, key: (
+        {"pub": pub, "state": "accepted"} if bucket == "keys" else None
+    )
+    return {
+        "id": "accepted-minion",
+        "pub": pub,
+        "nonce": "n",
+        "enc_algo": salt.crypt.OAEP_SHA1,
+        "sig_algo": salt.crypt.PKCS1v15_SHA1,
+    }
+
+
+async def test_auth_funcs_accepted_minion_uses_crypto_pool(auth_funcs, accepted_auth):
+    """
+    The RSA work for an accepted minion is handed to the crypto pool.
+    """
+    reply = {"enc": "pub", "aes": b"encrypted"}
+    auth_funcs.crypto_pool = MagicMock(
+        full=False, auth_reply=AsyncMock(return_value=(reply, True))
+    )
+    ret = await auth_funcs._auth_async(accepted_auth, sign_messages=False, version=3)
+    assert ret is reply
+    job = auth_funcs.crypto_pool.auth_reply.call_args[0][0]
+    assert isinstance(job, salt.utils.crypto_pool.AuthJob)
+    assert job["id"] == "accepted-minion"
+    assert job["pub"] == accepted_auth["pub"]
+    assert job["session"] == auth_funcs.session_key("accepted-minion")
+
+
+async def test_auth_funcs_full_crypto_pool_asks_to_try_later(auth_funcs, accepted_auth):
+    auth_funcs.crypto_pool = salt.utils.crypto_pool.AuthCryptoPool(
+        {"auth_crypto_workers": 1, "auth_crypto_queue_size": 0}
+    )
+    ret = await auth_funcs._auth_async(accepted_auth, sign_messages=False, version=3)
+    assert ret["load"]["ret"] == "try_later"
+    assert ret["load"]["retry_after"] > 0
+
+
+async def test_auth_funcs_broken_crypto_pool_authenticates_inline(
+    auth_funcs, accepted_auth
+):
+    auth_funcs.crypto_pool = MagicMock(
+        full=False,
+        auth_reply=AsyncMock(side_effect=concurrent.futures.BrokenExecutor()),
+    )
+    ret = await auth_funcs._auth_async(accepted_auth, sign_messages=False, version=3)
+    assert ret["enc"] == "pub"
+    assert "aes" in ret and "session" in ret
+
+
+def test_auth_funcs_rejects_corrupt_accepted_key(auth_funcs, accepted_auth):
+    auth_funcs.cache.fetch.side_effect = lambda bucket, key: (
+        {"pub": "corrupt", "state": "accepted"} if bucket == "keys" else None
+    )
+    accepted_auth["pub"] = "corrupt"
+    ret = auth_funcs._auth(accepted_auth, sign_messages=False, version=3)
+    assert ret == {"enc": "clear", "load": {"ret": False}}
+
+
 def test_register_resources_concurrent_workers_no_data_loss(master_opts, tmp_path):
     """
     Two simulated master workers concurrently registering different
@@ -4,7 +4,7 @@ Unit tests for RequestRouter class
 
 import pytest
 
-from salt.master import RequestRouter
+from salt.master import RequestLane, RequestRouter
 
 
 class TestRequestRouter:
@@ -129,3 +129,101 @@ class TestRequestRouter:
         }
         with pytest.raises(ValueError, match="exactly one pool with catchall"):
             RequestRouter(opts)
+
+
+class TestRequestRouterLanes:
+    """Test RequestRouter admission control with request_lanes"""
+
+    @pytest.fixture
+    def router(self):
+        opts = {
+            "worker_pools": {"default": {"worker_count": 2, "commands": ["*"]}},
+            "request_lanes": {
+                "auth": {
+                    "commands": ["_auth"],
+                    "max_inflight": 2,
+                    "max_queue": 1,
+                    "retry_after": 4,
+                },
+            },
+            "request_lanes_timeout": 60,
+        }
+        return RequestRouter(opts)
+
+    def test_commands_outside_lanes_are_always_admitted(self, router):
+        for ident in range(10):
+            assert router.admit("_return", ident, None) is True
+        assert router.inflight == {}
+
+    def test_lane_admits_queues_then_rejects(self, router):
+        assert router.admit("_auth", "a", "req-a") is True
+        assert router.admit("_auth", "b", "req-b") is True
+        assert router.admit("_auth", "c", "req-c") is False
+        assert router.admit("_auth", "d", "req-d") is None
+        lane = router.lanes["auth"]
+        assert lane.inflight == 2
+        assert len(lane.queue) == 1
+        assert lane.rejected == 1
+
+    def test_complete_dispatches_queued_request(self, router):
+        router.admit("_auth", "a", "req-a")
+        router.admit("_auth", "b", "req-b")
+        router.admit("_auth", "c", "req-c")
+        assert router.complete("a") == ["req-c"]
+        assert router.lanes["auth"].inflight == 2
+        assert "c" in router.inflight
+        assert router.complete("b") == []
+        assert router.complete("c") == []
+        assert router.lanes["auth"].inflight == 0
+        # Unknown idents (commands outside lanes) are ignored
+        assert router.complete("x") == []
+
+    def test_reused_ident_releases_its_other_lane(self, router):
+        router.lanes["pillar"] = RequestLane(
+            "pillar", {"commands": ["_pillar"], "max_inflight": 1}
+        )
+        router.cmd_to_lane["_pillar"] = router.lanes["pillar"]
+        router.admit("_auth", "a", "req-a")
+        router.admit("_auth", "b", "req-b")
+        router.admit("_auth", "c", "req-c")
+        # "a" gave up on its _auth request and now asks for its pillar
+        assert router.admit("_pillar", "a", "req-pa") is True
+        assert router.pop_released() == ["req-c"]
+        assert router.pop_released() == []
+        assert router.lanes["auth"].inflight == 2
+        assert router.lanes["pillar"].inflight == 1
+
+    def test_non_enforcing_router_has_no_lanes(self):
+        opts = {
+            "worker_pools": {"default": {"worker_count": 2, "commands": ["*"]}},
+            "request_lanes": {"auth": {"commands": ["_auth"], "max_inflight": 1}},
+        }
+        router = RequestRouter(opts, lanes=False)
+        assert router.lanes == {}
+        assert router.admit("_auth", "a", None) is True
+        assert router.admit("_auth", "b", None) is True
+
+    def test_expire_frees_unanswered_slots(self, router):
+        router.admit("_auth", "a", "req-a")
+        router.admit("_auth", "b", "req-b")
+        router.admit("_auth", "c", "req-c")
+        now = router.inflight["a"][1]
+        assert router.expire(now + 30) == []
+        # The inflight requests time out; the queued one is dispatched
+        # (queued at the same time, but still within the timeout below)
+        router.lanes["auth"].queue[0] = ("c", "req-c", now + 10)
+        assert router.expire(now + 61) == ["req-c"]
+        assert router.lanes["auth"].inflight == 1
+        # Stale queued requests are dropped rather than dispatched
+        router.admit("_auth", "d", "req-d")
+        router.admit("_auth", "e", "req-e")
+        assert len(router.lanes["auth"].queue) == 1
+        assert router.expire(router.lanes["auth"].queue[0][2] + 61) == []
+        assert not router.lanes["auth"].queue
+        assert router.lanes["auth"].inflight == 0
+
+    def test_try_later_reply_has_jittered_hint(self, router):
+        reply = router.try_later("_auth")
+        assert reply["enc"] == "clear"
+        assert reply["load"]["ret"] == "try_later"
+        assert 4 <= reply["load"]["retry_after"] <= 6
@@ -644,11 +644,12 @@ async def test_pub_server__stream_read(master_opts, io_loop):
         def __init__(self, messages):
             self.messages = messages
 
-        def read_bytes(self, *args, **kwargs):
+        def read_into(self, buf, partial=False):
             if self.messages:
                 msg = self.messages.pop(0)
+                buf[: len(msg)] = msg
                 future = tornado.concurrent.Future()
-                future.set_result(msg)
+                future.set_result(len(msg))
                 return future
             raise tornado.iostream.StreamClosedError()
 
@@ -663,7 +664,7 @@ async def test_pub_server__stream_read(master_opts, io_loop):
 async def test_pub_server__stream_read_exception(master_opts, io_loop):
     client = MagicMock()
     client.stream = MagicMock()
-    client.stream.read_bytes = MagicMock(
+    client.stream.read_into = MagicMock(
         side_effect=[
             Exception("Something went wrong"),
             tornado.iostream.StreamClosedError(),
@@ -691,11 +692,12 @@ async def test_salt_message_server(master_opts):
         def __init__(self, messages):
             self.messages = messages
 
-        def read_bytes(self, *args, **kwargs):
+        def read_into(self, buf, partial=False):
             if self.messages:
                 msg = self.messages.pop(0)
+                buf[: len(msg)] = msg
                 future = tornado.concurrent.Future()
-                future.set_result(msg)
+                future.set_result(len(msg))
                 return future
             raise tornado.iostream.StreamClosedError()
 
@@ -738,11 +740,12 @@ async def test_salt_message_server_recreates_unpacker_on_disconnect(monkeypatch)
         def __init__(self, reads):
             self.reads = reads
 
-        def read_bytes(self, *args, **kwargs):
+        def read_into(self, buf, partial=False):
             if self.reads:
                 self.reads -= 1
+                buf[:1] = b"x"
                 future = tornado.concurrent.Future()
-                future.set_result(b"x")
+                future.set_result(1)
                 return future
             raise tornado.iostream.StreamClosedError()
 
@@ -805,11 +808,12 @@ async def test_salt_message_server_resets_unpacker_on_general_exception(monkeypa
             self.calls = 0
             self.closed = False
 
-        def read_bytes(self, *args, **kwargs):
+        def read_into(self, buf, partial=False):
             self.calls += 1
             if self.calls == 1:
+                buf[: len(chunk)] = chunk
                 future = tornado.concurrent.Future()
-                future.set_result(chunk)
+                future.set_result(len(chunk))
                 return future
             raise RuntimeError("boom")
 
@@ -874,7 +878,7 @@ async def test_salt_message_server_exception(master_opts, io_loop):
         received.append(body)
 
     stream = MagicMock()
-    stream.read_bytes = MagicMock(
+    stream.read_into = MagicMock(
         side_effect=[
             Exception("Something went wrong"),
         ]
@@ -889,8 +893,15 @@ async def test_salt_message_server_exception(master_opts, io_loop):
 async def test_message_client_stream_return_exception(minion_opts, io_loop):
     msg = {"foo": "bar"}
     payload = salt.transport.frame.frame_msg(msg)
-    future = tornado.concurrent.Future()
-    future.set_result(payload)
+    reads = [payload]
+
+    def read_into(buf, partial=False):
+        msg = reads.pop(0)
+        buf[: len(msg)] = msg
+        future = tornado.concurrent.Future()
+        future.set_result(len(msg))
+        return future
+
     client = salt.transport.tcp.MessageClient(
         minion_opts,
         "127.0.0.1",
@@ -899,9 +910,7 @@ async def test_message_client_stream_return_exception(minion_opts, io_loop):
         disconnect_callback=MagicMock(),
     )
     client._stream = MagicMock()
-    client._stream.read_bytes.side_effect = [
-        future,
-    ]
+    client._stream.read_into.side_effect = read_into
     try:
         io_loop.add_callback(client._stream_return)
         await asyncio.sleep(0.01)
@@ -928,11 +937,87 @@ async def test_pub_server_publish_payload(master_opts, io_loop):
     client.stream = MagicMock()
     client.stream.write.side_effect = [future]
     client.id_ = "meh"
+    client.indexed_id = None
     server.clients = [client]
+    server._index_client(client)
     await server.publish_payload(package, topic_list)
     client.stream.write.assert_called_once()
 
 
+async def test_pub_server_publish_payload_skips_other_targets(master_opts, io_loop):
+    server = salt.transport.tcp.PubServer(master_opts, io_loop=io_loop)
+    future = tornado.concurrent.Future()
+    future.set_result(None)
+    clients = {}
+    for id_ in ("meh", "other", None):
+        client = MagicMock()
+        client.stream.write.return_value = future
+        client.id_ = id_
+        client.indexed_id = None
+        server.clients.add(client)
+        server._index_client(client)
+        clients[id_] = client
+    assert set(server.subscribers) == {"meh", "other"}
+    await server.publish_payload({"foo": "bar"}, ["meh", "missing"])
+    clients["meh"].stream.write.assert_called_once()
+    clients["other"].stream.write.assert_not_called()
+    clients[None].stream.write.assert_not_called()
+
+
+async def test_pub_server_publish_payload_tag_prefixes(master_opts, io_loop):
+    server = salt.transport.tcp.PubServer(master_opts, io_loop=io_loop)
+    future = tornado.concurrent.Future()
+    future.set_result(None)
+    clients = {}
+    for prefixes in (None, ["salt/job/"], ["salt/auth", "salt/key"]):
+        client = salt.transport.tcp.Subscriber(MagicMock(), ("127.0.0.1", 1234))
+        client.stream.write.return_value = future
+        server.clients.add(client)
+        server._set_tag_prefixes(client, prefixes)
+        clients[str(prefixes)] = client
+    assert len(server.tag_filtered) == 2
+
+    def sent():
+        ret = {key for key, client in clients.items() if client.stream.write.call_count}
+        for client in clients.values():
+            client.stream.write.reset_mock()
+        return ret
+
+    await server.publish_payload(b"salt/job/123/ret/meh\n\n\x80")
+    assert sent() == {"None", "['salt/job/']"}
+    await server.publish_payload(b"salt/auth\n\n\x80")
+    assert sent() == {"None", "['salt/auth', 'salt/key']"}
+    await server.publish_payload(b"custom\n\n\x80")
+    assert sent() == {"None"}
+    # Messages which are not events go to every client
+    await server.publish_payload({"foo": "bar"})
+    assert sent() == set(clients)
+
+    # Invalid prefixes leave the client unfiltered
+    server._set_tag_prefixes(clients["['salt/job/']"], "salt/job/")
+    await server.publish_payload(b"custom\n\n\x80")
+    assert sent() == {"None", "['salt/job/']"}
+
+    server._remove_client(clients["['salt/auth', 'salt/key']"])
+    assert not server.tag_filtered
+    assert len(server._tag_trie) == 0
+
+
+def test_pub_server_index_client_reidentify(master_opts, io_loop):
+    server = salt.transport.tcp.PubServer(master_opts, io_loop=io_loop)
+    client = salt.transport.tcp.Subscriber(MagicMock(), ("127.0.0.1", 1234))
+    client.id_ = "meh"
+    server.clients.add(client)
+    server._index_client(client)
+    assert server.subscribers == {"meh": {client}}
+    client.id_ = "other"
+    server._index_client(client)
+    assert server.subscribers == {"other": {client}}
+    server._remove_client(client)
+    assert server.subscribers == {}
+    assert server.clients == set()
+
+
 async def test_pub_server_publish_payload_closed_stream(master_opts, io_loop):
     server = salt.transport.tcp.PubServer(master_opts, io_loop=io_loop)
     package = {"foo": "bar"}
@@ -943,9 +1028,12 @@ async def test_pub_server_publish_payload_closed_stream(master_opts, io_loop):
         tornado.iostream.StreamClosedError("mock"),
     ]
     client.id_ = "meh"
+    client.indexed_id = None
     server.clients = {client}
+    server._index_client(client)
     await server.publish_payload(package, topic_list)
     assert server.clients == set()
+    assert server.subscribers == {}
 
 
 async def test_pub_server_paths_no_perms(master_opts, io_loop):
@@ -1037,3 +1125,47 @@ def test_pub_server_close_clears_clients(master_opts, io_loop):
     assert all(client.closed for client in clients)
     assert server.clients == set()
     assert server._closing is True
+
+
+def test_decoding_unpacker_matches_decode_embedded_strs():
+    msg = {
+        "head": {"mid": "1"},
+        "body": {
+            "ret": [b"\xff\xfe", "text", {"key": b"value", b"\xfe": [b"\x00\xff"]}],
+            "load": b"\x93\xff\x00binary",
+        },
+    }
+    payload = salt.transport.frame.frame_msg(msg)
+    unpacker = salt.transport.frame.decoding_unpacker()
+    unpacker.feed(payload)
+    expected = salt.transport.frame.decode_embedded_strs(
+        salt.utils.msgpack.loads(payload)
+    )
+    assert list(unpacker) == [expected]
+
+
+async def test_frame_reader_reuses_buffer_across_partial_reads():
+    wire = b"".join(
+        salt.transport.frame.frame_msg({"n": i, "data": "x" * 300}) for i in range(3)
+    )
+
+    class Stream:
+        def __init__(self, data):
+            self.data = data
+
+        def read_into(self, buf, partial=False):
+            chunk, self.data = self.data[:100], self.data[100:]
+            buf[: len(chunk)] = chunk
+            future = tornado.concurrent.Future()
+            future.set_result(len(chunk))
+            return future
+
+    stream = Stream(wire)
+    reader = salt.transport.frame.FrameReader(size=100)
+    buffer = reader.buffer
+    received = []
+    while stream.data:
+        received.extend(reader.feed(await reader.read(stream)))
+    assert reader.buffer is buffer
+    assert [msg["body"]["n"] for msg in received] == [0, 1, 2]
+    assert received[0]["body"]["data"] == "x" * 300
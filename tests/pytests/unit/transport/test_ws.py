@@ -0,0 +1,90 @@
+"""
+Unit tests for the websocket transport.
+"""
+
+import pytest
+
+import salt.payload
+import salt.transport.frame
+import salt.transport.ws
+from tests.support.mock import AsyncMock, MagicMock
+
+pytestmark = [
+    pytest.mark.core_test,
+]
+
+
+def _subscriber(server, id_=None):
+    client = salt.transport.ws.Subscriber(MagicMock(), "127.0.0.1")
+    client.ws.send_bytes = AsyncMock()
+    server.clients.add(client)
+    server.anonymous.add(client)
+    if id_ is not None:
+        server._handle_presence(
+            client, salt.transport.frame.frame_msg({"id": id_}, header=None)
+        )
+    return client
+
+
+def _presence_callback(subscriber, msg):
+    subscriber.id_ = msg["id"]
+
+
+async def test_pub_server_publish_payload_topic_list(master_opts):
+    server = salt.transport.ws.PublishServer(master_opts)
+    server.presence_callback = _presence_callback
+    meh = _subscriber(server, "meh")
+    other = _subscriber(server, "other")
+    anonymous = _subscriber(server)
+    assert set(server.subscribers) == {"meh", "other"}
+    assert server.anonymous == {anonymous}
+
+    await server.publish_payload({"foo": "bar"}, ["meh"])
+    meh.ws.send_bytes.assert_called_once()
+    other.ws.send_bytes.assert_not_called()
+    # Unidentified minions still get targeted publishes and filter them
+    anonymous.ws.send_bytes.assert_called_once()
+
+    await server.publish_payload({"foo": "bar"})
+    assert meh.ws.send_bytes.call_count == 2
+    other.ws.send_bytes.assert_called_once()
+    assert anonymous.ws.send_bytes.call_count == 2
+
+
+async def test_pub_server_publish_payload_connection_reset(master_opts):
+    server = salt.transport.ws.PublishServer(master_opts)
+    server.presence_callback = _presence_callback
+    server.remove_presence_callback = MagicMock()
+    client = _subscriber(server, "meh")
+    client.ws.send_bytes.side_effect = ConnectionResetError
+    await server.publish_payload({"foo": "bar"}, ["meh"])
+    assert server.clients == set()
+    assert server.subscribers == {}
+    server.remove_presence_callback.assert_called_once_with(client)
+
+
+def test_pub_server_handle_presence_bad_message(master_opts):
+    server = salt.transport.ws.PublishServer(master_opts)
+    server.presence_callback = _presence_callback
+    client = _subscriber(server)
+    server._handle_presence(client, b"garbage")
+    assert server.subscribers == {}
+    assert server.anonymous == {client}
+
+
+async def test_publish_client_connect_keeps_callbacks(io_loop):
+    client = salt.transport.ws.PublishClient({}, io_loop, host="127.0.0.1", port=1)
+    connect_callback = AsyncMock()
+    disconnect_callback = MagicMock()
+
+    async def getstream(**kwargs):
+        return MagicMock(), MagicMock()
+
+    client.getstream = getstream
+    await client.connect(
+        connect_callback=connect_callback, disconnect_callback=disconnect_callback
+    )
+    assert client.disconnect_callback is disconnect_callback
+    connect_callback.assert_awaited_once_with(True)
+    client._ws = client._session = None
+    client.close()
@@ -2528,3 +2528,58 @@ def test_backoff_timer():
         next_iteration += next_iteration * percent * ourcount
     assert ourcount == 39
     assert backoff() == maximum
+
+
+async def test_request_server_drain_hands_back_queued_requests(io_loop):
+    """
+    A draining RequestServer finishes the request it is handling and answers
+    the requests already queued for it with a "try later" reply.
+    """
+    server = salt.transport.zeromq.RequestServer({})
+    server.w_uri = "ipc://workers.ipc"
+
+    class Socket:
+        closed = False
+
+        def __init__(self):
+            self.queued = [b"first", b"second", b"third"]
+            self.sent = []
+
+        async def poll(self, timeout=None):
+            await asyncio.sleep(0)
+            return [self] if self.queued else []
+
+        async def recv(self):
+            return self.queued.pop(0)
+
+        async def send(self, msg):
+            self.sent.append(salt.payload.loads(msg))
+
+        def setsockopt(self, *args):
+            pass
+
+        def close(self):
+            self.closed = True
+
+    async def handle_message(stream, payload):
+        # The first request is being handled when the drain starts
+        drain_task = asyncio.ensure_future(server.drain())
+        await asyncio.sleep(0)
+        handled.append((payload, drain_task))
+        return {"handled": True}
+
+    handled = []
+    server._socket = Socket()
+    server.handle_message = handle_message
+    task = asyncio.get_running_loop().create_task(server.request_handler())
+    server.tasks.add(task)
+    await task
+    await handled[0][1]
+
+    assert len(handled) == 1
+    assert server._socket.sent[0] == {"handled": True}
+    assert (
+        server._socket.sent[1:]
+        == [{"enc": "clear", "load": {"ret": "try_later", "retry_after": 0}}] * 2
+    )
+    assert server._socket.closed
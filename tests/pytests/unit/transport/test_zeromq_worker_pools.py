@@ -104,8 +104,8 @@ class TestWorkerPoolCodeStructure:
             "RequestRouter" in source
         ), "zmq_device_pooled should create RequestRouter instance"
         assert (
-            "route_request" in source
-        ), "zmq_device_pooled should call route_request method"
+            "classify" in source
+        ), "zmq_device_pooled should call classify method"
 
 
 class TestRequestServerIntegration:
@@ -127,6 +127,57 @@ def test_event_matching_regex(sock_dir):
             _assert_got_event(evt1, {"data": "foo1"})
 
 
+@pytest.mark.slow_test
+def test_event_tag_filter(sock_dir):
+    """Test the publisher only sends the events matching the tag filter"""
+    with eventpublisher_process(str(sock_dir)):
+        with salt.utils.event.MasterEvent(
+            str(sock_dir), listen=True
+        ) as me, salt.utils.event.MasterEvent(str(sock_dir), listen=True) as sender:
+            me.set_tag_filter(["evt2/.*"], "regex")
+            assert me.tag_prefixes == ["evt2/"]
+            # Let the publisher apply the filter
+            time.sleep(1)
+            sender.fire_event({"data": "foo1"}, "evt1/a")
+            sender.fire_event({"data": "foo2"}, "evt2/b")
+            evt = me.get_event(full=True)
+            assert evt["tag"] == "evt2/b"
+            me.set_tag_filter(None)
+            time.sleep(1)
+            sender.fire_event({"data": "foo1"}, "evt1/a")
+            evt = me.get_event(full=True)
+            assert evt["tag"] == "evt1/a"
+
+
+@pytest.mark.parametrize(
+    "tag,match_type,expected",
+    [
+        ("salt/job/", "startswith", "salt/job/"),
+        ("salt/job/*/ret/*", "fnmatch", "salt/job/"),
+        ("salt/[jk]*", "fnmatch", "salt/"),
+        ("salt/job/\\d+/ret", "regex", "salt/job/"),
+        ("^salt/job/.*", "regex", "salt/job/"),
+        ("salt/jobs?/", "regex", "salt/job"),
+        ("salt/job+/", "regex", "salt/job"),
+        ("salt/job|salt/auth", "regex", ""),
+        ("(?i)salt/job", "regex", ""),
+        ("salt/job", "endswith", ""),
+        ("salt/job", "find", ""),
+    ],
+)
+def test_tag_match_prefix(tag, match_type, expected):
+    assert salt.utils.event.tag_match_prefix(tag, match_type) == expected
+
+
+def test_set_tag_filter_prefixes(sock_dir):
+    with salt.utils.event.MasterEvent(str(sock_dir), listen=False) as me:
+        me.set_tag_filter(["salt/job/", "salt/auth", "salt/job/"], "startswith")
+        assert me.tag_prefixes == ["salt/auth", "salt/job/"]
+        # Any tag without a prefix needs every event
+        me.set_tag_filter(["salt/job/", "*/ret"], "fnmatch")
+        assert me.tag_prefixes is None
+
+
 @pytest.mark.slow_test
 def test_event_matching_all(sock_dir):
     """Test an all match"""
@@ -0,0 +1,130 @@
+import fnmatch
+
+import pytest
+
+import salt.utils.compound_plan
+from salt.exceptions import SaltInvocationError
+
+MINIONS = {"web1", "web2", "db1", "db2"}
+GRAINS = {
+    "web1": "ubuntu",
+    "web2": "debian",
+    "db1": "ubuntu",
+    "db2": "centos",
+}
+
+
+def _tokens(expr):
+    tokens = []
+    for word in expr.split():
+        if word in salt.utils.compound_plan.OPERATORS:
+            tokens.append(word)
+        elif word.startswith(("G@", "L@")):
+            tokens.append(salt.utils.compound_plan.Term(word, word[0], word[2:]))
+        else:
+            tokens.append(salt.utils.compound_plan.Term(word))
+    return tokens
+
+
+class Matcher:
+    """
+    Fake target engines over MINIONS recording their calls
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, term, candidates):
+        self.calls.append((term.word, candidates))
+        if term.engine == "L":
+            listed = term.pattern.split(",")
+            missing = [] if term.ignore_missing else sorted(set(listed) - MINIONS)
+            return {"minions": set(listed) & MINIONS, "missing": missing}
+        if term.engine == "G":
+            pool = MINIONS if candidates is None else candidates
+            value = term.pattern.split(":")[1]
+            return {
+                "minions": {m for m in pool if GRAINS[m] == value},
+                "missing": [],
+            }
+        return {"minions": set(fnmatch.filter(MINIONS, term.word)), "missing": []}
+
+
+def _run(expr, analyze=False):
+    plan = salt.utils.compound_plan.compile_plan(_tokens(expr), indexed=True)
+    matcher = Matcher()
+    ctx = salt.utils.compound_plan.Context(matcher, lambda: MINIONS, analyze=analyze)
+    return plan, ctx, matcher, plan.run(ctx, None)
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        ("web*", {"web1", "web2"}),
+        ("web* and G@os:ubuntu", {"web1"}),
+        ("web* or G@os:ubuntu", {"web1", "web2", "db1"}),
+        ("db1 or web* and G@os:debian", {"db1", "web2"}),
+        ("( db1 or web* ) and G@os:debian", {"web2"}),
+        ("not web*", {"db1", "db2"}),
+        ("not web* and G@os:ubuntu", {"db1"}),
+        ("G@os:ubuntu not web*", {"db1"}),
+        ("not ( web1 or db1 )", {"web2", "db2"}),
+        ("G@os:ubuntu and ( web*", {"web1"}),
+        ("L@web1,db2 and not G@os:centos", {"web1"}),
+    ],
+)
+def test_run(expr, expected):
+    assert _run(expr)[3] == expected
+
+
+@pytest.mark.parametrize(
+    "expr",
+    ["", "and web1", "web1 or", "web1 web2", "( and web1 )", "web1 )", "not not web1"],
+)
+def test_compile_invalid(expr):
+    with pytest.raises(SaltInvocationError):
+        salt.utils.compound_plan.compile_plan(_tokens(expr))
+
+
+def test_and_evaluates_cheap_terms_first():
+    plan, _, matcher, ret = _run("G@os:ubuntu and web* and L@web1,web2")
+    assert [child.word for child in plan.children] == [
+        "L@web1,web2",
+        "web*",
+        "G@os:ubuntu",
+    ]
+    assert ret == {"web1"}
+    # The grain term only looks at the minions matched by the other terms
+    assert matcher.calls[-1] == ("G@os:ubuntu", {"web1", "web2"})
+
+
+def test_and_stops_without_candidates():
+    _, ctx, matcher, ret = _run("L@db2 and L@web1 and G@os:ubuntu and L@nope")
+    assert ret == set()
+    assert "G@os:ubuntu" not in [word for word, _ in matcher.calls]
+    # Skipped list terms still report their missing minions
+    assert ctx.missing == ["nope"]
+
+
+def test_not_ignores_missing_of_bare_list():
+    assert _run("web1 and not L@nope")[1].missing == []
+    assert _run("web1 and not ( L@nope )")[1].missing == ["nope"]
+
+
+def test_explain():
+    plan, ctx, _, _ = _run("L@db2 and web* and G@os:ubuntu", analyze=True)
+    explained = plan.explain(ctx.stats)
+    assert explained["matched"] == 0
+    first, second, third = explained["and"]
+    assert first["term"] == "L@db2"
+    assert first["matched"] == 1
+    assert second["candidates"] == 1
+    assert second["matched"] == 0
+    assert third == {
+        "term": "G@os:ubuntu",
+        "narrows": True,
+        "cost": 5,
+        "selectivity": 0.1,
+        "skipped": True,
+    }
+    assert "matched" not in plan.explain()
@@ -0,0 +1,57 @@
+"""
+Unit tests for salt.utils.compression
+"""
+
+import os
+
+import pytest
+
+import salt.payload
+import salt.utils.compression
+
+
+@pytest.fixture
+def data():
+    return salt.payload.dumps({"pillar": {f"key{n}": "value" * 10 for n in range(200)}})
+
+
+@pytest.mark.parametrize("algorithm", ["zlib", "lzma"])
+def test_compress_round_trip(algorithm, data):
+    compressed = salt.utils.compression.compress(data, algorithm)
+    assert compressed.startswith(salt.utils.compression.ALGORITHMS[algorithm][0])
+    assert len(compressed) < len(data)
+    assert salt.utils.compression.decompress(compressed) == data
+
+
+def test_compress_below_threshold(data):
+    assert salt.utils.compression.compress(data, "zlib", len(data) + 1) is data
+
+
+def test_compress_without_algorithm(data):
+    assert salt.utils.compression.compress(data, None) is data
+
+
+def test_compress_keeps_incompressible_data():
+    data = salt.payload.dumps(os.urandom(1024))
+    assert salt.utils.compression.compress(data, "zlib", 0) is data
+
+
+def test_decompress_plain_payload(data):
+    assert salt.utils.compression.decompress(data) is data
+
+
+@pytest.mark.parametrize(
+    "local,peer,expected",
+    [
+        (["lzma", "zlib"], ["zlib", "lzma"], "lzma"),
+        (["zlib"], ["lzma", "zlib"], "zlib"),
+        (["zlib"], ["lzma"], None),
+        (["zlib"], [], None),
+        (["zlib"], None, None),
+        (["zlib"], "zlib", None),
+        ([], ["zlib"], None),
+    ],
+)
+def test_negotiate(local, peer, expected):
+    opts = {"transport_compression": local}
+    assert salt.utils.compression.negotiate(opts, peer) == expected
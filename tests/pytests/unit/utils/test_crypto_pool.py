@@ -0,0 +1,135 @@
+"""
+Unit tests for running the minion auth RSA work in a process pool
+"""
+
+import hashlib
+
+import pytest
+
+import salt.crypt
+import salt.payload
+import salt.utils.crypto_pool
+import salt.utils.stringutils
+from salt.utils.crypto_pool import AuthCryptoPool, AuthJob
+
+
+@pytest.fixture
+def master_key(master_opts):
+    master_opts["master_sign_pubkey"] = False
+    return salt.crypt.MasterKeys(master_opts)
+
+
+@pytest.fixture
+def minion_key():
+    priv, pub = salt.crypt.gen_keys(2048)
+    return salt.crypt.PrivateKey.from_str(priv), salt.utils.stringutils.to_str(pub)
+
+
+@pytest.fixture
+def job(minion_key):
+    return AuthJob(
+        id="minion",
+        pub=minion_key[1],
+        enc_algo=salt.crypt.OAEP_SHA1,
+        sig_algo=salt.crypt.PKCS1v15_SHA1,
+        token=None,
+        auth_mode=1,
+        aes=b"aes-key",
+        master_aes=None,
+        session=b"session-key",
+        publish_port=4505,
+        master_sign_pubkey=False,
+        sign_messages=False,
+        nonce=None,
+    )
+
+
+def _assert_reply_for(reply, minion_key, master_key, aes=b"aes-key"):
+    priv = minion_key[0]
+    assert reply["enc"] == "pub"
+    assert reply["pub_key"] == master_key.get_pub_str()
+    assert priv.decrypt(reply["aes"]) == aes
+    assert priv.decrypt(reply["session"]) == b"session-key"
+    pub = salt.crypt.PublicKey.from_str(master_key.get_pub_str())
+    assert pub.decrypt(reply["sig"]) == salt.utils.stringutils.to_bytes(
+        hashlib.sha256(aes).hexdigest()
+    )
+
+
+def test_auth_reply_encrypts_keys_for_minion(master_key, minion_key, job):
+    reply, accepted = salt.utils.crypto_pool.auth_reply(
+        master_key, salt.crypt.PublicKeyCache(), job
+    )
+    assert accepted is True
+    _assert_reply_for(reply, minion_key, master_key)
+
+
+def test_auth_reply_returns_token_to_minion(master_key, minion_key, job):
+    master_pub = salt.crypt.PublicKey.from_str(master_key.get_pub_str())
+    job["token"] = master_pub.encrypt(b"token")
+    reply, accepted = salt.utils.crypto_pool.auth_reply(
+        master_key, salt.crypt.PublicKeyCache(), job
+    )
+    assert accepted is True
+    assert minion_key[0].decrypt(reply["token"]) == b"token"
+
+
+def test_auth_reply_advertises_compression(master_key, job):
+    reply, _ = salt.utils.crypto_pool.auth_reply(
+        master_key, salt.crypt.PublicKeyCache(), job
+    )
+    assert "compression" not in reply
+    job["compression"] = ["zlib"]
+    reply, _ = salt.utils.crypto_pool.auth_reply(
+        master_key, salt.crypt.PublicKeyCache(), job
+    )
+    assert reply["compression"] == ["zlib"]
+
+
+def test_auth_reply_signs_reply(master_key, job):
+    job["sign_messages"] = True
+    job["nonce"] = "abc"
+    reply, accepted = salt.utils.crypto_pool.auth_reply(
+        master_key, salt.crypt.PublicKeyCache(), job
+    )
+    assert accepted is True
+    assert reply["enc"] == "clear"
+    master_pub = salt.crypt.PublicKey.from_str(master_key.get_pub_str())
+    assert master_pub.verify(reply["load"], reply["sig"], salt.crypt.PKCS1v15_SHA1)
+    assert salt.payload.loads(reply["load"])["nonce"] == "abc"
+
+
+def test_auth_reply_unsupported_enc_algo(master_key, job):
+    job["token"] = b"token"
+    job["enc_algo"] = "OAEP-BOGUS"
+    reply, accepted = salt.utils.crypto_pool.auth_reply(
+        master_key, salt.crypt.PublicKeyCache(), job
+    )
+    assert accepted is False
+    assert reply == {"enc": "clear", "load": {"ret": "bad enc algo"}}
+
+
+def test_pool_full_and_try_later(master_opts):
+    master_opts["auth_crypto_workers"] = 1
+    master_opts["auth_crypto_queue_size"] = 2
+    pool = AuthCryptoPool(master_opts)
+    assert not pool.full
+    pool.pending = 2
+    assert pool.full
+    reply = pool.try_later()
+    assert reply["load"]["ret"] == "try_later"
+    assert 2 <= reply["load"]["retry_after"] <= 3
+
+
+async def test_pool_runs_auth_reply_in_a_process(
+    master_opts, master_key, minion_key, job
+):
+    master_opts["auth_crypto_workers"] = 1
+    pool = AuthCryptoPool(master_opts)
+    try:
+        reply, accepted = await pool.auth_reply(job)
+    finally:
+        pool.close()
+    assert accepted is True
+    assert pool.pending == 0
+    _assert_reply_for(reply, minion_key, master_key)
@@ -0,0 +1,126 @@
+"""
+Unit tests for salt.utils.job
+"""
+
+import asyncio
+
+import pytest
+
+import salt.utils.job
+from tests.support.mock import MagicMock, patch
+
+
+@pytest.fixture
+def opts(tmp_path):
+    return {
+        "pki_dir": str(tmp_path),
+        "job_cache": True,
+        "ext_job_cache": None,
+        "master_job_cache": "foo",
+        "return_batch_size": 3,
+        "return_batch_interval": 0.01,
+        "unique_jid": False,
+    }
+
+
+@pytest.fixture
+def mminion():
+    mminion = MagicMock()
+    mminion.returners = {
+        "foo.prep_jid": MagicMock(),
+        "foo.save_load": MagicMock(),
+        "foo.get_load": MagicMock(return_value={}),
+        "foo.returner": MagicMock(),
+        "foo.returner_batch": MagicMock(),
+    }
+    return mminion
+
+
+def _load(jid, minion_id):
+    return {"jid": jid, "id": minion_id, "return": True, "fun": "test.ping"}
+
+
+def test_store_jobs_prepares_each_jid_once(opts, mminion):
+    loads = [
+        _load("20240101000000000001", "minion-1"),
+        _load("20240101000000000001", "minion-2"),
+        _load("20240101000000000002", "minion-1"),
+    ]
+    event = MagicMock()
+    salt.utils.job.store_jobs(opts, loads, event=event, mminion=mminion)
+
+    assert mminion.returners["foo.prep_jid"].call_count == 2
+    assert mminion.returners["foo.save_load"].call_count == 2
+    mminion.returners["foo.returner_batch"].assert_called_once_with(loads)
+    mminion.returners["foo.returner"].assert_not_called()
+    tags = [call.args[1] for call in event.fire_event.call_args_list]
+    assert tags == [
+        "salt/job/20240101000000000001/ret/minion-1",
+        "salt/job/20240101000000000001/ret/minion-2",
+        "salt/job/20240101000000000002/ret/minion-1",
+    ]
+
+
+def test_store_jobs_falls_back_to_returner(opts, mminion):
+    mminion.returners.pop("foo.returner_batch")
+    loads = [
+        _load("20240101000000000001", "minion-1"),
+        _load("20240101000000000001", "minion-2"),
+    ]
+    salt.utils.job.store_jobs(opts, loads, mminion=mminion)
+    assert mminion.returners["foo.returner"].call_count == 2
+
+
+def test_store_jobs_drops_invalid_returns(opts, mminion):
+    loads = [{"jid": "20240101000000000001", "id": "minion-1"}]
+    assert salt.utils.job.store_jobs(opts, loads, mminion=mminion) is False
+    mminion.returners["foo.prep_jid"].assert_not_called()
+
+
+def test_return_batcher_disabled_stores_immediately(opts, mminion):
+    opts["return_batch_size"] = 0
+    batcher = salt.utils.job.ReturnBatcher(opts, mminion=mminion)
+    assert batcher.enabled is False
+    with patch("salt.utils.job.store_job") as store_job:
+        batcher.add(_load("20240101000000000001", "minion-1"))
+    store_job.assert_called_once()
+    assert batcher.pending == []
+
+
+def test_return_batcher_flushes_on_size(opts, mminion):
+    batcher = salt.utils.job.ReturnBatcher(opts, mminion=mminion)
+
+    async def _add():
+        with patch("salt.utils.job.store_jobs") as store_jobs:
+            for idx in range(3):
+                batcher.add(_load("20240101000000000001", f"minion-{idx}"))
+        return store_jobs
+
+    store_jobs = asyncio.run(_add())
+    store_jobs.assert_called_once()
+    assert len(store_jobs.call_args.args[1]) == 3
+    assert batcher.pending == []
+
+
+def test_return_batcher_flushes_on_interval(opts, mminion):
+    batcher = salt.utils.job.ReturnBatcher(opts, mminion=mminion)
+
+    async def _add():
+        with patch("salt.utils.job.store_jobs") as store_jobs:
+            batcher.add(_load("20240101000000000001", "minion-1"))
+            assert batcher.pending
+            store_jobs.assert_not_called()
+            await asyncio.sleep(opts["return_batch_interval"] * 5)
+        return store_jobs
+
+    store_jobs = asyncio.run(_add())
+    store_jobs.assert_called_once()
+    assert batcher.pending == []
+
+
+def test_return_batcher_without_loop_stores_immediately(opts, mminion):
+    batcher = salt.utils.job.ReturnBatcher(opts, mminion=mminion)
+    with patch("salt.utils.job.store_jobs") as store_jobs:
+        batcher.add(_load("20240101000000000001", "minion-1"))
+    store_jobs.assert_called_once()
+    assert batcher.pending == []
@@ -0,0 +1,227 @@
+import ipaddress
+import time
+
+import pytest
+
+import salt.cache
+import salt.utils.data
+import salt.utils.minion_data_index
+from tests.support.mock import patch
+
+DATA = {
+    "web1": {
+        "os": "Ubuntu",
+        "osrelease": "22.04",
+        "roles": ["web", "db"],
+        "ec2": {"tags": {"Name": "web1", "env": "prod"}},
+        "num_cpus": 4,
+        "virtual": True,
+        "motd": "hello:world",
+    },
+    "web2": {
+        "os": "ubuntu",
+        "roles": ["web"],
+        "ec2": {"tags": {"Name": "web2", "env": "dev"}},
+        "num_cpus": 8,
+        "virtual": False,
+    },
+    "db1": {
+        "os": "CentOS",
+        "roles": [],
+        "ec2": {},
+        "ifaces": [{"name": "eth0"}, {"name": "eth1"}],
+        "disks": {0: "sda"},
+    },
+    "win1": {
+        "os": "Windows",
+        "roles": "web",
+        "ec2": "none",
+        "motd": None,
+    },
+}
+
+EXPRESSIONS = [
+    "os:Ubuntu",
+    "os:ubuntu",
+    "os:UBU*",
+    "os:*",
+    "os:C?ntOS",
+    "os:[CW]*",
+    "roles:web",
+    "roles:d*",
+    "roles:*",
+    "ec2:tags",
+    "ec2:*",
+    "ec2:tags:Name:web1",
+    "ec2:tags:env:prod",
+    "ec2:tags:env:*",
+    "ec2:tags:Name",
+    "ec2:none",
+    "num_cpus:4",
+    "num_cpus:*8",
+    "virtual:true",
+    "virtual:False",
+    "motd:hello:world",
+    "motd:hello:*",
+    "motd:none",
+    "ifaces:name:eth0",
+    "ifaces:0:name:eth1",
+    "disks:0:sda",
+    "missing:value",
+    "missing",
+    "os",
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = salt.cache.Cache({"cachedir": str(tmp_path), "cache": "localfs"})
+    for minion_id, grains in DATA.items():
+        cache.store("grains", minion_id, grains)
+    return cache
+
+
+def _subdict_match(expr, exact_match=False):
+    return {
+        minion_id
+        for minion_id, grains in DATA.items()
+        if salt.utils.data.subdict_match(grains, expr, exact_match=exact_match)
+    }
+
+
+@pytest.mark.parametrize("exact_match", [False, True])
+@pytest.mark.parametrize("expr", EXPRESSIONS)
+def test_match_same_as_subdict_match(cache, expr, exact_match):
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    assert index.match(cache, expr, exact_match=exact_match) == _subdict_match(
+        expr, exact_match
+    )
+
+
+@pytest.mark.parametrize("expr", ["*:os:Ubuntu", "ec2:*:env:prod"])
+def test_match_unsupported_expression(cache, expr):
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    assert index.match(cache, expr) is None
+    assert index.match(cache, "os|Ubuntu", delimiter="|") is None
+
+
+def test_match_follows_cache_changes(cache):
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    assert index.match(cache, "os:Ubuntu") == {"web1", "web2"}
+    cache.store("grains", "web3", {"os": "Ubuntu"})
+    cache.store("grains", "web2", {"os": "Debian"})
+    cache.flush("grains", "web1")
+    assert index.match(cache, "os:Ubuntu") == {"web3"}
+    assert index.match(cache, "os:Debian") == {"web2"}
+
+
+def test_match_only_fetches_changed_entries(cache):
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    later = time.time() + 10
+    with patch("time.time", return_value=later):
+        assert index.match(cache, "os:Ubuntu") == {"web1", "web2"}
+    with patch.object(cache, "fetch", wraps=cache.fetch) as fetch, patch(
+        "time.time", return_value=later
+    ):
+        assert index.match(cache, "os:Ubuntu") == {"web1", "web2"}
+        fetch.assert_not_called()
+        # A new path is indexed from every entry once
+        assert index.match(cache, "roles:web") == {"web1", "web2", "win1"}
+        assert fetch.call_count == len(DATA)
+
+
+def test_match_untracked_entries(cache):
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    with patch.object(cache, "list_updated", return_value=dict.fromkeys(DATA)):
+        assert index.match(cache, "os:Ubuntu") == {"web1", "web2"}
+
+
+def test_get_index():
+    cache = salt.cache.Cache({"cachedir": "/tmp/minion-data-index", "cache": "localfs"})
+    index = salt.utils.minion_data_index.get_index(cache, "grains")
+    assert salt.utils.minion_data_index.get_index(cache, "grains") is index
+    assert salt.utils.minion_data_index.get_index(cache, "pillar") is not index
+
+
+ADDRESSES = {
+    "web1": {"ipv4": ["10.0.0.1", "127.0.0.1"], "ipv6": ["::1", "fe80::1"]},
+    "web2": {"ipv4": ["10.0.1.1"], "ipv6": ["2001:db8::10"]},
+    "db1": {"ipv4": ["192.168.1.5", "fe80::2"]},
+    "db2": {"ipv4": "10.0.0.7"},
+    "win1": {"ipv4": ["10.0.0.300"]},
+    "bsd1": {"os": "FreeBSD"},
+}
+
+
+@pytest.fixture
+def address_cache(tmp_path):
+    cache = salt.cache.Cache({"cachedir": str(tmp_path), "cache": "localfs"})
+    for minion_id, grains in ADDRESSES.items():
+        cache.store("grains", minion_id, grains)
+    return cache
+
+
+@pytest.mark.parametrize(
+    "tgt",
+    [
+        "10.0.0.0/24",
+        "10.0.0.0/8",
+        "10.0.0.1",
+        "10.0.0.1/32",
+        "192.168.0.0/16",
+        "0.0.0.0/0",
+        "::/0",
+        "::1",
+        "fe80::/10",
+        "2001:db8::/32",
+        "172.16.0.0/12",
+    ],
+)
+def test_match_ipcidr_same_as_ipcidr_match(address_cache, tgt):
+    tgt = ipaddress.ip_network(tgt) if "/" in tgt else ipaddress.ip_address(tgt)
+    # win1 holds an invalid address, on which ipcidr_match() fails
+    address_cache.flush("grains", "win1")
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    assert index.match_ipcidr(address_cache, tgt) == {
+        minion_id
+        for minion_id, grains in ADDRESSES.items()
+        if minion_id != "win1"
+        and salt.utils.minion_data_index.ipcidr_match(grains, tgt)
+    }
+
+
+def test_match_ipcidr_follows_cache_changes(address_cache):
+    subnet = ipaddress.ip_network("10.0.0.0/24")
+    address_cache.flush("grains", "win1")
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    assert index.match_ipcidr(address_cache, subnet) == {"web1", "db2"}
+    address_cache.store("grains", "web2", {"ipv4": ["10.0.0.2"]})
+    address_cache.store("grains", "db2", {"ipv4": ["10.0.2.7"]})
+    address_cache.flush("grains", "web1")
+    assert index.match_ipcidr(address_cache, subnet) == {"web2"}
+    assert index.match(address_cache, "ipv4:10.0.2.7") == {"db2"}
+
+
+def test_match_addresses(address_cache):
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    addrs = {"10.0.0.1", "10.0.0.7", "2001:db8::10", "fe80::2", "nope"}
+    assert index.match_addresses(address_cache, addrs) == {
+        minion_id
+        for minion_id, grains in ADDRESSES.items()
+        if salt.utils.minion_data_index.addresses_match(grains, addrs)
+    }
+    assert index.match_addresses(address_cache, {"10.0.0.1"}) == {"web1"}
+    assert index.match_addresses(address_cache, set()) == set()
+
+
+def test_refresh_skipped_while_bank_unchanged(cache):
+    index = salt.utils.minion_data_index.MinionDataIndex("grains")
+    version = cache.bank_updated("grains")
+    with patch("time.time", return_value=version + 10):
+        assert index.match(cache, "os:Ubuntu") == {"web1", "web2"}
+        with patch.object(cache, "list", wraps=cache.list) as list_:
+            assert index.match(cache, "os:Ubuntu") == {"web1", "web2"}
+            list_.assert_not_called()
+            with patch.object(cache, "bank_updated", return_value=version + 1):
+                assert index.match(cache, "os:Ubuntu") == {"web1", "web2"}
+            list_.assert_called_once()
@@ -0,0 +1,137 @@
+import fnmatch
+import re
+
+import pytest
+
+import salt.key
+import salt.utils.minion_id_index
+from tests.support.mock import patch
+
+MINIONS = [
+    "db-prod-1",
+    "db-prod-2",
+    "web-dev-1",
+    "web-prod-1",
+    "web-prod-10",
+    "web-prod-2",
+    "web_prod_3",
+    "webz",
+]
+
+
+@pytest.fixture
+def key(master_opts, tmp_path):
+    opts = master_opts.copy()
+    opts["pki_dir"] = str(tmp_path / "pki")
+    opts["keys.cache_driver"] = "localfs_key"
+    opts["key_cache"] = ""
+    key = salt.key.Key(opts)
+    with patch.dict(salt.utils.minion_id_index._INDEXES, {}, clear=True):
+        for minion in MINIONS:
+            _accept(key, minion)
+        key.cache.store("keys", "pending-1", {"state": "pending", "pub": "PUB"})
+        yield key
+
+
+def _accept(key, minion):
+    key.cache.store("keys", minion, {"state": "accepted", "pub": "PUB"})
+
+
+@pytest.fixture
+def index(key):
+    return salt.utils.minion_id_index.get_index(key)
+
+
+@pytest.mark.parametrize(
+    "pattern,prefix",
+    [
+        ("web-prod-*", "web-prod-"),
+        ("web?1", "web"),
+        ("[wd]*", ""),
+        ("web-prod-1", "web-prod-1"),
+    ],
+)
+def test_glob_prefix(pattern, prefix):
+    assert salt.utils.minion_id_index._glob_prefix(pattern) == prefix
+
+
+@pytest.mark.parametrize(
+    "pattern,prefix",
+    [
+        ("web-prod-.*", "web-prod-"),
+        ("^web-prod", "web-prod"),
+        ("webz*", "web"),
+        ("web-prod-1?", "web-prod-"),
+        ("web{2}", "we"),
+        ("web|db", ""),
+        ("(?i)web", ""),
+        ("[wd]b", ""),
+        (".*prod", ""),
+    ],
+)
+def test_regex_prefix(pattern, prefix):
+    assert salt.utils.minion_id_index._regex_prefix(pattern) == prefix
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "*",
+        "web-prod-*",
+        "web-prod-1*",
+        "web?prod?3",
+        "web-prod-1",
+        "nope",
+        "db-*,web-dev-1",
+        "pending-*",
+        "[dw]*-1",
+    ],
+)
+def test_glob(index, pattern):
+    expected = set()
+    for item in pattern.split(","):
+        expected.update(fnmatch.filter(MINIONS, item))
+    assert index.glob(pattern) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["web-prod-.*", "web-prod-1$", "webz*", "web|db", "(?i)WEB", ".*-1", "pending"],
+)
+def test_pcre(index, pattern):
+    reg = re.compile(pattern)
+    assert index.pcre(pattern) == [m for m in sorted(MINIONS) if reg.match(m)]
+
+
+def test_contains(index):
+    assert index.contains(["webz", "pending-1", "nope", "db-prod-1"]) == [
+        "webz",
+        "db-prod-1",
+    ]
+
+
+def test_refresh_follows_key_changes(key, index):
+    _accept(key, "web-prod-4")
+    key.cache.flush("keys", "webz")
+    index = salt.utils.minion_id_index.get_index(key)
+    assert "web-prod-4" in index.glob("web-prod-*")
+    assert index.contains(["webz"]) == []
+
+
+def test_refresh_lists_keys_once_settled(key, index):
+    version = key.cache.bank_updated("keys")
+    with patch("time.time", return_value=version + 60):
+        salt.utils.minion_id_index.get_index(key)
+    with patch.object(key, "list_keys") as list_keys:
+        assert salt.utils.minion_id_index.get_index(key) is index
+    list_keys.assert_not_called()
+
+
+def test_refresh_lists_keys_until_settled(key, index):
+    with patch.object(key, "list_keys", return_value={key.ACC: ["web1"]}):
+        assert salt.utils.minion_id_index.get_index(key).ids == ["web1"]
+
+
+def test_no_index_without_bank_updated(key):
+    with patch.object(key.cache, "bank_updated", return_value=None):
+        assert salt.utils.minion_id_index.get_index(key) is None
@@ -1,6 +1,10 @@
+import fnmatch
+import os
+
 import pytest
 
 import salt.config
+import salt.utils.minion_data_index
 import salt.utils.minions
 import salt.utils.network
 from tests.support.mock import patch
@@ -65,6 +69,41 @@ def test_connected_ids_remote_minions():
         assert ret == {minion2, minion}
 
 
+def test_connected_ids_minion_data_index(tmp_path):
+    opts = {
+        "pki_dir": str(tmp_path / "pki"),
+        "minion_data_cache": True,
+        "key_cache": False,
+        "transport": "zeromq",
+        "extension_modules": str(tmp_path / "extmods"),
+        "cachedir": str(tmp_path / "cache"),
+        "keys.cache_driver": "localfs_key",
+        "__role": "master",
+        "publish_port": 4505,
+    }
+    ckminions = salt.utils.minions.CkMinions(opts)
+    ckminions.cache.store("grains", "web1", {"ipv4": ["10.0.0.1"], "ipv6": []})
+    ckminions.cache.store("grains", "web2", {"ipv4": ["10.0.0.2"], "ipv6": ["::2"]})
+    ckminions.cache.store("grains", "db1", {"ipv4": ["10.0.0.3"]})
+    _age(opts["cachedir"])
+    with patch("salt.utils.network.local_port_tcp", return_value={"10.0.0.1", "::2"}):
+        assert ckminions.connected_ids() == {"web1", "web2"}
+        assert ckminions.connected_ids(subset=["web2", "db1"]) == {"web2"}
+        assert ckminions.connected_ids(show_ip=True) == {
+            ("web1", "10.0.0.1"),
+            ("web2", "::2"),
+        }
+        # Only the grains written since are fetched again
+        with patch.object(
+            ckminions.cache, "fetch", wraps=ckminions.cache.fetch
+        ) as fetch:
+            assert ckminions.connected_ids() == {"web1", "web2"}
+            fetch.assert_not_called()
+            ckminions.cache.store("grains", "db1", {"ipv4": ["10.0.0.1"]})
+            assert ckminions.connected_ids() == {"web1", "web2", "db1"}
+            assert fetch.call_count == 1
+
+
 # These validate_tgt tests make the assumption that CkMinions.check_minions is
 # correct. In other words, these tests are only worthwhile if check_minions is
 # also correct.
@@ -205,3 +244,269 @@ def test_grain_target_excludes_minions_missing_from_cache(tmp_path):
     )
     assert nonmatching_minion not in result["minions"]
     assert matching_minion in result["minions"]
+
+
+@pytest.mark.parametrize("minion_data_index", [True, False])
+def test_grain_target_minion_data_index(tmp_path, minion_data_index):
+    opts = {
+        "pki_dir": str(tmp_path / "pki"),
+        "minion_data_cache": True,
+        "minion_data_index": minion_data_index,
+        "key_cache": False,
+        "transport": "zeromq",
+        "extension_modules": str(tmp_path / "extmods"),
+        "cachedir": str(tmp_path / "cache"),
+        "keys.cache_driver": "localfs_key",
+        "__role": "master",
+    }
+    ckminions = salt.utils.minions.CkMinions(opts)
+    index_match = salt.utils.minion_data_index.MinionDataIndex.match
+    ckminions.cache.store("grains", "web1", {"os": "Ubuntu", "roles": ["web"]})
+    ckminions.cache.store("grains", "web2", {"os": "Debian", "roles": ["web"]})
+    # Cached, but its key is no longer accepted
+    ckminions.cache.store("grains", "gone", {"os": "Ubuntu", "roles": ["web"]})
+    with patch.object(
+        ckminions, "_pki_minions", return_value={"web1", "web2", "uncached"}
+    ), patch.object(
+        salt.utils.minion_data_index.MinionDataIndex, "match", autospec=True
+    ) as match:
+        match.side_effect = index_match
+        assert sorted(ckminions.check_minions("roles:web", "grain")["minions"]) == [
+            "web1",
+            "web2",
+        ]
+        assert ckminions.check_minions("os:ubu*", "grain")["minions"] == ["web1"]
+        assert sorted(
+            ckminions.check_minions("os:Ubuntu", "grain", greedy=False)["minions"]
+        ) == ["gone", "web1"]
+        assert ckminions.check_minions("os:^Ub", "grain_pcre")["minions"] == ["web1"]
+    assert match.call_count == (3 if minion_data_index else 0)
+
+
+@pytest.mark.parametrize("minion_data_index", [True, False])
+def test_ipcidr_target_minion_data_index(tmp_path, minion_data_index):
+    opts = {
+        "pki_dir": str(tmp_path / "pki"),
+        "minion_data_cache": True,
+        "minion_data_index": minion_data_index,
+        "key_cache": False,
+        "transport": "zeromq",
+        "extension_modules": str(tmp_path / "extmods"),
+        "cachedir": str(tmp_path / "cache"),
+        "keys.cache_driver": "localfs_key",
+        "__role": "master",
+    }
+    ckminions = salt.utils.minions.CkMinions(opts)
+    index_match = salt.utils.minion_data_index.MinionDataIndex.match_ipcidr
+    ckminions.cache.store("grains", "web1", {"ipv4": ["10.0.0.1"], "ipv6": ["::1"]})
+    ckminions.cache.store("grains", "web2", {"ipv4": ["10.0.1.1"]})
+    # Cached, but its key is no longer accepted
+    ckminions.cache.store("grains", "gone", {"ipv4": ["10.0.0.2"]})
+    with patch.object(
+        ckminions, "_pki_minions", return_value={"web1", "web2", "uncached"}
+    ), patch.object(
+        salt.utils.minion_data_index.MinionDataIndex, "match_ipcidr", autospec=True
+    ) as match:
+        match.side_effect = index_match
+        # Accepted minions without cached grains are kept when greedy
+        assert sorted(ckminions.check_minions("10.0.0.0/24", "ipcidr")["minions"]) == [
+            "uncached",
+            "web1",
+        ]
+        assert sorted(
+            ckminions.check_minions("10.0.0.0/16", "ipcidr", greedy=False)["minions"]
+        ) == ["gone", "web1", "web2"]
+        assert ckminions.check_minions("::1", "ipcidr", greedy=False)["minions"] == [
+            "web1"
+        ]
+        assert ckminions.check_minions("10.0.0/24", "ipcidr")["minions"] == []
+    assert match.call_count == (3 if minion_data_index else 0)
+
+
+def _age(*dirs):
+    # Changes made in the last second are not trusted by the target cache
+    for path in dirs:
+        for root, subdirs, files in os.walk(path):
+            for name in subdirs + files:
+                os.utime(os.path.join(root, name), (1000, 1000))
+        os.utime(path, (1000, 1000))
+
+
+def test_check_minions_target_cache(master_opts, tmp_path):
+    opts = master_opts.copy()
+    opts.update(
+        {
+            "pki_dir": str(tmp_path / "pki"),
+            "cachedir": str(tmp_path / "cache"),
+            "minion_data_cache": True,
+            "keys.cache_driver": "localfs_key",
+            "key_cache": "",
+        }
+    )
+    ckminions = salt.utils.minions.CkMinions(opts)
+    for minion_id in ("web1", "web2"):
+        ckminions.key.cache.store(
+            "keys", minion_id, {"state": "accepted", "pub": "PUB"}
+        )
+        ckminions.cache.store("grains", minion_id, {"os": "Ubuntu"})
+    _age(opts["pki_dir"], opts["cachedir"])
+
+    def check(expr, tgt_type="glob"):
+        return sorted(ckminions.check_minions(expr, tgt_type)["minions"])
+
+    with patch.object(
+        ckminions, "_check_glob_minions", wraps=ckminions._check_glob_minions
+    ) as glob, patch.object(
+        ckminions, "_check_grain_minions", wraps=ckminions._check_grain_minions
+    ) as grain:
+        assert check("web*") == ["web1", "web2"]
+        assert check("web*") == ["web1", "web2"]
+        assert check("os:Ubuntu", "grain") == ["web1", "web2"]
+        assert check("os:Ubuntu", "grain") == ["web1", "web2"]
+        assert glob.call_count == 1
+        assert grain.call_count == 1
+
+        # Accepting a key resolves every target again
+        ckminions.key.cache.store("keys", "web3", {"state": "accepted", "pub": "PUB"})
+        ckminions.cache.store("grains", "web3", {"os": "Ubuntu"})
+        assert check("web*") == ["web1", "web2", "web3"]
+        assert check("os:Ubuntu", "grain") == ["web1", "web2", "web3"]
+        _age(opts["pki_dir"], opts["cachedir"])
+        assert check("web*") == ["web1", "web2", "web3"]
+        assert check("os:Ubuntu", "grain") == ["web1", "web2", "web3"]
+        assert glob.call_count == 3
+        assert grain.call_count == 3
+
+        # Minion data only matters to targets looking at it
+        ckminions.cache.store("grains", "web1", {"os": "Debian"})
+        assert check("web*") == ["web1", "web2", "web3"]
+        assert check("os:Ubuntu", "grain") == ["web2", "web3"]
+        assert glob.call_count == 3
+        assert grain.call_count == 4
+
+    stats = ckminions.target_cache.stats()
+    assert stats["hits"] == 3
+    assert stats["invalidations"] == 3
+
+
+def test_check_minions_target_cache_disabled(tmp_path):
+    opts = {
+        "pki_dir": str(tmp_path / "pki"),
+        "minion_data_cache": True,
+        "key_cache": False,
+        "transport": "zeromq",
+        "extension_modules": str(tmp_path / "extmods"),
+        "cachedir": str(tmp_path / "cache"),
+        "keys.cache_driver": "localfs_key",
+        "__role": "master",
+        "target_cache_ttl": 0,
+    }
+    ckminions = salt.utils.minions.CkMinions(opts)
+    with patch.object(ckminions, "_check_glob_minions") as glob:
+        glob.return_value = {"minions": ["web1"], "missing": []}
+        ckminions.check_minions("web1")
+        ckminions.check_minions("web1")
+    assert glob.call_count == 2
+    assert ckminions.target_cache.stats()["misses"] == 0
+
+
+class _FakeKey:
+    ACC = "minions"
+
+    def __init__(self, accepted):
+        self.accepted = accepted
+
+    def glob_match(self, expr):
+        return {self.ACC: fnmatch.filter(self.accepted, expr)}
+
+    def list_match(self, expr):
+        return {self.ACC: [minion for minion in expr if minion in self.accepted]}
+
+
+@pytest.fixture(params=[True, False], ids=["indexed", "unindexed"])
+def compound_ckminions(tmp_path, request):
+    opts = {
+        "pki_dir": str(tmp_path / "pki"),
+        "minion_data_cache": True,
+        "minion_data_index": request.param,
+        "key_cache": False,
+        "transport": "zeromq",
+        "extension_modules": str(tmp_path / "extmods"),
+        "cachedir": str(tmp_path / "cache"),
+        "keys.cache_driver": "localfs_key",
+        "__role": "master",
+        "nodegroups": {"ubuntu_web": "G@os:Ubuntu and web*"},
+    }
+    ckminions = salt.utils.minions.CkMinions(opts)
+    for minion_id, os_, role, env in (
+        ("web1", "Ubuntu", "web", "prod"),
+        ("web2", "Debian", "web", "dev"),
+        ("db1", "Ubuntu", "db", "prod"),
+        ("db2", "CentOS", "db", "dev"),
+    ):
+        ckminions.cache.store("grains", minion_id, {"os": os_, "roles": [role]})
+        ckminions.cache.store("pillar", minion_id, {"env": env})
+    accepted = ["web1", "web2", "db1", "db2", "uncached"]
+    ckminions.key = _FakeKey(accepted)
+    with patch.object(ckminions, "_pki_minions", return_value=set(accepted)):
+        yield ckminions
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        ("G@os:Ubuntu", ["db1", "web1"]),
+        ("G@os:Ubuntu and web*", ["web1"]),
+        ("web* and G@os:Ubuntu", ["web1"]),
+        ("G@os:Ubuntu or L@db2", ["db1", "db2", "web1"]),
+        ("G@roles:web and not I@env:prod", ["web2"]),
+        ("not G@os:Ubuntu", ["db2", "uncached", "web2"]),
+        ("I@env:prod and ( db* or G@os:Debian )", ["db1"]),
+        ("( web1 or db2 ) and not L@db2", ["web1"]),
+        ("L@web1,db1 and G@os:Ubuntu and I@env:prod", ["db1", "web1"]),
+        ("web* not G@os:Debian", ["web1"]),
+        ("not ( G@os:Ubuntu or G@os:Debian )", ["db2", "uncached"]),
+        ("E@^db and P@os:^C", ["db2"]),
+        ("N@ubuntu_web or db2", ["db2", "web1"]),
+        ("( G@os:Ubuntu or J@env:^d", ["db1", "db2", "web1", "web2"]),
+        ("web1 web2", []),
+        ("and web1", []),
+        ("X@foo", []),
+    ],
+)
+def test_compound_target(compound_ckminions, expr, expected):
+    ret = compound_ckminions.check_minions(expr, "compound")
+    assert sorted(ret["minions"]) == expected
+
+
+def test_compound_target_missing(compound_ckminions):
+    ret = compound_ckminions.check_minions("L@web1,nope and G@os:Ubuntu", "compound")
+    assert ret["minions"] == ["web1"]
+    assert ret["missing"] == ["nope"]
+    ret = compound_ckminions.check_minions("G@os:Ubuntu and not L@nope", "compound")
+    assert ret["missing"] == []
+
+
+def test_compound_target_narrows_cache_lookups(compound_ckminions):
+    fetch = compound_ckminions.cache.fetch
+    with patch.object(compound_ckminions.cache, "fetch", wraps=fetch) as mock:
+        ret = compound_ckminions.check_minions("P@os:^Ubu and L@web1,web2", "compound")
+    assert ret["minions"] == ["web1"]
+    assert sorted(
+        call.args[1] for call in mock.call_args_list if call.args[0] == "grains"
+    ) == ["web1", "web2"]
+
+
+def test_explain_compound(compound_ckminions):
+    explained = compound_ckminions.explain_compound("P@os:^Ubu and L@web1,db2")
+    assert [term["term"] for term in explained["plan"]["and"]] == [
+        "L@web1,db2",
+        "P@os:^Ubu",
+    ]
+    assert "minions" not in explained
+    explained = compound_ckminions.explain_compound(
+        "P@os:^Ubu and L@web1,db2", analyze=True
+    )
+    assert explained["minions"] == ["web1"]
+    assert explained["plan"]["and"][1]["candidates"] == 2
+    assert explained["plan"]["and"][1]["matched"] == 1
@@ -0,0 +1,32 @@
+import salt.utils.prefix_trie
+
+
+def test_match():
+    trie = salt.utils.prefix_trie.PrefixTrie()
+    trie.add("salt/job/", "jobs")
+    trie.add("salt/", "all")
+    trie.add("", "everything")
+    trie.add("salt/auth", "auth")
+    assert trie.match("salt/job/123/ret/web1") == {"jobs", "all", "everything"}
+    assert trie.match("salt/au") == {"all", "everything"}
+    assert trie.match("custom") == {"everything"}
+    assert len(trie) == 4
+
+
+def test_add_discard():
+    trie = salt.utils.prefix_trie.PrefixTrie()
+    trie.add("salt/job/", "a")
+    trie.add("salt/job/", "a")
+    trie.add("salt/job/", "b")
+    trie.add("salt/", "a")
+    assert len(trie) == 3
+    trie.discard("salt/job/", "a")
+    trie.discard("salt/job/", "missing")
+    trie.discard("salt/other", "a")
+    assert trie.match("salt/job/1") == {"a", "b"}
+    trie.discard("salt/job/", "b")
+    assert trie.match("salt/job/1") == {"a"}
+    trie.discard("salt/", "a")
+    assert len(trie) == 0
+    # Emptied nodes are pruned
+    assert trie._root == [{}, set()]
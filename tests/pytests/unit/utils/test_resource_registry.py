@@ -7,7 +7,9 @@ import threading
 
 import pytest
 
+import salt.utils.files
 import salt.utils.resource_registry as rr
+from tests.support.mock import patch
 
 # Production default mmap is ~256 MiB (2**21 slots × 128 B). Unit tests only
 # need a tiny table; keeping this small avoids multi‑GiB churn across many
@@ -81,6 +83,35 @@ def test_decode_by_id_handles_garbage():
     assert rr._decode_by_id_value("[1,2]") is None
 
 
+def test_postings_add_remove():
+    postings = rr._ResourcePostings()
+    postings.add("ssh", "a", "m1")
+    postings.add("ssh", "b", "m2")
+    postings.add("vm", "a", "m2")
+
+    assert postings.by_type == {"ssh": {"a": 0, "b": 1}, "vm": {"a": 1}}
+    assert postings.minions(postings.type_minions["ssh"]) == {"m1", "m2"}
+    assert postings.minions(postings.type_minions["vm"]) == {"m2"}
+    assert list(postings.types_by_rid["a"]) == ["ssh", "vm"]
+    assert postings.resources_by_minion("m2") == {"ssh": ["b"], "vm": ["a"]}
+    assert postings.manages_type("m1", "ssh") is True
+    assert postings.manages_type("m1", "vm") is False
+    assert postings.manages_type("nope", "ssh") is False
+
+    # Moving a resource to another minion
+    postings.add("ssh", "a", "m2")
+    assert postings.minions(postings.type_minions["ssh"]) == {"m2"}
+    assert postings.resources_by_minion("m1") == {}
+
+    postings.remove("ssh", "a")
+    postings.remove("ssh", "a")
+    postings.remove("vm", "a")
+    assert postings.by_type == {"ssh": {"b": 1}}
+    assert postings.type_minions == {"ssh": 0b10}
+    assert postings.types_by_rid == {"b": {"ssh": None}}
+    assert postings.manages_type("m2", "vm") is False
+
+
 # ---------------------------------------------------------------------------
 # Registry end-to-end
 # ---------------------------------------------------------------------------
@@ -129,6 +160,21 @@ def test_cross_type_collisions_are_not_ambiguous(registry):
     assert registry.get_managing_minions_for_srn("vm", "web-01") == ["m2"]
 
 
+def test_resolve_bare_resource_id(registry):
+    registry.register_minion("m1", {"ssh": ["web-01", "web-02"]})
+    registry.register_minion("m2", {"vm": ["web-01"]})
+
+    assert sorted(registry.resolve_bare_resource_id("web-01")) == [
+        ("ssh", "web-01"),
+        ("vm", "web-01"),
+    ]
+    assert registry.resolve_bare_resource_id("web-02") == [("ssh", "web-02")]
+    assert registry.resolve_bare_resource_id("web-03") == []
+
+    registry.register_minion("m2", {})
+    assert registry.resolve_bare_resource_id("web-01") == [("ssh", "web-01")]
+
+
 def test_managing_minions_by_type(registry):
     registry.register_minion("m1", {"ssh": ["a"]})
     registry.register_minion("m2", {"ssh": ["b"], "vm": ["v"]})
@@ -376,3 +422,87 @@ def test_concurrent_register_minion_and_mmap_derived_reads(registry):
     tr.join()
     assert not errs, errs
     assert registry.resolve_bare_resource_id("anchor")
+
+
+# ---------------------------------------------------------------------------
+# Incremental derived views (journal)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two registries on the same cachedir, like two master workers."""
+    with patch.object(rr, "STALENESS_CHECK_INTERVAL", 0):
+        with _registry_session(tmp_path) as one, _registry_session(tmp_path) as two:
+            yield one, two
+
+
+def test_writes_are_applied_without_rebuild(workers):
+    one, two = workers
+    one.register_minion("m1", {"ssh": ["a", "b"]})
+    assert two.get_resource_ids_by_type("ssh") == ["a", "b"]
+
+    with patch.object(
+        rr._ResourceIndexStore, "_rebuild_derived", autospec=True
+    ) as rebuild:
+        one.register_minion("m1", {"ssh": ["a", "c"], "vm": ["v1"]})
+        one.register_minion("m2", {"ssh": ["b"]})
+        assert two.get_resources_for_minion("m1") == {"ssh": ["a", "c"], "vm": ["v1"]}
+        assert two.get_managing_minions_by_type("ssh")["minions"] == ["m1", "m2"]
+        assert two.resolve_bare_resource_id("b") == [("ssh", "b")]
+        two.unregister_minion("m1")
+        assert one.get_managing_minions_by_type("ssh")["minions"] == ["m2"]
+        assert one.get_resource_ids_by_type("vm") == []
+    rebuild.assert_not_called()
+
+
+def test_unchanged_registration_writes_nothing(registry):
+    registry.register_minion("m1", {"ssh": ["a", "b"]})
+    size = registry.stats()["journal_bytes"]
+    assert size
+    assert registry.register_minion("m1", {"ssh": ["b", "a"]}) == (0, 0)
+    assert registry.stats()["journal_bytes"] == size
+    assert registry.register_minion("m1", {"ssh": ["a"]}) == (0, 1)
+
+
+def test_compaction_rebuilds_other_workers(workers):
+    one, two = workers
+    one.register_minion("m1", {"ssh": ["a", "b"]})
+    assert two.get_resource_ids_by_type("ssh") == ["a", "b"]
+    one.register_minion("m1", {"ssh": ["a"]})
+    one.compact()
+    assert one.stats()["journal_bytes"] == 0
+    one.register_minion("m2", {"vm": ["v1"]})
+
+    with patch.object(
+        rr._ResourceIndexStore,
+        "_rebuild_derived",
+        autospec=True,
+        side_effect=rr._ResourceIndexStore._rebuild_derived,
+    ) as rebuild:
+        assert two.get_resource_ids_by_type("ssh") == ["a"]
+        assert two.get_resource_ids_by_type("vm") == ["v1"]
+    assert rebuild.call_count == 1
+
+
+def test_unreadable_journal_rebuilds(workers):
+    one, two = workers
+    one.register_minion("m1", {"ssh": ["a"]})
+    assert two.get_resource_ids_by_type("ssh") == ["a"]
+    one.register_minion("m1", {"ssh": ["a", "b"]})
+    with salt.utils.files.fopen(one._store._journal_path, "ab") as fh_:
+        fh_.write(b"garbage\n")
+    assert two.get_resource_ids_by_type("ssh") == ["a", "b"]
+
+
+def test_register_minion_compacts_on_journal_size(tmp_path):
+    with _registry_session(
+        tmp_path,
+        resource_registry_compact_min_interval=0,
+        resource_registry_compact_journal_bytes=100,
+    ) as reg:
+        reg.register_minion("m1", {"ssh": ["h1"]})
+        assert reg.stats()["journal_bytes"]
+        reg.register_minion("m1", {"ssh": [f"h{i}" for i in range(20)]})
+        assert reg.stats()["journal_bytes"] == 0
+        assert len(reg.get_resource_ids_by_type("ssh")) == 20
@@ -0,0 +1,68 @@
+import time
+
+import salt.utils.target_cache
+from tests.support.mock import patch
+
+RESULT = {"minions": ["web1", "web2"], "missing": [], "ssh_minions": False}
+
+
+def test_get_put():
+    cache = salt.utils.target_cache.TargetCache()
+    assert cache.get(("web*", "glob"), (1,)) is None
+    cache.put(("web*", "glob"), (1,), RESULT)
+    ret = cache.get(("web*", "glob"), (1,))
+    assert ret == RESULT
+    # Callers get their own copy
+    ret["minions"].append("web3")
+    assert cache.get(("web*", "glob"), (1,)) == RESULT
+    assert cache.stats() == {
+        "size": 1,
+        "hits": 2,
+        "misses": 1,
+        "invalidations": 0,
+        "hit_rate": 0.6667,
+    }
+
+
+def test_version_change_invalidates():
+    cache = salt.utils.target_cache.TargetCache()
+    cache.put("web*", (1,), RESULT)
+    assert cache.get("web*", (2,)) is None
+    assert cache.get("web*", (1,)) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_ttl():
+    cache = salt.utils.target_cache.TargetCache(ttl=5)
+    now = time.monotonic()
+    with patch("time.monotonic", return_value=now):
+        cache.put("web*", (1,), RESULT)
+    with patch("time.monotonic", return_value=now + 4):
+        assert cache.get("web*", (1,)) == RESULT
+    with patch("time.monotonic", return_value=now + 6):
+        assert cache.get("web*", (1,)) is None
+
+
+def test_lru():
+    cache = salt.utils.target_cache.TargetCache(size=2)
+    cache.put("a", (1,), RESULT)
+    cache.put("b", (1,), RESULT)
+    assert cache.get("a", (1,)) is not None
+    cache.put("c", (1,), RESULT)
+    assert cache.get("b", (1,)) is None
+    assert cache.get("a", (1,)) is not None
+    assert cache.get("c", (1,)) is not None
+
+
+def test_recent_changes_are_not_stored():
+    cache = salt.utils.target_cache.TargetCache()
+    cache.put("web*", (1,), RESULT, stamps=[time.time()])
+    assert cache.get("web*", (1,)) is None
+    cache.put("web*", (1,), RESULT, stamps=[time.time() - 10])
+    assert cache.get("web*", (1,)) == RESULT
+
+
+def test_enabled():
+    assert salt.utils.target_cache.TargetCache().enabled
+    assert not salt.utils.target_cache.TargetCache(ttl=0).enabled
+    assert not salt.utils.target_cache.TargetCache(size=0).enabled
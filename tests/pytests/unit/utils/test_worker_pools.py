@@ -0,0 +1,196 @@
+"""
+Unit tests for worker pool autoscaling
+"""
+
+import pytest
+
+import salt.utils.worker_pools
+from salt.utils.worker_pools import PoolAutoscaler, PoolStats
+
+
+@pytest.fixture
+def worker_pools():
+    return {
+        "auth": {"worker_count": 1, "commands": ["_auth"]},
+        "default": {
+            "worker_count": 4,
+            "min_workers": 2,
+            "max_workers": 8,
+            "p99_latency_target": 1.0,
+            "commands": ["*"],
+        },
+    }
+
+
+@pytest.fixture
+def pool_stats(worker_pools):
+    return salt.utils.worker_pools.create_pool_stats(worker_pools)
+
+
+@pytest.fixture
+def workers():
+    return []
+
+
+@pytest.fixture
+def autoscaler(worker_pools, pool_stats, workers):
+    opts = {
+        "worker_pools_autoscale_interval": 5,
+        "worker_pools_autoscale_cooldown": 60,
+    }
+    return PoolAutoscaler(
+        opts,
+        worker_pools,
+        pool_stats,
+        add_worker=lambda pool, index: workers.append(("add", pool, index)),
+        remove_worker=lambda pool, index: workers.append(("remove", pool, index)),
+    )
+
+
+def test_pool_stats_records_inflight_and_latency():
+    stats = PoolStats(2, window=4)
+    stats.start()
+    stats.start()
+    assert stats.snapshot()["inflight"] == 2
+    stats.finish(0.5)
+    snapshot = stats.snapshot()
+    assert snapshot["inflight"] == 1
+    assert snapshot["handled"] == 1
+    assert snapshot["busy"] == pytest.approx(0.5)
+    assert snapshot["workers"] == 2
+
+
+def test_pool_stats_latency_percentile_uses_recent_window():
+    stats = PoolStats(1, window=4)
+    assert stats.latency_percentile(99) == 0.0
+    for duration in (10.0, 1.0, 2.0, 3.0, 4.0):
+        stats.start()
+        stats.finish(duration)
+    # The 10 second sample was pushed out of the 4 slot window
+    assert stats.latency_percentile(99) == 4.0
+    assert stats.latency_percentile(50) == 2.0
+
+
+def test_only_pools_with_bounds_are_autoscaled(autoscaler):
+    assert autoscaler.enabled
+    assert list(autoscaler.pools) == ["default"]
+
+
+def test_scale_up_on_utilization(autoscaler, pool_stats, workers):
+    stats = pool_stats["default"]
+    now = autoscaler._last["default"][0]
+    # 4 workers busy for the whole 5 second interval
+    for _ in range(4):
+        stats.start()
+        stats.finish(5.0)
+    autoscaler.evaluate(now=now + 5)
+    assert workers == [("add", "default", 4), ("add", "default", 5)]
+    assert stats.workers.value == 6
+
+
+def test_scale_up_is_capped_at_max_workers(autoscaler, pool_stats, workers):
+    stats = pool_stats["default"]
+    stats.workers.value = 7
+    now = autoscaler._last["default"][0]
+    for _ in range(7):
+        stats.start()
+        stats.finish(5.0)
+    autoscaler.evaluate(now=now + 5)
+    assert workers == [("add", "default", 7)]
+    assert stats.workers.value == 8
+
+
+def test_scale_up_on_p99_latency(autoscaler, pool_stats, workers):
+    stats = pool_stats["default"]
+    now = autoscaler._last["default"][0]
+    # Mostly idle, but a slow request blows the 1 second p99 target
+    stats.start()
+    stats.finish(2.0)
+    autoscaler.evaluate(now=now + 60)
+    assert workers == [("add", "default", 4), ("add", "default", 5)]
+
+
+def test_scale_down_waits_for_cooldown(autoscaler, pool_stats, workers):
+    stats = pool_stats["default"]
+    now = autoscaler._last["default"][0]
+    autoscaler.evaluate(now=now + 5)
+    assert workers == []
+    autoscaler.evaluate(now=now + 60)
+    assert workers == [("remove", "default", 3)]
+    assert stats.workers.value == 3
+    # Cooldown restarts after every resize
+    autoscaler.evaluate(now=now + 65)
+    assert stats.workers.value == 3
+    autoscaler.evaluate(now=now + 120)
+    assert workers[-1] == ("remove", "default", 2)
+    assert stats.workers.value == 2
+    # Never below min_workers
+    autoscaler.evaluate(now=now + 300)
+    assert stats.workers.value == 2
+
+
+def test_inflight_requests_count_as_busy(autoscaler, pool_stats, workers):
+    stats = pool_stats["default"]
+    now = autoscaler._last["default"][0]
+    for _ in range(4):
+        stats.start()
+    autoscaler.evaluate(now=now + 60)
+    assert stats.workers.value == 6
+
+
+def test_autoscaling_disabled_without_bounds(pool_stats):
+    autoscaler = PoolAutoscaler(
+        {},
+        {"default": {"worker_count": 4, "commands": ["*"]}},
+        pool_stats,
+        add_worker=None,
+        remove_worker=None,
+    )
+    assert not autoscaler.enabled
+
+
+def test_pool_stats_latency_percentile_since():
+    stats = PoolStats(1, window=8)
+    for duration in (10.0, 10.0, 1.0):
+        stats.start()
+        stats.finish(duration)
+    assert stats.latency_percentile(99, since=2) == 1.0
+    assert stats.latency_percentile(99, since=3) == 0.0
+
+
+def test_stale_latencies_do_not_keep_growing_the_pool(autoscaler, pool_stats, workers):
+    stats = pool_stats["default"]
+    now = autoscaler._last["default"][0]
+    stats.start()
+    stats.finish(2.0)
+    autoscaler.evaluate(now=now + 60)
+    assert stats.workers.value == 6
+    # A single fast request after the burst does not look slow
+    stats.start()
+    stats.finish(0.01)
+    autoscaler.evaluate(now=now + 65)
+    assert stats.workers.value == 6
+
+
+def test_retire_bumps_slot_generation():
+    stats = PoolStats(2, max_workers=4)
+    assert len(stats.generations) == 4
+    assert stats.generation(3) == 0
+    stats.retire(3)
+    assert stats.generation(3) == 1
+    assert stats.generation(2) == 0
+
+
+def test_resize_updates_worker_count_before_callbacks(pool_stats, worker_pools):
+    seen = []
+    stats = pool_stats["default"]
+    autoscaler = PoolAutoscaler(
+        {},
+        worker_pools,
+        pool_stats,
+        add_worker=lambda pool, index: seen.append(("add", stats.workers.value)),
+        remove_worker=lambda pool, index: seen.append(("remove", stats.workers.value)),
+    )
+    autoscaler.resize("default", 5)
+    autoscaler.resize("default", 4)
+    assert seen == [("add", 5), ("remove", 4)]
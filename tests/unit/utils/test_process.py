@@ -1,3 +1,4 @@
+import asyncio
 import functools
 import io
 import logging
@@ -152,6 +153,31 @@ class TestProcessManager(TestCase):
         # we should have had 2 processes go at it
         assert counter.value == 4
 
+    @spin
+    def test_stop_process(self):
+        process_manager = salt.utils.process.ProcessManager(wait_for_kill=5)
+        self.addCleanup(process_manager.terminate)
+        process = process_manager.add_process(self.spin_stop_process, name="spinner")
+        assert asyncio.run(process_manager.stop_process("spinner")) is True
+        assert not process.is_alive()
+        assert process_manager._process_map == {}
+        # A stopped process is not restarted
+        process_manager.check_children()
+        assert process_manager._process_map == {}
+        assert asyncio.run(process_manager.stop_process("spinner")) is False
+
+    @spin
+    def test_release_process(self):
+        process_manager = salt.utils.process.ProcessManager(wait_for_kill=5)
+        self.addCleanup(process_manager.terminate)
+        process = process_manager.add_process(self.spin_release_process, name="spinner")
+        assert process_manager.release_process("spinner") is process
+        # Released processes keep running until reaped
+        assert process.is_alive()
+        assert process_manager._process_map == {}
+        asyncio.run(process_manager.reap_process(process, grace=0.1))
+        assert not process.is_alive()
+
 
 class TestThreadPool(TestCase):
     @pytest.mark.slow_test